@@ -0,0 +1,693 @@
+import concurrent.futures
+import json
+import os
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Literal, Mapping, Self
+
+import numpy as np
+from loguru import logger
+from numpy import ndarray
+from numpy.lib.format import open_memmap
+from pandas import DataFrame, DatetimeIndex, Series
+from scipy import sparse
+from scipy.sparse import csgraph
+from scipy.sparse.linalg import SuperLU, splu, spsolve
+
+from pypsdm.models.result.grid.connector import ConnectorCurrent
+from pypsdm.models.result.grid.line import LinesResult
+from pypsdm.models.result.grid.node import NodesResult
+from pypsdm.models.ts.base import EntityKey, entity_names
+from pypsdm.models.ts.types import ComplexPowerDict, ComplexVoltage
+from pypsdm.processing.dataframe import states_at, to_int_index
+from pypsdm.processing.numba import backward_forward_sweep
+from pypsdm.processing.parallel import process_pool
+
+if TYPE_CHECKING:
+    from pypsdm.models.input.container.raw_grid import RawGridContainer
+
+PowerFlowMethod = Literal["newton_raphson", "sweep", "zbus"]
+
+# maximum power mismatch in MVA (newton raphson) or voltage change in p.u. (sweep,
+# zbus)
+DEFAULT_TOLERANCE = 1e-8
+DEFAULT_MAX_ITERATIONS = 50
+# number of time steps of which the nodal power is gathered and solved at once
+POWER_FLOW_CHUNK_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class PowerFlowGrid:
+    """
+    Balanced power flow model of a raw grid. Nodes that are connected via closed
+    switches are merged into a single bus. All quantities are in per unit of the
+    rated voltage of each node and a base power of 1 MVA (see
+    `RawGridContainer.admittance_matrix`), so power is given in MW and MVAr.
+
+    Buses that are not connected to any slack node are not energized. Their
+    voltages as well as the currents of their lines are NaN.
+
+    The factorization of the admittance matrix (see `factorization`) is computed
+    once per grid on demand and is not pickled.
+    """
+
+    nodes: list[str]
+    node_names: list[EntityKey]
+    # bus of each node
+    node_bus: ndarray
+    admittance: sparse.csr_array
+    v_slack: ndarray
+    slack: ndarray
+    energized: ndarray
+    lines: list[EntityKey]
+    line_buses: ndarray
+    # per unit admittances of all parallel devices of each line
+    line_yij: ndarray
+    line_y0: ndarray
+    # current in A per unit current of each line
+    line_i_base: ndarray
+
+    @classmethod
+    def from_raw_grid(cls, raw_grid: "RawGridContainer") -> Self:
+        nodes = raw_grid.nodes
+        uuids = nodes.uuid.to_list()
+        uuid_to_idx = {uuid: idx for idx, uuid in enumerate(uuids)}
+
+        # merge nodes that are connected via closed switches
+        closed = raw_grid.switches.get_closed()
+        switch_a = closed.node_a.map(uuid_to_idx).to_numpy(dtype=np.int64)
+        switch_b = closed.node_b.map(uuid_to_idx).to_numpy(dtype=np.int64)
+        switch_graph = sparse.coo_array(
+            (np.ones(len(switch_a)), (switch_a, switch_b)),
+            shape=(len(uuids), len(uuids)),
+        )
+        n_buses, node_bus = csgraph.connected_components(switch_graph, directed=False)
+        incidence = sparse.csr_array(
+            (np.ones(len(uuids)), (np.arange(len(uuids)), node_bus)),
+            shape=(len(uuids), n_buses),
+        )
+        Y = raw_grid.admittance_matrix(uuid_to_idx, per_unit=True)
+        admittance = (incidence.T @ Y @ incidence).tocsr()
+
+        slack_nodes = nodes.slack.to_numpy(dtype=bool)
+        slack = np.zeros(n_buses, dtype=bool)
+        slack[node_bus[slack_nodes]] = True
+        v_slack = np.ones(n_buses, dtype=complex)
+        v_slack[node_bus[slack_nodes]] = nodes.v_target.to_numpy(dtype=float)[
+            slack_nodes
+        ]
+        _, components = csgraph.connected_components(
+            _structure(admittance), directed=False
+        )
+        energized = np.isin(components, components[slack])
+        if not slack.any():
+            logger.warning("No slack node. None of the buses are energized.")
+
+        lines = raw_grid.lines
+        line_buses = np.column_stack(
+            [
+                node_bus[lines.node_a.map(uuid_to_idx).to_numpy(dtype=np.int64)],
+                node_bus[lines.node_b.map(uuid_to_idx).to_numpy(dtype=np.int64)],
+            ]
+        ).reshape(-1, 2)
+        v_rated = lines.v_rated.to_numpy(dtype=float)
+        parallel = lines.parallel_devices.to_numpy(dtype=float)
+        return cls(
+            nodes=uuids,
+            node_names=[EntityKey(uuid, name) for uuid, name in zip(uuids, nodes.id)],
+            node_bus=node_bus,
+            admittance=admittance,
+            v_slack=v_slack,
+            slack=slack,
+            energized=energized,
+            lines=[EntityKey(uuid, name) for uuid, name in zip(lines.uuid, lines.id)],
+            line_buses=line_buses,
+            line_yij=lines.yij().to_numpy(dtype=complex) * v_rated**2 * parallel,
+            line_y0=lines.y0().to_numpy(dtype=complex) * v_rated**2 * parallel,
+            line_i_base=1e3 / (np.sqrt(3) * v_rated),
+        )
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("factorization", None)
+        return state
+
+    @property
+    def n_buses(self) -> int:
+        return len(self.slack)
+
+    @property
+    def pq(self) -> ndarray:
+        """
+        The energized buses besides the slacks, whose voltages are solved for.
+        """
+        return np.flatnonzero(self.energized & ~self.slack)
+
+    @cached_property
+    def factorization(self) -> SuperLU:
+        """
+        The sparse LU factorization of the admittance matrix between the pq buses,
+        which only depends on the topology and is shared by all time steps and
+        scenarios solved via the "zbus" method.
+        """
+        pq = self.pq
+        return splu(self.admittance[pq][:, pq].tocsc())
+
+    def bus_power(self, nodal_power: ComplexPowerDict, times: DatetimeIndex) -> ndarray:
+        """
+        Gathers the apparent power drawn at each bus at the given times from the
+        event discrete power of the nodes (consumption is positive).
+
+        Returns:
+            Complex array of shape (buses, times).
+        """
+        uuids = entity_names(nodal_power.keys(), favor_ids=False)
+        unknown = set(uuids).difference(self.nodes)
+        if unknown:
+            raise ValueError(f"Nodal power of nodes not within the grid: {unknown}")
+        node_idx = {uuid: idx for idx, uuid in enumerate(self.nodes)}
+        buses = self.node_bus[[node_idx[uuid] for uuid in uuids]]
+        states = states_at([ts.data for ts in nodal_power.values()], times, ["p", "q"])
+        # no power is drawn before the first event of a node
+        s = np.nan_to_num(states["p"]) + 1j * np.nan_to_num(states["q"])
+        res = np.zeros((self.n_buses, len(times)), dtype=complex)
+        np.add.at(res, buses, s)
+        return res
+
+    def flat_start(self) -> ndarray:
+        """
+        Returns the start voltages with all buses at the voltage of the slack.
+        """
+        v = np.full(self.n_buses, np.nan, dtype=complex)
+        v[self.energized] = 1.0
+        v[self.slack] = self.v_slack[self.slack]
+        return v
+
+    def solve(
+        self,
+        s: ndarray,
+        method: PowerFlowMethod = "newton_raphson",
+        v_start: ndarray | None = None,
+        tolerance: float = DEFAULT_TOLERANCE,
+        max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    ) -> tuple[ndarray, ndarray]:
+        """
+        Solves the power flow of multiple time steps.
+
+        Args:
+            s: Complex array of shape (buses, time steps) holding the apparent power
+                drawn at each bus.
+            method: Either "newton_raphson", which solves the time steps that did
+                not converge yet at once via the block diagonal jacobian of their
+                systems, the backward forward "sweep", which solves all time steps at
+                once but requires a radial grid, or the "zbus" fixed point iteration,
+                which solves all time steps at once with the shared factorization of
+                the admittance matrix.
+            v_start: The voltages all time steps start from, defaults to a flat
+                start.
+            tolerance: The maximum power mismatch in MVA (newton raphson) or voltage
+                change in p.u. (sweep, zbus) at which the solution is converged.
+            max_iterations: The maximum number of iterations.
+
+        Returns:
+            The complex bus voltages of shape (buses, time steps) and the number of
+            iterations per time step, which is -1 if the solution did not converge.
+            The voltages of time steps that did not converge are NaN.
+        """
+        v_start = self.flat_start() if v_start is None else v_start
+        match method:
+            case "newton_raphson":
+                v, iterations = self._newton_raphson(
+                    s, v_start, tolerance, max_iterations
+                )
+            case "sweep":
+                v, iterations = self._sweep(s, v_start, tolerance, max_iterations)
+            case "zbus":
+                v, iterations = self._zbus(s, v_start, tolerance, max_iterations)
+            case _:
+                raise ValueError(f"Unknown power flow method {method}")
+        failed = iterations < 0
+        if failed.any():
+            logger.warning(
+                f"Power flow of {np.count_nonzero(failed)} of {len(failed)} time "
+                "steps did not converge"
+            )
+            v[:, failed] = np.nan
+        return v, iterations
+
+    def _newton_raphson(
+        self, s: ndarray, v_start: ndarray, tolerance: float, max_iterations: int
+    ) -> tuple[ndarray, ndarray]:
+        # All time steps that did not converge yet are solved at once via the block
+        # diagonal jacobian of their independent systems.
+        pq = self.pq
+        Y = self.admittance
+        v = np.repeat(v_start[:, np.newaxis], s.shape[1], axis=1)
+        iterations = np.full(s.shape[1], -1, dtype=np.int64)
+        active = np.arange(s.shape[1])
+        for iteration in range(max_iterations + 1):
+            v_active = v[:, active]
+            mismatch = (v_active * np.conj(Y @ v_active) + s[:, active])[pq]
+            converged = np.abs(mismatch).max(axis=0, initial=0) < tolerance
+            iterations[active[converged]] = iteration
+            active, v_active = active[~converged], v_active[:, ~converged]
+            mismatch = mismatch[:, ~converged]
+            if len(active) == 0 or iteration == max_iterations:
+                break
+            jacobian = _jacobian(Y, v_active, pq)
+            rhs = -np.concatenate([mismatch.real, mismatch.imag])
+            dx = spsolve(jacobian, rhs.T.ravel()).reshape(len(active), -1).T
+            v_ang = np.angle(v_active[pq]) + dx[: len(pq)]
+            v_mag = np.abs(v_active[pq]) + dx[len(pq) :]
+            v[np.ix_(pq, active)] = v_mag * np.exp(1j * v_ang)
+        return v, iterations
+
+    def _sweep(
+        self, s: ndarray, v_start: ndarray, tolerance: float, max_iterations: int
+    ) -> tuple[ndarray, ndarray]:
+        order, parent = self._radial_order()
+        Y = self.admittance
+        children = np.flatnonzero(parent >= 0)
+        y_series = np.zeros(self.n_buses, dtype=complex)
+        y_series[children] = -Y[children, parent[children]]
+        # the row sums of the admittance matrix are the shunt admittances
+        y_shunt = Y @ np.ones(self.n_buses)
+        v = np.repeat(v_start[:, np.newaxis], s.shape[1], axis=1)
+        iterations = backward_forward_sweep(
+            order, parent, y_series, y_shunt, s, v, tolerance, max_iterations
+        )
+        return v, iterations
+
+    def _zbus(
+        self, s: ndarray, v_start: ndarray, tolerance: float, max_iterations: int
+    ) -> tuple[ndarray, ndarray]:
+        # Solves Y_pq,pq v_pq = i_pq - Y_pq,slack v_slack for the voltages of the pq
+        # buses, where the currents drawn by the loads depend on the voltages of the
+        # previous iteration.
+        pq, slack = self.pq, np.flatnonzero(self.slack)
+        i_slack = self.admittance[pq][:, slack] @ self.v_slack[slack]
+        v = np.repeat(v_start[:, np.newaxis], s.shape[1], axis=1)
+        v_pq, s_pq = v[pq], s[pq]
+        iterations = np.full(s.shape[1], -1, dtype=np.int64)
+        active = np.arange(s.shape[1])
+        for iteration in range(1, max_iterations + 1):
+            v_new = self.factorization.solve(
+                -np.conj(s_pq[:, active] / v_pq[:, active]) - i_slack[:, np.newaxis]
+            )
+            converged = (
+                np.abs(v_new - v_pq[:, active]).max(axis=0, initial=0) < tolerance
+            )
+            v_pq[:, active] = v_new
+            iterations[active[converged]] = iteration
+            active = active[~converged]
+            if len(active) == 0:
+                break
+        v[pq] = v_pq
+        return v, iterations
+
+    def _radial_order(self) -> tuple[ndarray, ndarray]:
+        # breadth first order of the energized buses starting at the slacks
+        graph = _structure(self.admittance)
+        graph.setdiag(0)
+        graph.eliminate_zeros()
+        n_edges = graph.nnz // 2
+        n_energized = np.count_nonzero(self.energized)
+        if n_edges != n_energized - np.count_nonzero(self.slack):
+            raise ValueError(
+                "The backward forward sweep requires a radial grid with a single "
+                "slack node per galvanically connected area"
+            )
+        order = []
+        parent = np.full(self.n_buses, -1, dtype=np.int64)
+        for root in np.flatnonzero(self.slack):
+            nodes, predecessors = csgraph.breadth_first_order(
+                graph, root, directed=False
+            )
+            order.append(nodes)
+            parent[nodes[1:]] = predecessors[nodes[1:]]
+        return np.concatenate(order).astype(np.int64), parent
+
+    def line_currents(self, v: ndarray) -> tuple[ndarray, ndarray]:
+        """
+        Calculates the currents in A flowing into the lines at port a and b.
+
+        Args:
+            v: Complex bus voltages of shape (buses, time steps).
+        """
+        v_a = v[self.line_buses[:, 0]]
+        v_b = v[self.line_buses[:, 1]]
+        yij = self.line_yij[:, np.newaxis]
+        y0 = self.line_y0[:, np.newaxis]
+        i_base = self.line_i_base[:, np.newaxis]
+        i_a = (yij * (v_a - v_b) + y0 * v_a) * i_base
+        i_b = (yij * (v_b - v_a) + y0 * v_b) * i_base
+        return i_a, i_b
+
+
+@dataclass(frozen=True)
+class PowerFlowResult:
+    nodes: NodesResult
+    lines: LinesResult
+    # number of iterations per time step, -1 if not converged
+    iterations: Series
+
+    @property
+    def converged(self) -> bool:
+        return bool((self.iterations >= 0).all())
+
+
+def _structure(Y: sparse.csr_array) -> sparse.csr_array:
+    # graph of the admittance matrix, whose edges are its non-zero entries
+    Y = Y.copy()
+    Y.eliminate_zeros()
+    return sparse.csr_array(
+        (np.ones(Y.nnz), Y.indices, Y.indptr), shape=Y.shape, dtype=np.float64
+    )
+
+
+def _jacobian(Y: sparse.csr_array, v: ndarray, pq: ndarray) -> sparse.csc_array:
+    # Derivatives of the apparent power with respect to the voltage angles and
+    # magnitudes of the pq buses for each column of voltages, arranged as block
+    # diagonal matrix with one block per column. All blocks share the structure of
+    # the admittance matrix between the pq buses including its diagonal.
+    m, k = len(pq), v.shape[1]
+    y_pq = Y[pq][:, pq].tocoo()
+    diag = np.arange(m)
+    row = np.concatenate([y_pq.row, diag])
+    col = np.concatenate([y_pq.col, diag])
+    y = np.concatenate([y_pq.data, np.zeros(m)])[:, np.newaxis]
+    i = (Y @ v)[pq]
+    v_row, v_col, v_pq = v[pq[row]], v[pq[col]], v[pq]
+    ds_dv_ang = -1j * v_row * np.conj(y * v_col)
+    ds_dv_mag = v_row * np.conj(y * v_col / np.abs(v_col))
+    ds_dv_ang[len(y_pq.data) :] += 1j * v_pq * np.conj(i)
+    ds_dv_mag[len(y_pq.data) :] += np.conj(i) * v_pq / np.abs(v_pq)
+
+    block_row = np.concatenate([row, row, row + m, row + m])[:, np.newaxis]
+    block_col = np.concatenate([col, col + m, col, col + m])[:, np.newaxis]
+    offsets = 2 * m * np.arange(k)
+    data = np.concatenate(
+        [ds_dv_ang.real, ds_dv_mag.real, ds_dv_ang.imag, ds_dv_mag.imag]
+    )
+    return sparse.coo_array(
+        (data.ravel(), ((block_row + offsets).ravel(), (block_col + offsets).ravel())),
+        shape=(2 * m * k, 2 * m * k),
+    ).tocsc()
+
+
+def power_flow(
+    raw_grid: "RawGridContainer",
+    nodal_power: ComplexPowerDict,
+    method: PowerFlowMethod = "newton_raphson",
+    tolerance: float = DEFAULT_TOLERANCE,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    chunk_size: int = POWER_FLOW_CHUNK_SIZE,
+) -> PowerFlowResult:
+    """
+    Solves the balanced power flow of the raw grid for each event of the nodal power.
+    The nodal power can be gathered from participant results (see
+    `SystemParticipantsResultContainer.nodal_power`) or primary data (see
+    `PrimaryData.nodal_power`).
+
+    The time steps are solved in chunks. All time steps of a chunk are solved at once
+    (see `PowerFlowGrid.solve`) and start from the last solution of the previous
+    chunk, or from a flat start if it did not converge. Time steps that did not
+    converge hold NaN voltages and currents.
+
+    Args:
+        raw_grid: The grid to solve.
+        nodal_power: Event discrete power drawn at the nodes in MW and MVAr, keyed
+            by node uuid.
+        method: The solution method (see `PowerFlowGrid.solve`).
+        tolerance: The maximum power mismatch in MVA (newton raphson) or voltage
+            change in p.u. (sweep, zbus) at which the solution is converged.
+        max_iterations: The maximum number of iterations.
+        chunk_size: Number of time steps that are solved at once.
+
+    Returns:
+        The node voltages in p.u. and degrees and the line currents in A and degrees.
+    """
+    grid = PowerFlowGrid.from_raw_grid(raw_grid)
+    times = _union_times([nodal_power])
+
+    v = np.full((grid.n_buses, len(times)), np.nan, dtype=complex)
+    iterations = np.empty(len(times), dtype=np.int64)
+    v_start = None
+    for start in range(0, len(times), chunk_size):
+        stop = min(start + chunk_size, len(times))
+        s = grid.bus_power(nodal_power, times[start:stop])
+        v[:, start:stop], iterations[start:stop] = grid.solve(
+            s, method, v_start, tolerance, max_iterations
+        )
+        # a failed time step must not spoil the start of the next chunk
+        v_start = v[:, stop - 1] if iterations[stop - 1] >= 0 else None
+    return PowerFlowResult(
+        nodes=_nodes_result(grid, v[grid.node_bus], times),
+        lines=_lines_result(grid, v, times),
+        iterations=Series(iterations, index=times, name="iterations"),
+    )
+
+
+def _union_times(nodal_powers: Iterable[ComplexPowerDict]) -> DatetimeIndex:
+    indices = {
+        id(ts.data.index): ts.data.index
+        for nodal_power in nodal_powers
+        for ts in nodal_power.values()
+    }
+    times = DatetimeIndex([])
+    for index in indices.values():
+        times = times.union(index)
+    return times.rename("time")
+
+
+def _nodes_result(grid: PowerFlowGrid, v: ndarray, times: DatetimeIndex):
+    v_mag = np.abs(v)
+    v_ang = np.degrees(np.angle(v))
+    return NodesResult(
+        {
+            key: ComplexVoltage.from_preprocessed(
+                DataFrame({"v_mag": v_mag[i], "v_ang": v_ang[i]}, index=times)
+            )
+            for i, key in enumerate(grid.node_names)
+        }
+    )
+
+
+def _lines_result(grid: PowerFlowGrid, v: ndarray, times: DatetimeIndex):
+    i_a, i_b = grid.line_currents(v)
+    columns = {
+        "i_a_mag": np.abs(i_a),
+        "i_a_ang": np.degrees(np.angle(i_a)),
+        "i_b_mag": np.abs(i_b),
+        "i_b_ang": np.degrees(np.angle(i_b)),
+    }
+    return LinesResult(
+        {
+            key: ConnectorCurrent.from_preprocessed(
+                DataFrame({c: values[i] for c, values in columns.items()}, index=times)
+            )
+            for i, key in enumerate(grid.lines)
+        }
+    )
+
+
+@dataclass(frozen=True)
+class PowerFlowStore:
+    """
+    Power flow results of multiple scenarios on the same grid and time steps. The
+    bus voltages and iterations of each scenario are stored as memory mapped numpy
+    arrays (.npy) within a directory, so they are written while solving and read
+    lazily per scenario instead of being held in memory.
+    """
+
+    path: Path
+    grid: PowerFlowGrid
+    times: DatetimeIndex
+    scenarios: list[str]
+
+    @classmethod
+    def create(
+        cls,
+        path: str | Path,
+        grid: PowerFlowGrid,
+        times: DatetimeIndex,
+        scenarios: list[str],
+    ) -> Self:
+        path = Path(path)
+        os.makedirs(path, exist_ok=True)
+        np.save(path / "times.npy", to_int_index(times))
+        with open(path / "scenarios.json", "w") as f:
+            json.dump(scenarios, f)
+        for idx in range(len(scenarios)):
+            open_memmap(
+                cls._file(path, idx, "v"),
+                mode="w+",
+                dtype=complex,
+                shape=(grid.n_buses, len(times)),
+            )
+            open_memmap(
+                cls._file(path, idx, "iterations"),
+                mode="w+",
+                dtype=np.int64,
+                shape=(len(times),),
+            )
+        return cls(path, grid, times, scenarios)
+
+    @classmethod
+    def open(cls, path: str | Path, raw_grid: "RawGridContainer") -> Self:
+        """
+        Opens the results of a batch power flow of the given grid. Raises a
+        ValueError if the stored results don't match the buses of the grid.
+        """
+        path = Path(path)
+        times = DatetimeIndex(np.load(path / "times.npy").astype("datetime64[ns]"))
+        with open(path / "scenarios.json") as f:
+            scenarios = json.load(f)
+        grid = PowerFlowGrid.from_raw_grid(raw_grid)
+        store = cls(path, grid, times.rename("time"), scenarios)
+        for scenario in scenarios:
+            n_buses = store.voltages(scenario).shape[0]
+            if n_buses != grid.n_buses:
+                raise ValueError(
+                    f"The results of scenario {scenario} hold {n_buses} buses, but "
+                    f"the given grid has {grid.n_buses} buses."
+                )
+        return store
+
+    @staticmethod
+    def _file(path: Path, scenario: int, name: str) -> Path:
+        return path / f"scenario_{scenario}_{name}.npy"
+
+    @classmethod
+    def write(
+        cls, path: Path, scenario: int, start: int, v: ndarray, iterations: ndarray
+    ):
+        """
+        Writes the solution of a chunk of time steps of a scenario.
+        """
+        stop = start + v.shape[1]
+        v_out = np.load(cls._file(path, scenario, "v"), mmap_mode="r+")
+        v_out[:, start:stop] = v
+        v_out.flush()
+        iterations_out = np.load(
+            cls._file(path, scenario, "iterations"), mmap_mode="r+"
+        )
+        iterations_out[start:stop] = iterations
+        iterations_out.flush()
+
+    def voltages(self, scenario: str) -> ndarray:
+        """
+        Returns the memory mapped complex bus voltages of shape (buses, time steps).
+        """
+        idx = self.scenarios.index(scenario)
+        return np.load(self._file(self.path, idx, "v"), mmap_mode="r")
+
+    def iterations(self, scenario: str) -> Series:
+        idx = self.scenarios.index(scenario)
+        iterations = np.load(self._file(self.path, idx, "iterations"))
+        return Series(iterations, index=self.times, name="iterations")
+
+    def result(self, scenario: str) -> PowerFlowResult:
+        """
+        Reads the node and line results of a scenario into memory.
+        """
+        v = np.asarray(self.voltages(scenario))
+        return PowerFlowResult(
+            nodes=_nodes_result(self.grid, v[self.grid.node_bus], self.times),
+            lines=_lines_result(self.grid, v, self.times),
+            iterations=self.iterations(scenario),
+        )
+
+
+# grid of the worker processes of a batch power flow, which is passed once per
+# worker so each worker factorizes the admittance matrix only once
+_worker_grid: PowerFlowGrid | None = None
+
+
+def _init_worker(grid: PowerFlowGrid):
+    global _worker_grid
+    _worker_grid = grid
+
+
+def _solve_chunk(
+    path: Path,
+    scenario: int,
+    start: int,
+    s: ndarray,
+    method: PowerFlowMethod,
+    tolerance: float,
+    max_iterations: int,
+):
+    assert _worker_grid is not None
+    v, iterations = _worker_grid.solve(s, method, None, tolerance, max_iterations)
+    PowerFlowStore.write(path, scenario, start, v, iterations)
+
+
+def batch_power_flow(
+    raw_grid: "RawGridContainer",
+    scenarios: Mapping[str, ComplexPowerDict],
+    path: str | Path,
+    method: PowerFlowMethod = "zbus",
+    tolerance: float = DEFAULT_TOLERANCE,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    chunk_size: int = POWER_FLOW_CHUNK_SIZE,
+    max_workers: int | None = None,
+) -> PowerFlowStore:
+    """
+    Solves the power flow of many scenarios of nodal power on the same grid. The
+    chunks of time steps of all scenarios are distributed across a process pool
+    (see `pypsdm.processing.parallel.process_pool`). The grid is pickled once per
+    worker, which reuses the factorization of its admittance matrix for all chunks
+    (see `PowerFlowGrid.factorization`). The solutions are written to a
+    `PowerFlowStore` at the given path, while at most two chunks per worker are held
+    in memory.
+
+    Args:
+        raw_grid: The grid to solve.
+        scenarios: The event discrete nodal power of each scenario (see
+            `power_flow`).
+        path: The directory to store the results in.
+        method: The solution method (see `PowerFlowGrid.solve`). Each chunk starts
+            from a flat start.
+        tolerance: The maximum power mismatch in MVA (newton raphson) or voltage
+            change in p.u. (sweep, zbus) at which the solution is converged.
+        max_iterations: The maximum number of iterations.
+        chunk_size: Number of time steps that are solved at once.
+        max_workers: The number of worker processes, defaults to the number of
+            processors.
+    """
+    grid = PowerFlowGrid.from_raw_grid(raw_grid)
+    nodal_powers = list(scenarios.values())
+    times = _union_times(nodal_powers)
+    store = PowerFlowStore.create(path, grid, times, list(scenarios))
+    max_workers = max_workers or os.cpu_count() or 1
+
+    with process_pool(
+        max_workers, initializer=_init_worker, initargs=(grid,)
+    ) as executor:
+        pending: set[concurrent.futures.Future] = set()
+        for idx, nodal_power in enumerate(nodal_powers):
+            for start in range(0, len(times), chunk_size):
+                if len(pending) >= 2 * max_workers:
+                    done, pending = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        future.result()
+                s = grid.bus_power(nodal_power, times[start : start + chunk_size])
+                pending.add(
+                    executor.submit(
+                        _solve_chunk,
+                        store.path,
+                        idx,
+                        start,
+                        s,
+                        method,
+                        tolerance,
+                        max_iterations,
+                    )
+                )
+        for future in concurrent.futures.as_completed(pending):
+            future.result()
+    return store
@@ -1,32 +1,309 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Self
 
 import networkx as nx
+import numpy as np
 from networkx import Graph
+from numpy import ndarray
+from pandas import Index
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from pypsdm.models.enums import RawGridElementsEnum
+from pypsdm.processing.numba import depth_first_branches
 
 if TYPE_CHECKING:
     from pypsdm import RawGridContainer
 
+# types of the edges of a grid topology, edges store their position within this tuple
+EDGE_TYPES = (
+    RawGridElementsEnum.LINE,
+    RawGridElementsEnum.SWITCH,
+    RawGridElementsEnum.TRANSFORMER_2_W,
+)
+# edges that galvanically connect nodes of the same voltage level
+GALVANIC_EDGE_TYPES = (RawGridElementsEnum.LINE, RawGridElementsEnum.SWITCH)
 
-def find_branches(G: Graph, start_node):
-    visited = set()
-    visited.add(start_node)
-    branches = []
 
-    def dfs(node, path):
-        visited.add(node)
-        path.append(node)
+@dataclass(frozen=True)
+class GridTopology:
+    """
+    Compact topology of a raw grid over integer node indices. The edges are the
+    lines, switches and transformers of the grid, which are stored once and
+    referenced from a compressed sparse row (CSR) adjacency that holds each edge in
+    both directions. Graph algorithms select the edges they consider via masks (see
+    `edge_mask`) instead of rebuilding the graph and run on the adjacency via
+    `scipy.sparse.csgraph`. Networkx graphs are only built on demand for export.
 
-        for neighbor in G.neighbors(node):
-            if neighbor not in visited:
-                dfs(neighbor, path)
+    Edges connected to nodes that are not part of the grid are dropped.
+    """
+
+    nodes: Index
+    # endpoints of each edge
+    edge_a: ndarray
+    edge_b: ndarray
+    # position of the type of each edge within EDGE_TYPES
+    edge_type: ndarray
+    # position of the element of each edge within its entities
+    element: ndarray
+    # whether each edge conducts, which only open switches don't
+    closed: ndarray
+    # length of lines in km, zero for all other edges
+    weight: ndarray
+    # CSR adjacency, the neighbours of node i are indices[indptr[i]:indptr[i + 1]]
+    # connected via the edges edges[indptr[i]:indptr[i + 1]]
+    indptr: ndarray
+    indices: ndarray
+    edges: ndarray
+
+    @classmethod
+    def from_raw_grid(cls, raw_grid: RawGridContainer) -> Self:
+        nodes = Index(raw_grid.nodes.uuid)
+        connectors = {
+            RawGridElementsEnum.LINE: raw_grid.lines,
+            RawGridElementsEnum.SWITCH: raw_grid.switches,
+            RawGridElementsEnum.TRANSFORMER_2_W: raw_grid.transformers_2_w,
+        }
+        columns: dict[str, list[ndarray]] = {
+            "edge_a": [],
+            "edge_b": [],
+            "edge_type": [],
+            "element": [],
+            "closed": [],
+            "weight": [],
+        }
+        for code, edge_type in enumerate(EDGE_TYPES):
+            data = connectors[edge_type].data
+            n = len(data)
+            closed = np.ones(n, dtype=bool)
+            weight = np.zeros(n)
+            if edge_type == RawGridElementsEnum.SWITCH and n:
+                closed = data["closed"].to_numpy(dtype=bool)
+            if edge_type == RawGridElementsEnum.LINE and n:
+                weight = data["length"].to_numpy(dtype=float)
+            edge_a = nodes.get_indexer(data["node_a"]) if n else np.empty(0, int)
+            edge_b = nodes.get_indexer(data["node_b"]) if n else np.empty(0, int)
+            valid = (edge_a >= 0) & (edge_b >= 0)
+            columns["edge_a"].append(edge_a[valid])
+            columns["edge_b"].append(edge_b[valid])
+            columns["edge_type"].append(np.full(valid.sum(), code))
+            columns["element"].append(np.flatnonzero(valid))
+            columns["closed"].append(closed[valid])
+            columns["weight"].append(weight[valid])
+        edges = {name: np.concatenate(values) for name, values in columns.items()}
+        edges["edge_type"] = edges["edge_type"].astype(np.int8)
+
+        # adjacency holding each edge in both directions
+        src = np.concatenate([edges["edge_a"], edges["edge_b"]])
+        dst = np.concatenate([edges["edge_b"], edges["edge_a"]])
+        edge_ids = np.tile(np.arange(len(edges["edge_a"])), 2)
+        order = np.argsort(src, kind="stable")
+        indptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(src, minlength=len(nodes)))]
+        )
+        return cls(
+            nodes=nodes,
+            indptr=indptr.astype(np.int64),
+            indices=dst[order].astype(np.int64),
+            edges=edge_ids[order].astype(np.int64),
+            **edges,
+        )
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.nodes)
+
+    def index(self, uuids: str | Iterable[str]) -> ndarray:
+        """
+        Returns the indices of the given node uuids.
+        """
+        uuids = [uuids] if isinstance(uuids, str) else list(uuids)
+        idx = self.nodes.get_indexer(uuids)
+        if (idx < 0).any():
+            missing = [uuid for uuid, i in zip(uuids, idx) if i < 0]
+            raise KeyError(f"Nodes not within the grid: {missing}")
+        return idx
+
+    def edge_mask(
+        self,
+        edge_types: Iterable[RawGridElementsEnum] = GALVANIC_EDGE_TYPES,
+        include_open_switches: bool = False,
+    ) -> ndarray:
+        """
+        Returns a mask of the edges of the given types.
+
+        Args:
+            edge_types: The types of edges to include, defaults to the lines and
+                switches.
+            include_open_switches: Whether to include open switches.
+        """
+        codes = [EDGE_TYPES.index(edge_type) for edge_type in edge_types]
+        mask = np.isin(self.edge_type, codes)
+        if not include_open_switches:
+            mask &= self.closed
+        return mask
+
+    def adjacency(
+        self, mask: ndarray | None = None, weighted: bool = False
+    ) -> sparse.csr_array:
+        """
+        Returns the symmetric adjacency matrix of the masked edges, which defaults to
+        the lines and closed switches (see `edge_mask`).
+
+        Args:
+            mask: Mask of the edges to include.
+            weighted: Whether to weight the edges with the line length. Edges without
+                length are weighted with the smallest positive float.
+        """
+        mask = self.edge_mask() if mask is None else mask
+        included = mask[self.edges]
+        data = np.ones(len(self.edges))
+        if weighted:
+            data = np.maximum(self.weight[self.edges], np.finfo(float).tiny)
+        # masked entries are removed from the structure, which works on copies of
+        # the index arrays
+        data = np.where(included, data, 0)
+        adjacency = sparse.csr_array(
+            (data, self.indices.copy(), self.indptr.copy()),
+            shape=(self.n_nodes, self.n_nodes),
+        )
+        adjacency.eliminate_zeros()
+        return adjacency
+
+    def neighbors(self, node: int, mask: ndarray | None = None) -> ndarray:
+        """
+        Returns the distinct neighbours of the node via the masked edges, which
+        defaults to the lines and closed switches (see `edge_mask`).
+        """
+        mask = self.edge_mask() if mask is None else mask
+        start, stop = self.indptr[node], self.indptr[node + 1]
+        return np.unique(self.indices[start:stop][mask[self.edges[start:stop]]])
+
+    def shortest_path_tree(
+        self, target: int, mask: ndarray | None = None
+    ) -> tuple[ndarray, ndarray]:
+        """
+        Returns the tree of paths with the least number of hops from all nodes to the
+        target via the masked edges (see `adjacency`) as the predecessor of each node
+        on its path and the number of hops of its path. Nodes that are not connected
+        to the target have the predecessor -9999 and infinite hops.
+        """
+        adjacency = self.adjacency(mask)
+        _, predecessors = csgraph.breadth_first_order(
+            adjacency, target, directed=False, return_predecessors=True
+        )
+        hops = csgraph.shortest_path(
+            adjacency, directed=False, unweighted=True, indices=target
+        )
+        return predecessors, hops
+
+    def shortest_path(
+        self, source: int, target: int, mask: ndarray | None = None
+    ) -> ndarray:
+        """
+        Returns the nodes of a path with the least number of hops from source to
+        target via the masked edges (see `adjacency`).
+        """
+        _, predecessors = csgraph.breadth_first_order(
+            self.adjacency(mask), target, directed=False, return_predecessors=True
+        )
+        if source != target and predecessors[source] < 0:
+            raise ValueError(
+                f"No path between {self.nodes[source]} and {self.nodes[target]}"
+            )
+        path = [source]
+        while path[-1] != target:
+            path.append(predecessors[path[-1]])
+        return np.array(path, dtype=np.int64)
+
+    def branches(self, roots: Iterable[int], mask: ndarray | None = None) -> list:
+        """
+        Decomposes the topology into the branches that start at the given roots via
+        the masked edges, which defaults to the lines and closed switches (see
+        `edge_mask`), so that branches stay within their voltage level. Each branch
+        starts with its root followed by the nodes that are reachable via one of the
+        root's neighbours without passing another root, in depth first preorder.
+        Roots without any such neighbour form a branch of their own, so that each
+        root is part of the result.
+
+        Args:
+            roots: Indices of the roots, duplicates are ignored.
+            mask: Mask of the edges to traverse.
+        Returns:
+            A list of index arrays, one per branch, ordered by root.
+        """
+        mask = self.edge_mask() if mask is None else mask
+        roots = np.asarray(list(roots), dtype=np.int64)
+        roots = roots[np.sort(np.unique(roots, return_index=True)[1])]
+        order, offsets, branch_roots = depth_first_branches(
+            self.indptr, self.indices, mask[self.edges], roots
+        )
+        # the branches of each root are contiguous and ordered like the roots
+        branches = []
+        b = 0
+        for root in roots:
+            if b == len(branch_roots) or branch_roots[b] != root:
+                branches.append(np.array([root], dtype=np.int64))
+            while b < len(branch_roots) and branch_roots[b] == root:
+                branches.append(
+                    np.concatenate(([root], order[offsets[b] : offsets[b + 1]]))
+                )
+                b += 1
+        return branches
+
+    def to_networkx(self, include_transformer: bool = False) -> Graph:
+        """
+        Exports the topology as networkx graph over the node uuids. Lines carry
+        their length as weight. Open switches are omitted.
+        """
+        graph = Graph()
+        graph.add_nodes_from(self.nodes)
+        uuids = self.nodes.to_numpy()
+        edge_types = [RawGridElementsEnum.LINE, RawGridElementsEnum.SWITCH]
+        if include_transformer:
+            edge_types.append(RawGridElementsEnum.TRANSFORMER_2_W)
+        for edge_type in edge_types:
+            mask = self.edge_mask([edge_type])
+            node_a, node_b = uuids[self.edge_a[mask]], uuids[self.edge_b[mask]]
+            if edge_type == RawGridElementsEnum.LINE:
+                graph.add_edges_from(
+                    (a, b, {"weight": weight})
+                    for a, b, weight in zip(node_a, node_b, self.weight[mask])
+                )
+            else:
+                graph.add_edges_from(zip(node_a, node_b))
+        return graph
+
+
+def find_branches(G: Graph, start_node):
+    """
+    Returns the branches starting at the neighbours of the start node. Each branch
+    starts with the start node followed by the nodes reachable via the neighbour in
+    depth first preorder. The traversal is iterative, so deep radial grids don't
+    exceed the recursion limit.
+    """
+    visited = {start_node}
+    branches = []
 
     for neighbor in G.neighbors(start_node):
-        if neighbor not in visited:
-            path = [start_node]
-            dfs(neighbor, path)
-            branches.append(path)
+        if neighbor in visited:
+            continue
+        path = [start_node]
+        stack = [neighbor]
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            path.append(node)
+            # push in reverse so the first neighbour is visited first
+            stack.extend(
+                n for n in reversed(list(G.neighbors(node))) if n not in visited
+            )
+        branches.append(path)
 
     return branches
 
@@ -34,25 +311,113 @@ def find_branches(G: Graph, start_node):
 def find_n_hop_closest_in_slack_direction(
     uuid: str, n: int, raw_grid: RawGridContainer, candidates: set[str] | None = None
 ):
-    slack_ds = raw_grid.find_slack_downstream()
-    G = raw_grid.build_networkx_graph()
-    if candidates is None:
-        candidates = set(raw_grid.nodes.uuid)
-    # find djikstra shortest path between uuid and slck_ds
-    path = nx.shortest_path(G, uuid, slack_ds)
-    closest = find_n_hop_closest_candidates(n, G, uuid, candidates)
-    closest = [n for n in closest if n in path]
-    return closest
+    """
+    Finds the candidates that are at most n candidate hops away from the given node
+    and lie on the shortest path from the node towards the slack. The node itself
+    is included if it lies on the path.
+
+    Returns:
+        The uuids of the found candidates ordered from the node towards the slack.
+    """
+    topology = raw_grid.topology
+    slack_ds = topology.index(raw_grid.find_slack_downstream())[0]
+    node = topology.index(uuid)[0]
+    candidate_mask = _candidate_mask(topology, candidates)
+    path = topology.shortest_path(node, slack_ds)
+
+    closest = {node}
+    frontier = {node}
+    mask = topology.edge_mask()
+    for _ in range(n):
+        found = set()
+        for cur in frontier:
+            found.update(_closest_candidates(topology, cur, candidate_mask, mask))
+        frontier = found.difference(closest)
+        closest.update(found)
+    return [topology.nodes[i] for i in path if i in closest]
+
+
+def find_all_n_hop_closest_in_slack_direction(
+    n: int, raw_grid: RawGridContainer, candidates: set[str] | None = None
+) -> dict[str, list[str]]:
+    """
+    Finds for all nodes the candidates that are at most n candidate hops away and lie
+    on the shortest path from the node towards the slack (see
+    `find_n_hop_closest_in_slack_direction`). All paths are taken from a single
+    breadth first search from the slack, and the candidates are passed down the
+    resulting tree one hop level at a time. Candidate hops are counted along the
+    path, which matches the single node search for radial grids. Nodes that are
+    not connected to the slack are omitted.
+
+    Returns:
+        A dict mapping each node uuid to the uuids of its found candidates ordered
+        from the node towards the slack.
+    """
+    topology = raw_grid.topology
+    slack_ds = topology.index(raw_grid.find_slack_downstream())[0]
+    candidate_mask = _candidate_mask(topology, candidates)
+    predecessors, hops = topology.shortest_path_tree(slack_ds)
+
+    # the closest candidates above each node ordered towards the slack, padded with
+    # -1, the additional column is dropped after passing them down
+    closest = np.full((topology.n_nodes, n + 1), -1, dtype=np.int64)
+    connected = np.flatnonzero(np.isfinite(hops))
+    levels = hops[connected].astype(np.int64)
+    order = np.argsort(levels, kind="stable")
+    bounds = np.flatnonzero(np.diff(levels[order])) + 1
+    for level in np.split(connected[order], bounds)[1:]:
+        parents = predecessors[level]
+        shifted = np.column_stack((parents, closest[parents, :-1]))
+        closest[level] = np.where(
+            candidate_mask[parents, None], shifted, closest[parents]
+        )
+
+    uuids = topology.nodes.to_numpy()
+    return {
+        uuids[node]: [uuids[node], *uuids[row[row >= 0]]]
+        for node, row in zip(connected, closest[connected, :n])
+    }
+
+
+def _candidate_mask(topology: GridTopology, candidates: set[str] | None) -> ndarray:
+    candidate_mask = np.ones(topology.n_nodes, dtype=bool)
+    if candidates is not None:
+        # candidates that are not within the grid are ignored
+        idx = topology.nodes.get_indexer(list(candidates))
+        candidate_mask[:] = False
+        candidate_mask[idx[idx >= 0]] = True
+    return candidate_mask
+
+
+def _closest_candidates(
+    topology: GridTopology, node: int, candidate_mask: ndarray, mask: ndarray
+) -> list[int]:
+    # breadth first search from the node that stops at the candidates
+    res = []
+    visited = {node}
+    queue = deque([node])
+    while queue:
+        cur = queue.popleft()
+        if cur != node and candidate_mask[cur]:
+            res.append(cur)
+            continue
+        for neighbor in topology.neighbors(cur, mask):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append(neighbor)
+    return res
 
 
 def find_n_hop_closest_candidates(n: int, G, uuid, candidates):
     """
     Find all nodes within candidates that are n candidate hops away from the given node.
     """
-    closest = set([uuid])
+    closest = {uuid}
     for _ in range(n):
+        found = set()
         for node in closest:
-            closest = closest.union(find_closest_candidates(G, node, candidates))
+            found.update(find_closest_candidates(G, node, candidates))
+        closest |= found
     return closest
 
 
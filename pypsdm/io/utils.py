@@ -4,12 +4,16 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional, Union
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 from pandas.core.groupby.generic import DataFrameGroupBy
 
 ROOT_DIR = os.path.abspath(__file__ + "/../../../")
 
+# number of rows from which the float columns of a csv file are inferred
+FLOAT_DTYPE_SAMPLE_ROWS = 1000
+
 
 class DateTimePattern(Enum):
     UTC_TIME_PATTERN_EXTENDED = "%Y-%m-%dT%H:%M:%SZ"
@@ -52,16 +56,32 @@ def read_csv(
     file_name: str,
     delimiter: str | None = None,
     index_col: Optional[str] = None,
+    float_dtype: Optional[str | np.dtype] = None,
 ) -> DataFrame:
+    """
+    Reads the csv file. If a float dtype is given, the float columns are parsed
+    directly into it (e.g. float32 to halve the memory of the values), which are
+    inferred from the first FLOAT_DTYPE_SAMPLE_ROWS rows.
+    """
     full_path = get_file_path(path, file_name)
     if not full_path.exists():
         raise IOError("File with path: " + str(full_path) + " does not exist")
-    if index_col:
-        return pd.read_csv(
-            full_path, delimiter=delimiter, quotechar='"', index_col=index_col
+    dtype = None
+    if float_dtype is not None:
+        sample = pd.read_csv(
+            full_path,
+            delimiter=delimiter,
+            quotechar='"',
+            index_col=index_col,
+            nrows=FLOAT_DTYPE_SAMPLE_ROWS,
         )
-    else:
-        return pd.read_csv(full_path, delimiter=delimiter, quotechar='"')
+        dtype = {
+            column: float_dtype
+            for column in sample.select_dtypes(include="float64").columns
+        }
+    return pd.read_csv(
+        full_path, delimiter=delimiter, quotechar='"', index_col=index_col, dtype=dtype
+    )
 
 
 def to_date_time(zoned_date_time: str) -> datetime:
@@ -88,8 +108,29 @@ def to_date_time(zoned_date_time: str) -> datetime:
     return datetime(year=year, month=month, day=day, hour=hour, minute=minute)
 
 
+def to_date_times(zoned_date_times: pd.Series) -> pd.Series:
+    """
+    Vectorised version of `to_date_time` for a series of zoned date time strings,
+    which also keeps the minute resolution and drops the zone.
+    """
+    if pd.api.types.is_datetime64_any_dtype(zoned_date_times):
+        return zoned_date_times
+    try:
+        return pd.to_datetime(
+            zoned_date_times.str.slice(0, 10)
+            + " "
+            + zoned_date_times.str.slice(11, 16),
+            format="%Y-%m-%d %H:%M",
+        )
+    except (ValueError, AttributeError):
+        return zoned_date_times.map(to_date_time)
+
+
 def csv_to_grpd_df(
-    file_name: str, simulation_data_path: str, delimiter: str | None = None
+    file_name: str,
+    simulation_data_path: str,
+    delimiter: str | None = None,
+    float_dtype: Optional[str | np.dtype] = None,
 ) -> DataFrameGroupBy:
     """
     Reads in a PSDM csv results file cleans it up and groups it by input_archive model.
@@ -98,11 +139,12 @@ def csv_to_grpd_df(
         file_name: name of the file to read
         simulation_data_path: base directory of the result data
         delimiter: the csv delimiter
+        float_dtype: the dtype to parse the float columns into (see `read_csv`)
 
     Returns:
         DataFrameGroupBy object of the file
     """
-    data = read_csv(simulation_data_path, file_name, delimiter)
+    data = read_csv(simulation_data_path, file_name, delimiter, float_dtype=float_dtype)
 
     if "uuid" in data.columns:
         data = data.drop(columns=["uuid"])
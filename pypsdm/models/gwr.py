@@ -1,10 +1,11 @@
+import concurrent.futures
 from dataclasses import dataclass
 from datetime import datetime
+from functools import reduce
 from pathlib import Path
 from typing import Optional, Tuple, Union
 
 import numpy as np
-import pandas as pd
 from loguru import logger
 
 from pypsdm.io.utils import check_filter
@@ -15,8 +16,15 @@ from pypsdm.models.result.container.grid import GridResultContainer
 from pypsdm.models.result.container.participants import (
     SystemParticipantsResultContainer,
 )
+from pypsdm.models.ts.base import entity_names
 from pypsdm.models.ts.types import ComplexVoltagePower, ComplexVoltagePowerDict
 from pypsdm.plots.common.utils import RGB
+from pypsdm.processing.dataframe import states_at
+
+# number of time steps of which the nodal power is calculated at once
+EXTENDED_NODES_CHUNK_SIZE = 100
+# number of threads that calculate chunks of the nodal power in parallel
+EXTENDED_NODES_MAX_WORKERS = 4
 
 
 @dataclass(frozen=True)
@@ -197,44 +205,81 @@ class GridWithResults(ContainerMixin):
             for (em_uuid, connected_assets) in uuid_to_connected_asset.items()
         ]
 
-    def build_extended_nodes_result(self) -> ComplexVoltagePowerDict:
+    def build_extended_nodes_result(
+        self,
+        chunk_size: int = EXTENDED_NODES_CHUNK_SIZE,
+        parallel: bool = False,
+        max_workers: int = EXTENDED_NODES_MAX_WORKERS,
+    ) -> ComplexVoltagePowerDict:
         """
         Builds extended nodes result by calculation the complex power using the grids
         admittance matrix and the complex nodal voltages.
-        """
-        uuid_to_idx = {uuid: idx for idx, uuid in enumerate(self.nodes.uuid.to_list())}
-        uuid_order = [
-            x[0] for x in sorted(list(uuid_to_idx.items()), key=lambda x: x[1])
-        ]
 
-        voltage_levels = self.nodes.v_rated.value_counts()
-        if len(voltage_levels) > 2:
-            raise NotImplementedError(
-                f"Only implemented for two voltage levels {len(voltage_levels)}"
-            )
-        lv_voltage = voltage_levels.index[0]
+        The power is calculated in per unit of the rated voltage of each node (see
+        `RawGridContainer.admittance_matrix`), which supports any number of voltage
+        levels. Only the admittances between nodes with results are multiplied with
+        their voltages in chunks of time steps, so each chunk holds about
+        `nodes with results x chunk_size` complex values at a time. Nodes connected to
+        a node without results get NaN power, since their current is unknown.
+
+        Args:
+            chunk_size: Number of time steps that are processed at once.
+            parallel: Whether to process the chunks in parallel threads.
+            max_workers: Number of threads when processing in parallel, each of which
+                holds one chunk.
+        """
+        nodes_res = self.nodes_res
+        if not nodes_res:
+            return ComplexVoltagePowerDict({})
 
-        Y = self.raw_grid.admittance_matrix(uuid_to_idx)
-        v_complex = self.nodes_res.v_complex(lv_voltage, favor_ids=False)  # type: ignore
-        v_complex = v_complex.reindex(columns=uuid_order)
-        i = v_complex @ Y
-        i.columns = v_complex.columns
-        s: pd.DataFrame = -(v_complex * np.conj(i))
+        uuid_to_idx = {uuid: idx for idx, uuid in enumerate(self.nodes.uuid.to_list())}
+        Y = self.raw_grid.admittance_matrix(uuid_to_idx, per_unit=True)
+        dfs = [ts.data for ts in nodes_res.values()]
+        res_idx = np.array(
+            [uuid_to_idx[uuid] for uuid in entity_names(nodes_res.keys(), False)]
+        )
+        # admittances of the nodes with results towards all nodes
+        Y_res = Y[res_idx]
+        has_res = np.zeros(len(uuid_to_idx), dtype=bool)
+        has_res[res_idx] = True
+        # nodes connected to nodes without results, whose voltages are unknown
+        incomplete = np.asarray(abs(Y_res[:, ~has_res]).sum(axis=1)).ravel() > 0
+        Y_res = Y_res[:, res_idx]
+        indices = {id(df.index): df.index for df in dfs}.values()
+        times = reduce(lambda a, b: a.union(b), indices)
+        p = np.empty((len(dfs), len(times)))
+        q = np.empty((len(dfs), len(times)))
+
+        def calc_chunk(start: int):
+            stop = min(start + chunk_size, len(times))
+            states = states_at(dfs, times[start:stop], ["v_mag", "v_ang"])
+            v_res = states["v_mag"] * np.exp(1j * np.radians(states["v_ang"]))
+            s = -(v_res * np.conj(Y_res @ v_res))
+            # power values below 1e-9 are most likely a result of float calculation
+            # imprecision
+            p[:, start:stop] = np.where(np.abs(s.real) > 1e-9, s.real, 0.0)
+            q[:, start:stop] = np.where(np.abs(s.imag) > 1e-9, s.imag, 0.0)
+            p[incomplete, start:stop] = np.nan
+            q[incomplete, start:stop] = np.nan
+
+        starts = range(0, len(times), chunk_size)
+        if parallel:
+            with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+                list(executor.map(calc_chunk, starts))
+        else:
+            for start in starts:
+                calc_chunk(start)
 
         ext_nodes_results = {}
-        nodes_res = self.nodes_res
-        for uuid, node_res in nodes_res.items():
-            node_s = s[uuid]  # type: ignore
-            # power values below 1e-9 are most likel a result of float calculation imprecision
-            node_p = node_s.apply(lambda x: x.real if abs(x.real) > 1e-9 else 0.0)
-            node_q = node_s.apply(lambda x: x.imag if abs(x.imag) > 1e-9 else 0.0)
-            ext_node_res_data = node_res.data.copy()
-            ext_node_res_data["p"] = node_p
-            ext_node_res_data["q"] = node_q
-            ext_node_res = ComplexVoltagePower(
-                ext_node_res_data,
+        positions = {}
+        for i, (key, df) in enumerate(zip(nodes_res.keys(), dfs)):
+            pos = positions.get(id(df.index))
+            if pos is None:
+                pos = times.get_indexer(df.index)
+                positions[id(df.index)] = pos
+            ext_nodes_results[key] = ComplexVoltagePower.from_preprocessed(
+                df.assign(p=p[i, pos], q=q[i, pos])
             )
-            ext_nodes_results[uuid] = ext_node_res
         return ComplexVoltagePowerDict(
             ext_nodes_results,
         )
@@ -287,6 +332,8 @@ class GridWithResults(ContainerMixin):
         simulation_end: Optional[datetime] = None,
         filter_start: Optional[datetime] = None,
         filter_end: Optional[datetime] = None,
+        compact: bool = False,
+        drop_unchanged: bool = False,
     ) -> "GridWithResults":
         check_filter(filter_start, filter_end)
 
@@ -311,6 +358,8 @@ class GridWithResults(ContainerMixin):
             grid_container=grid,
             filter_start=filter_start,
             filter_end=filter_end,
+            compact=compact,
+            drop_unchanged=drop_unchanged,
         )
 
         if not results:
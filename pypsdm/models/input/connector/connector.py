@@ -2,7 +2,9 @@ from abc import ABC
 from dataclasses import dataclass
 from typing import Sequence, TypeVar, Union
 
+import numpy as np
 import pandas as pd
+from scipy import sparse
 
 from pypsdm.models.input.entity import Entities
 from pypsdm.models.input.node import Nodes
@@ -73,6 +75,44 @@ class Connector(Entities, ABC):
         """
         return self.filter_by_nodes([node_a_uuid, node_b_uuid], both_in_nodes=True)
 
+    def _admittance_matrix(
+        self,
+        uuid_to_idx: dict,
+        yij: pd.Series,
+        y0_a: pd.Series,
+        y0_b: pd.Series,
+        dense: bool = False,
+    ) -> sparse.csr_array | np.ndarray:
+        """
+        Assembles the nodal admittance matrix of the pi equivalent circuits of all
+        connectors. The admittances of a single device are multiplied by the number
+        of parallel devices.
+
+        Args:
+            uuid_to_idx: Mapping of node uuids to their index within the matrix.
+            yij: Branch admittance of each connector.
+            y0_a: Phase to ground admittance at node a of each connector.
+            y0_b: Phase to ground admittance at node b of each connector.
+            dense: Whether to return a dense array instead of a sparse matrix.
+        """
+        nr_nodes = len(uuid_to_idx)
+        idx = pd.Series(uuid_to_idx)
+        i = idx.loc[self.node_a].to_numpy()
+        j = idx.loc[self.node_b].to_numpy()
+        parallel = self.parallel_devices.to_numpy(dtype=float)
+        yij = yij.to_numpy(dtype=complex) * parallel
+        y0_a = y0_a.to_numpy(dtype=complex) * parallel
+        y0_b = y0_b.to_numpy(dtype=complex) * parallel
+        # duplicate entries are summed up on conversion
+        Y = sparse.coo_array(
+            (
+                np.concatenate([yij + y0_a, yij + y0_b, -yij, -yij]),
+                (np.concatenate([i, j, i, j]), np.concatenate([i, j, j, i])),
+            ),
+            shape=(nr_nodes, nr_nodes),
+        ).tocsr()
+        return Y.toarray() if dense else Y
+
     def insert_node_id_columns(self, nodes: Nodes) -> None:
         index_to_id = nodes.id.to_dict()
 
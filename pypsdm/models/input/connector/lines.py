@@ -2,9 +2,9 @@ from dataclasses import dataclass
 from typing import List
 
 import numpy as np
-import pandas as pd
 from loguru import logger
 from pandas import Series
+from scipy import sparse
 
 from pypsdm.models.enums import RawGridElementsEnum
 from pypsdm.models.input.connector.connector import Connector
@@ -66,35 +66,22 @@ class Lines(HasTypeMixin, Connector):
 
     def gij(self) -> Series:
         """Pi equivalent circuit: Branch conductance."""
-
-        def gij(row: Series):
-            r = row["r"] * row["length"]
-            x = row["x"] * row["length"]
-
-            if r == 0:
-                return 0
-            if x == 0:
-                return 1 / r
-            else:
-                return r / ((r**2) + (x**2))
-
-        return (self.data.apply(lambda row: gij(row), axis=1)).rename("gij")  # type: ignore
+        r, x = self._branch_impedance()
+        gij = np.divide(r, r**2 + x**2, out=np.zeros(len(r)), where=r != 0)
+        return Series(gij, index=self.data.index, name="gij")
 
     def bij(self) -> Series:
         """Pi equivalent circuit: Branch susceptance."""
-
-        def bij(row: Series):
-            r = row["r"] * row["length"]
-            x = row["x"] * row["length"]
-
-            if x == 0:
-                return 0
-            if r == 0:
-                return -1 / x
-            else:
-                return -x / ((r**2) + (x**2))
-
-        return (self.data.apply(lambda row: bij(row), axis=1)).rename("bij")  # type: ignore
+        r, x = self._branch_impedance()
+        bij = np.divide(-x, r**2 + x**2, out=np.zeros(len(x)), where=x != 0)
+        return Series(bij, index=self.data.index, name="bij")
+
+    def _branch_impedance(self) -> tuple[np.ndarray, np.ndarray]:
+        length = self.length.to_numpy(dtype=float)
+        return (
+            self.r.to_numpy(dtype=float) * length,
+            self.x.to_numpy(dtype=float) * length,
+        )
 
     def yij(self) -> Series:
         """Pi equivalent circuit: Branch admittance."""
@@ -112,34 +99,26 @@ class Lines(HasTypeMixin, Connector):
         """Pi quivalent circuit: Phase to ground conductance."""
         return (self.g * 1e-6 * self.length / 2).rename("g0")
 
-    def admittance_matrix(self, uuid_to_idx: dict) -> np.ndarray:
-        """TODO: `parallelDevices` not yet considered."""
+    def admittance_matrix(
+        self, uuid_to_idx: dict, dense: bool = False, per_unit: bool = False
+    ) -> sparse.csr_array | np.ndarray:
+        """
+        Builds the nodal admittance matrix of the lines considering their parallel
+        devices.
+
+        Args:
+            uuid_to_idx: Mapping of node uuids to their index within the matrix.
+            dense: Whether to return a dense array instead of a sparse matrix.
+            per_unit: Whether to relate the admittances to the rated voltage of the
+                lines and a base power of 1 MVA.
+        """
         if len(self) == 0:
-            logger.warning("No lines. Returning empty array.")
-            return np.array([])
-        nr_nodes = len(uuid_to_idx)
-        Y = np.zeros((nr_nodes, nr_nodes), dtype=complex)
-        lines_data = pd.concat([self.data, self.yij(), self.y0()], axis=1)
-
-        def add_line_to_admittance_matrix(
-            line: pd.Series, Y: np.ndarray, uuid_to_idx: dict
-        ):
-            i = uuid_to_idx[line["node_a"]]
-            j = uuid_to_idx[line["node_b"]]
-            yij = line["yij"]
-            yaa = line["y0"]
-
-            Y[i, i] += yij + yaa
-            Y[j, j] += yij + yaa
-
-            Y[i, j] -= yij
-            Y[j, i] -= yij
-
-        _ = lines_data.apply(
-            lambda line: add_line_to_admittance_matrix(line, Y, uuid_to_idx),
-            axis=1,  # type: ignore
-        )
-        return Y
+            logger.warning("No lines. Returning empty admittance matrix.")
+        yij, y0 = self.yij(), self.y0()
+        if per_unit:
+            v_base = self.v_rated.astype(float) ** 2
+            yij, y0 = yij * v_base, y0 * v_base
+        return self._admittance_matrix(uuid_to_idx, yij, y0, y0, dense)
 
     def aggregated_line_length(self) -> float:
         """
@@ -4,6 +4,7 @@ from typing import Literal
 import numpy as np
 import pandas as pd
 from loguru import logger
+from scipy import sparse
 
 from pypsdm.models.enums import RawGridElementsEnum
 from pypsdm.models.input.connector.connector import Connector
@@ -57,6 +58,7 @@ class Transformers2W(HasTypeMixin, Connector):
 
     @property
     def d_v(self):
+        """Voltage magnitude deviation per tap position in %."""
         return self.data["d_v"]
 
     @property
@@ -85,42 +87,30 @@ class Transformers2W(HasTypeMixin, Connector):
 
     @property
     def tap_ratio(self):
-        return 1 + (self.tap_pos - self.tap_neutr) * self.d_v
+        return 1 + (self.tap_pos - self.tap_neutr) * self.d_v / 100
 
-    @staticmethod
-    def _tap_ratio(row):
-        return 1 + (row["tap_pos"] - row["tap_neutr"]) * row["d_v"]
-
-    def admittance_matrix(self, uuid_to_idx: dict) -> np.ndarray:
-        """TODO: `parallelDevices` not yet considered."""
+    def admittance_matrix(
+        self, uuid_to_idx: dict, dense: bool = False, per_unit: bool = False
+    ) -> sparse.csr_array | np.ndarray:
+        """
+        Builds the nodal admittance matrix of the transformers considering their
+        parallel devices.
+
+        Args:
+            uuid_to_idx: Mapping of node uuids to their index within the matrix.
+            dense: Whether to return a dense array instead of a sparse matrix.
+            per_unit: Whether to relate the admittances to the rated voltages of
+                both ports and a base power of 1 MVA. Since the admittances are
+                related to the low voltage side, this scales them with the rated
+                voltage of the low voltage side.
+        """
         if len(self) == 0:
-            logger.warning("No trafos. Returning empty array.")
-            return np.array([])
-        nr_nodes = len(uuid_to_idx)
-        Y = np.zeros((nr_nodes, nr_nodes), dtype=complex)
-        trafos_data = pd.concat(
-            [self.data, self.yij(), self.y0("high"), self.y0("low")], axis=1
-        )
-
-        def add_trafo_to_admittance_matrix(
-            trafo: pd.Series, Y: np.ndarray, uuid_to_idx: dict
-        ):
-            i = uuid_to_idx[trafo["node_a"]]
-            j = uuid_to_idx[trafo["node_b"]]
-            yij = trafo["yij"]
-            yaa = trafo["y0_high"]
-            ybb = trafo["y0_low"]
-
-            Y[i, i] += yij + yaa
-            Y[j, j] += yij + ybb
-
-            Y[i, j] -= yij
-            Y[j, i] -= yij
-
-        _ = trafos_data.apply(
-            lambda trafo: add_trafo_to_admittance_matrix(trafo, Y, uuid_to_idx), axis=1  # type: ignore
-        )
-        return Y
+            logger.warning("No trafos. Returning empty admittance matrix.")
+        yij, y0_high, y0_low = self.yij(), self.y0("high"), self.y0("low")
+        if per_unit:
+            v_base = self.v_rated_b.astype(float) ** 2
+            yij, y0_high, y0_low = yij * v_base, y0_high * v_base, y0_low * v_base
+        return self._admittance_matrix(uuid_to_idx, yij, y0_high, y0_low, dense)
 
     def volt_ratio(self):
         return self.v_rated_a / self.v_rated_b
@@ -135,49 +125,21 @@ class Transformers2W(HasTypeMixin, Connector):
 
     def y0(self, port: Literal["high"] | Literal["low"]):
         """Phase-to-ground admittance"""
-
-        def y0(row):
-            tap_side = row["tap_side"]
-            if tap_side:
-                tap_side = "low"
-            else:
-                tap_side = "high"
-            tap_ratio = self._tap_ratio(row)
-
-            # convert to ohm and relate to low voltage side
-            g0 = (row["g_m"] * 1e-9) * ((row["v_rated_a"] / row["v_rated_b"]) ** 2)
-            b0 = (row["b_m"] * 1e-9) * ((row["v_rated_a"] / row["v_rated_b"]) ** 2)
-
-            gij = self._gij(row)
-            bij = self._bij(row)
-
-            match (port, tap_side):
-                case ("high", "high"):
-                    gii = 1 / tap_ratio**2 * ((1 - tap_ratio) * gij + g0 / 2)
-                    bii = 1 / tap_ratio**2 * ((1 - tap_ratio) * bij + b0 / 2)
-                    y0_single = gii + 1j * bii
-
-                case ("high", "low"):
-                    gii = (1 - 1 / tap_ratio) * gij + g0 / 2
-                    bii = (1 - 1 / tap_ratio) * bij + b0 / 2
-                    y0_single = gii + 1j * bii
-
-                case ("low", "high"):
-                    gjj = (1 - 1 / tap_ratio) * gij + g0 / 2
-                    bjj = (1 - 1 / tap_ratio) * bij + b0 / 2
-                    y0_single = gjj + 1j * bjj
-
-                case ("low", "low"):
-                    gjj = 1 / tap_ratio**2 * ((1 - tap_ratio) * gij + g0 / 2)
-                    bjj = 1 / tap_ratio**2 * ((1 - tap_ratio) * bij + b0 / 2)
-                    y0_single = gjj + 1j * bjj
-
-                case _:
-                    raise ValueError("Invalid port or tap_side")
-
-            return y0_single
-
-        return (self.data.apply(y0, axis=1)).rename(f"y0_{port}")
+        if port not in ("high", "low"):
+            raise ValueError("Invalid port or tap_side")
+        tap_ratio = self.tap_ratio.to_numpy(dtype=float)
+        # relate to low voltage side
+        y_m = (self.g0() + 1j * self.b0()).to_numpy(dtype=complex)
+        y_ij = (self.gij() + 1j * self.bij()).to_numpy(dtype=complex)
+
+        # tap side is True if the tap changer is on the low voltage side
+        at_tap_side = self.tap_side.to_numpy(dtype=bool) == (port == "low")
+        y0 = np.where(
+            at_tap_side,
+            1 / tap_ratio**2 * ((1 - tap_ratio) * y_ij + y_m / 2),
+            (1 - 1 / tap_ratio) * y_ij + y_m / 2,
+        )
+        return pd.Series(y0, index=self.data.index, name=f"y0_{port}")
 
     def yij(self):
         """Branch admittance"""
@@ -185,36 +147,23 @@ class Transformers2W(HasTypeMixin, Connector):
 
     def gij(self):
         """Pi equivalent branch conductance"""
-        return (self.data.apply(lambda row: self._gij(row), axis=1)).rename("gij")
-
-    @staticmethod
-    def _gij(row):
-        # relate to low voltage side
-        r = row["r_sc"] / ((row["v_rated_a"] / row["v_rated_b"]) ** 2)
-        x = row["x_sc"] / ((row["v_rated_a"] / row["v_rated_b"]) ** 2)
-
-        if r == 0:
-            return 0
-        if x == 0:
-            return 1 / r
-        else:
-            return r / ((r**2) + (x**2))
+        r, x = self._branch_impedance()
+        gij = np.divide(r, r**2 + x**2, out=np.zeros(len(r)), where=r != 0)
+        return pd.Series(gij, index=self.data.index, name="gij")
 
     def bij(self):
         """Pi equivalent branch susceptance"""
-        return (self.data.apply(lambda row: self._bij(row), axis=1)).rename("bij")
+        r, x = self._branch_impedance()
+        bij = np.divide(-x, r**2 + x**2, out=np.zeros(len(x)), where=x != 0)
+        return pd.Series(bij, index=self.data.index, name="bij")
 
-    @staticmethod
-    def _bij(row):
-        r = row["r_sc"] / ((row["v_rated_a"] / row["v_rated_b"]) ** 2)
-        x = row["x_sc"] / ((row["v_rated_a"] / row["v_rated_b"]) ** 2)
-
-        if x == 0:
-            return 0
-        if r == 0:
-            return -1 / x
-        else:
-            return -x / ((r**2) + (x**2))
+    def _branch_impedance(self) -> tuple[np.ndarray, np.ndarray]:
+        # relate to low voltage side
+        volt_ratio = self.volt_ratio().to_numpy(dtype=float)
+        return (
+            self.r_sc.to_numpy(dtype=float) / volt_ratio**2,
+            self.x_sc.to_numpy(dtype=float) / volt_ratio**2,
+        )
 
     def g0(self):
         return ((self.g_m * 1e-9) * self.volt_ratio() ** 2).rename("g0")
@@ -104,12 +104,10 @@ class GridContainer(ContainerMixin):
         return grid if include_empty else [g for g in grid if g]
 
     def get_nodal_primary_data(self):
-        time_series = []
         nodal_primary_data = dict()
         for node, participants_container in self.node_participants_map.items():
             participants_uuids = participants_container.uuids().tolist()
             node_primary_data = self.primary_data.get_for_assets(participants_uuids)
-            time_series.extend(node_primary_data)
             node_primary_data_agg = ComplexPower.sum(node_primary_data)
             nodal_primary_data[node] = node_primary_data_agg
         return nodal_primary_data
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import concurrent.futures
 import copy
 import os
 from abc import ABC, abstractmethod
@@ -11,10 +10,13 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Self, Tuple
 
 from loguru import logger
+from pandas import DataFrame, Series
 
 from pypsdm.errors import ComparisonError
 from pypsdm.io.utils import check_filter
 from pypsdm.models.enums import EntitiesEnum
+from pypsdm.processing.dataframe import memory_usage
+from pypsdm.processing.parallel import process_pool
 
 if TYPE_CHECKING:
     from pypsdm.models.input.container.grid import GridContainer
@@ -59,6 +61,8 @@ class ContainerMixin(ABC):
         """
         Creates a copy of the current container instance.
         By default, does a deep copy of all data and replaces the given changes.
+        Thanks to copy on write, the data of a deep copy is shared with the original
+        until either of them is modified.
         When deep is false, only the references to the data of the non-changed
         attribtues are copied.
 
@@ -72,6 +76,18 @@ class ContainerMixin(ABC):
         to_copy = copy.deepcopy(self) if deep else self
         return replace(to_copy, **changes)
 
+    def dataframes(self) -> list[DataFrame]:
+        """Returns the data of all entities within the container."""
+        return [df for e in self.to_list(include_empty=True) for df in e.dataframes()]
+
+    def memory_usage(self, *others: ContainerMixin) -> Series:
+        """
+        Returns the memory used by the data of all entities within the container,
+        optionally together with other containers (e.g. copies) to show how much
+        memory they share. See `pypsdm.processing.dataframe.memory_usage` for details.
+        """
+        return memory_usage(df for c in (self, *others) for df in c.dataframes())
+
     def compare(self, other) -> None:
         """
         Compares the grid with another grid, and raises an error if they are not equal.
@@ -110,6 +126,46 @@ class ResultContainerMixin(ContainerMixin):
     def entity_keys(cls):
         raise NotImplementedError
 
+    @abstractmethod
+    def to_dict(self, include_empty: bool = False) -> dict:
+        raise NotImplementedError
+
+    def compact(self) -> Self:
+        """
+        Returns the container with float32 instead of float64 result values. See
+        `pypsdm.processing.dataframe.compact_df` for details.
+        """
+        return self.__class__({k: v.compact() for k, v in self.to_dict().items()})
+
+    def drop_unchanged(self) -> Self:
+        """
+        Returns the container without result rows that equal their predecessor. See
+        `TimeSeries.drop_unchanged` for details.
+        """
+        return self.__class__(
+            {k: v.drop_unchanged() for k, v in self.to_dict().items()}
+        )
+
+    def states_at(
+        self, times: datetime | list[datetime], favor_ids: bool = True
+    ) -> dict[EntitiesEnum, dict[str, DataFrame]]:
+        """
+        Returns a snapshot of the states of all entities at the given times. See
+        `TimeSeriesDict.states_at` for more information.
+
+        Args:
+            times: The time or times of the snapshot.
+            favor_ids: If True, the entity names are used for the index otherwise
+                the uuids.
+        Returns:
+            Per entity type a DataFrame per attribute indexed by entity with the
+            times as columns.
+        """
+        return {
+            k: v.states_at(times, favor_ids=favor_ids)
+            for k, v in self.to_dict().items()
+        }
+
     @classmethod
     def entities_from_csv(
         cls,
@@ -119,6 +175,8 @@ class ResultContainerMixin(ContainerMixin):
         delimiter: str | None = None,
         filter_start: datetime | None = None,
         filter_end: datetime | None = None,
+        compact: bool = False,
+        drop_unchanged: bool = False,
     ) -> dict[EntitiesEnum, EntitiesResultDictMixin]:
         from pypsdm.models.result.participant.dict import EntitiesResultDictMixin
 
@@ -133,7 +191,7 @@ class ResultContainerMixin(ContainerMixin):
         entity_values = cls.entity_keys()
 
         check_filter(filter_start, filter_end)
-        with concurrent.futures.ProcessPoolExecutor() as executor:
+        with process_pool() as executor:
             # warning: Breakpoints in the underlying method might not work when started from ipynb
             pa_from_csv_for_participant = partial(
                 EntitiesResultDictMixin.from_csv_for_entity,
@@ -141,6 +199,8 @@ class ResultContainerMixin(ContainerMixin):
                 simulation_end,
                 grid_container,
                 delimiter=delimiter,
+                compact=compact,
+                drop_unchanged=drop_unchanged,
             )
             participant_results = executor.map(
                 pa_from_csv_for_participant,
@@ -1,10 +1,13 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Union
+from typing import TYPE_CHECKING, Mapping, Union
 
+import numpy as np
 from networkx import Graph
+from pandas import DataFrame
+from scipy import sparse
 
-from pypsdm.graph import find_branches
+from pypsdm.graph import GridTopology
 from pypsdm.models.enums import RawGridElementsEnum
 from pypsdm.models.input.connector.lines import Lines
 from pypsdm.models.input.connector.switches import Switches
@@ -12,6 +15,14 @@ from pypsdm.models.input.connector.transformer import Transformers2W
 from pypsdm.models.input.container.mixins import ContainerMixin
 from pypsdm.models.input.entity import Entities
 from pypsdm.models.input.node import Nodes
+from pypsdm.models.ts.types import ComplexPowerDict
+
+if TYPE_CHECKING:
+    from pypsdm.analysis.power_flow import (
+        PowerFlowMethod,
+        PowerFlowResult,
+        PowerFlowStore,
+    )
 
 
 @dataclass(frozen=True)
@@ -30,45 +41,37 @@ class RawGridContainer(ContainerMixin):
 
     def get_branches(self, as_graphs=False) -> Union[list[list[str]], list[Graph]]:
         """
-        Returns all branches, branching off from the slack node of the grid.
-        The branches are either returned as a list of lists, where each list contains the node uuids of the branch,
-        starting at the slack node, or rather as subgraphs containing all nodes and edges of the branch.
-        Currently only works for single slack node and single voltage level grids.
+        Returns all branches of the grid. Branches start at the nodes downstream of
+        each slack node, i.e. the nodes connected to it via a transformer, or the slack
+        node itself if it is not connected to a transformer. In grids with multiple
+        voltage levels the lower voltage nodes of all other transformers start
+        branches as well. A branch holds its starting node followed by the nodes
+        reachable from it via lines and closed switches in depth first order. Nodes
+        reachable from multiple starts belong to the first of them in this order. A
+        start that is reached from an earlier start forms a branch of its own.
         Args:
             as_graphs: If True, returns the branches as subgraphs, otherwise as lists of node uuids.
         Returns:
             A list of lists or a list of subgraphs, containing the branches of the grid.
         """
-
-        slack_node = self.nodes.get_slack_nodes()
-        if len(slack_node.data) != 1:
-            raise ValueError("Currently only implemented for singular slack nodes.")
-        transformers = self.transformers_2_w
-        slack_transformers = Transformers2W(
-            transformers.data[
-                (transformers.node_a.isin(slack_node.uuid.to_list()))
-                | (transformers.node_b.isin(slack_node.uuid.to_list()))
-            ]
-        )
-        slack_connected_node = (
-            set(slack_transformers.node_a)
-            .union(slack_transformers.node_b)
-            .difference(slack_node.uuid)
-        )
-        if len(slack_connected_node) > 1:
-            raise ValueError(
-                "There are multiple nodes connected to the slack node via a transformer."
-            )
-        elif len(slack_connected_node) == 0 and len(slack_node.uuid) == 0:
+        topology = self.topology
+        slack_nodes = topology.index(self.nodes.get_slack_nodes().uuid)
+        if len(slack_nodes) == 0:
             raise ValueError("Did not find a slack node!")
-        elif len(slack_connected_node) == 0 and len(slack_node.uuid) > 0:
-            # No transformers connected, use the slack node itself
-            slack_connected_node = slack_node.uuid[0]
-        else:
-            slack_connected_node = slack_connected_node.pop()
-        graph = self.build_networkx_graph()
-        branches = find_branches(graph, slack_connected_node)
+        transformers = topology.edge_mask([RawGridElementsEnum.TRANSFORMER_2_W])
+        roots, isolated = [], []
+        for slack_node in slack_nodes:
+            downstream = topology.neighbors(slack_node, transformers)
+            roots.extend(downstream)
+            if len(downstream) == 0:
+                # no transformers connected, use the slack node itself
+                isolated.append(slack_node)
+        roots.extend(topology.edge_b[transformers])
+        roots.extend(isolated)
+        uuids = topology.nodes.to_numpy()
+        branches = [uuids[branch].tolist() for branch in topology.branches(roots)]
         if as_graphs:
+            graph = self.build_networkx_graph()
             return [graph.subgraph(branch).copy() for branch in branches]
         return branches
 
@@ -87,21 +90,48 @@ class RawGridContainer(ContainerMixin):
             case _:
                 raise ValueError(f"Unknown enum {enum}")
 
-    def build_networkx_graph(self, include_transformer: bool = False) -> Graph:
-        graph = Graph()
-        closed_switches = self.switches.get_closed()
-        line_data_dicts = self.lines.data.apply(
-            lambda row: {"weight": row["length"]}, axis=1
+    @property
+    def topology(self) -> GridTopology:
+        """
+        The compact topology of the grid. It is cached per container and rebuilt
+        once the data of the nodes, lines, switches or transformers is replaced. In
+        place edits of the data are not detected, call `invalidate_topology` after
+        them. Copies and pickles of the container don't carry the cache.
+        """
+        key = self._topology_key()
+        cached = self.__dict__.get("_topology")
+        if cached is None or any(a is not b for a, b in zip(cached[0], key)):
+            cached = (key, GridTopology.from_raw_grid(self))
+            # the dataclass is frozen, the cache is no field of it
+            self.__dict__["_topology"] = cached
+        return cached[1]
+
+    def invalidate_topology(self):
+        """
+        Drops the cached topology, so that it is rebuilt on its next access. Needed
+        after editing the data of the grid in place.
+        """
+        self.__dict__.pop("_topology", None)
+
+    def _topology_key(self) -> tuple[DataFrame, ...]:
+        # the data the topology is built from, compared by identity
+        return tuple(
+            entities.data
+            for entities in [
+                self.nodes,
+                self.lines,
+                self.switches,
+                self.transformers_2_w,
+            ]
         )
 
-        graph.add_nodes_from(self.nodes.uuid)
-        graph.add_edges_from(zip(self.lines.node_a, self.lines.node_b, line_data_dicts))
-        graph.add_edges_from(zip(closed_switches.node_a, closed_switches.node_b))
-        if include_transformer:
-            graph.add_edges_from(
-                zip(self.transformers_2_w.node_a, self.transformers_2_w.node_b)
-            )
-        return graph
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_topology", None)
+        return state
+
+    def build_networkx_graph(self, include_transformer: bool = False) -> Graph:
+        return self.topology.to_networkx(include_transformer)
 
     def filter_by_nodes(self, nodes: Union[str, list[str], set[str]]):
         return RawGridContainer(
@@ -111,41 +141,128 @@ class RawGridContainer(ContainerMixin):
             self.switches.filter_by_nodes(nodes, both_in_nodes=True),
         )
 
-    def admittance_matrix(self, uuid_to_idx: dict):
-        """TODO: `parallelDevices` not yet considered."""
-        lines_admittance = self.lines.admittance_matrix(uuid_to_idx)
-        transformers_admittance = self.transformers_2_w.admittance_matrix(uuid_to_idx)
-        return lines_admittance + transformers_admittance
+    def admittance_matrix(
+        self, uuid_to_idx: dict, dense: bool = False, per_unit: bool = False
+    ) -> sparse.csr_array | np.ndarray:
+        """
+        Builds the nodal admittance matrix of the lines and transformers considering
+        their parallel devices.
+
+        Args:
+            uuid_to_idx: Mapping of node uuids to their index within the matrix.
+            dense: Whether to return a dense array instead of a sparse matrix.
+            per_unit: Whether to relate the admittances to the rated voltages of the
+                nodes and a base power of 1 MVA. Multiplying the per unit matrix
+                with per unit voltages results in currents whose nodal power is in
+                MVA, regardless of the number of voltage levels.
+        """
+        lines_admittance = self.lines.admittance_matrix(uuid_to_idx, per_unit=per_unit)
+        transformers_admittance = self.transformers_2_w.admittance_matrix(
+            uuid_to_idx, per_unit=per_unit
+        )
+        Y = (lines_admittance + transformers_admittance).tocsr()
+        return Y.toarray() if dense else Y
+
+    def power_flow(
+        self,
+        nodal_power: ComplexPowerDict,
+        method: "PowerFlowMethod" = "newton_raphson",
+        tolerance: float | None = None,
+        max_iterations: int | None = None,
+        chunk_size: int | None = None,
+    ) -> "PowerFlowResult":
+        """
+        Solves the balanced power flow for each event of the nodal power (see
+        `pypsdm.analysis.power_flow.power_flow`).
+
+        Args:
+            nodal_power: Event discrete power drawn at the nodes in MW and MVAr,
+                keyed by node uuid.
+            method: The solution method (see `PowerFlowGrid.solve`).
+            tolerance: The maximum power mismatch in MVA (newton raphson) or voltage
+                change in p.u. (sweep, zbus) at which the solution is converged.
+            max_iterations: The maximum number of iterations.
+            chunk_size: Number of time steps that are solved at once.
+        """
+        from pypsdm.analysis.power_flow import (
+            DEFAULT_MAX_ITERATIONS,
+            DEFAULT_TOLERANCE,
+            POWER_FLOW_CHUNK_SIZE,
+            power_flow,
+        )
+
+        return power_flow(
+            self,
+            nodal_power,
+            method,
+            tolerance if tolerance is not None else DEFAULT_TOLERANCE,
+            max_iterations if max_iterations is not None else DEFAULT_MAX_ITERATIONS,
+            chunk_size if chunk_size is not None else POWER_FLOW_CHUNK_SIZE,
+        )
+
+    def batch_power_flow(
+        self,
+        scenarios: Mapping[str, ComplexPowerDict],
+        path: str | Path,
+        method: "PowerFlowMethod" = "zbus",
+        tolerance: float | None = None,
+        max_iterations: int | None = None,
+        chunk_size: int | None = None,
+        max_workers: int | None = None,
+    ) -> "PowerFlowStore":
+        """
+        Solves the power flow of many scenarios of nodal power in parallel and
+        stores the results at the given path (see
+        `pypsdm.analysis.power_flow.batch_power_flow`).
+
+        Args:
+            scenarios: The event discrete nodal power of each scenario in MW and
+                MVAr, keyed by node uuid.
+            path: The directory to store the results in.
+            method: The solution method (see `PowerFlowGrid.solve`).
+            tolerance: The maximum power mismatch in MVA (newton raphson) or voltage
+                change in p.u. (sweep, zbus) at which the solution is converged.
+            max_iterations: The maximum number of iterations.
+            chunk_size: Number of time steps that are solved at once.
+            max_workers: The number of worker processes.
+        """
+        from pypsdm.analysis.power_flow import (
+            DEFAULT_MAX_ITERATIONS,
+            DEFAULT_TOLERANCE,
+            POWER_FLOW_CHUNK_SIZE,
+            batch_power_flow,
+        )
+
+        return batch_power_flow(
+            self,
+            scenarios,
+            path,
+            method,
+            tolerance if tolerance is not None else DEFAULT_TOLERANCE,
+            max_iterations if max_iterations is not None else DEFAULT_MAX_ITERATIONS,
+            chunk_size if chunk_size is not None else POWER_FLOW_CHUNK_SIZE,
+            max_workers,
+        )
 
     def find_slack_downstream(self) -> str:
         """
         Find the downstream node of the slack node, which is the node on the transformer's
         lower voltage side.
         """
-        from pypsdm import Transformers2W
-
         slack_node = self.nodes.get_slack_nodes()
         if len(slack_node.data) != 1:
             raise ValueError("Currently only implemented for singular slack nodes.")
-        transformers = self.transformers_2_w
-        slack_transformers = Transformers2W(
-            transformers.data[
-                (transformers.node_a.isin(slack_node.uuid.to_list()))
-                | (transformers.node_b.isin(slack_node.uuid.to_list()))
-            ]
-        )
-        slack_connected_node = (
-            set(slack_transformers.node_a)
-            .union(slack_transformers.node_b)
-            .difference(slack_node.uuid)
-        )
+        topology = self.topology
+        slack = topology.index(slack_node.uuid)[0]
+        transformers = topology.edge_mask([RawGridElementsEnum.TRANSFORMER_2_W])
+        slack_connected_node = topology.neighbors(slack, transformers)
         if len(slack_connected_node) > 1:
             raise ValueError(
                 "There are multiple nodes connected to the slack node via a transformer."
             )
         elif len(slack_connected_node) == 0:
             raise ValueError("Did not find a slack node!")
-        return slack_connected_node.pop()
+        return topology.nodes[slack_connected_node[0]]
 
     @classmethod
     def from_csv(
@@ -21,7 +21,7 @@ from pypsdm.models.enums import (
     SystemParticipantsEnum,
 )
 from pypsdm.models.ts.base import EntityKey
-from pypsdm.processing.dataframe import compare_dfs
+from pypsdm.processing.dataframe import compare_dfs, memory_usage
 
 if TYPE_CHECKING:
     from pypsdm.models.input.node import Nodes
@@ -310,6 +310,25 @@ class Entities(ABC):
                 differences=[(type(self), str(e))],
             )
 
+    def __deepcopy__(self, memo: dict) -> Self:
+        # thanks to copy on write the data is shared until either side modifies it
+        entities = copy.copy(self)
+        object.__setattr__(entities, "data", self.data.copy(deep=False))
+        memo[id(self)] = entities
+        return entities
+
+    def dataframes(self) -> list[DataFrame]:
+        """Returns the data of the entities."""
+        return [self.data]
+
+    def memory_usage(self, *others: Entities) -> Series:
+        """
+        Returns the memory used by the data, optionally together with other entities
+        (e.g. copies) to show how much memory they share. See
+        `pypsdm.processing.dataframe.memory_usage` for details.
+        """
+        return memory_usage(e.data for e in (self, *others))
+
     def copy(
         self: EntityType,
         deep=True,
@@ -318,6 +337,8 @@ class Entities(ABC):
         """
         Creates a copy of the current Entities instance.
         By default, does a deep copy of all data and replaces the given changes.
+        Thanks to copy on write, the data of a deep copy is shared with the original
+        until either of them is modified.
         When deep is false, only the references to the data of the non-changed attributes are copied.
 
         Args:
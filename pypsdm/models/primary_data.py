@@ -2,11 +2,12 @@ import concurrent.futures
 import copy
 import os
 import re
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from functools import partial
 from pathlib import Path
-from typing import Union
+from typing import TYPE_CHECKING, Union
 
 import pandas as pd
 from loguru import logger
@@ -17,13 +18,24 @@ from pypsdm.io import utils
 from pypsdm.io.utils import df_to_csv, to_date_time
 from pypsdm.models.enums import TimeSeriesEnum
 from pypsdm.models.ts.types import ComplexPower, ComplexPowerDict
+from pypsdm.processing.parallel import process_pool
 
+if TYPE_CHECKING:
+    from pypsdm.models.input.container.participants import (
+        SystemParticipantsContainer,
+    )
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class TimeSeriesKey:
     ts_uuid: str
     ts_type: TimeSeriesEnum | None
 
+    def __post_init__(self):
+        # share the uuid string with other keys of the same time series
+        if type(self.ts_uuid) is str:
+            object.__setattr__(self, "ts_uuid", sys.intern(self.ts_uuid))
+
     def __eq__(self, other):
         return self.ts_uuid == other.ts_uuid
 
@@ -135,6 +147,32 @@ class PrimaryData:
         else:
             return None
 
+    def nodal_power(
+        self, participants: "SystemParticipantsContainer"
+    ) -> ComplexPowerDict:
+        """
+        Sums up the primary data of the assets at each node.
+
+        Args:
+            participants: The participants of the grid to determine the nodes of the
+                assets.
+
+        Returns:
+            The power per node uuid.
+        """
+        nodes = pd.concat(
+            [p.node for p in participants.to_list() if "node" in p.data.columns]
+        )
+        nodal_ts: dict[str, list[ComplexPower]] = {}
+        for asset, ts_key in self._asset_mapping.items():
+            if asset not in nodes.index:
+                logger.warning(f"Asset {asset} not in input participants")
+                continue
+            nodal_ts.setdefault(nodes[asset], []).append(self._time_series[ts_key])
+        return ComplexPowerDict(
+            {node: ComplexPower.sum(ts) for node, ts in nodal_ts.items()}
+        )
+
     def filter_by_date_time(self, time: Union[datetime, list[datetime]]):
         ts = self._time_series.filter_by_date_time(time)
         return PrimaryData(ts, self._asset_mapping)
@@ -146,7 +184,7 @@ class PrimaryData:
     def to_csv(self, path: str, mkdirs=False, delimiter=","):
         write_ts = partial(PrimaryData._write_ts_df, path, mkdirs, delimiter)
 
-        with concurrent.futures.ProcessPoolExecutor() as executor:
+        with process_pool() as executor:
             futures = [
                 executor.submit(write_ts, ts, key)
                 for key, ts in list(self._time_series.items())
@@ -250,7 +288,7 @@ class PrimaryData:
             )
 
             # TODO: Only parallel reading if a lot of ts files
-            with concurrent.futures.ProcessPoolExecutor() as executor:
+            with process_pool() as executor:
                 time_series = executor.map(pa_read_time_series, ts_files)
                 for ts_key, ts in time_series:
                     time_series_dict[ts_key] = ts
@@ -1,9 +1,13 @@
 from .grid import GridResultContainer
-from .participants import SystemParticipantsResultContainer
+from .participants import (
+    ParticipantsResultAggregates,
+    SystemParticipantsResultContainer,
+)
 from .raw_grid import RawGridResultContainer
 
 __all__ = [
     "GridResultContainer",
+    "ParticipantsResultAggregates",
     "SystemParticipantsResultContainer",
     "RawGridResultContainer",
 ]
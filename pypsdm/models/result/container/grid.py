@@ -6,12 +6,17 @@ from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional, Union
 
+from pandas import DataFrame
+
 from pypsdm.io.utils import check_filter
+from pypsdm.models.enums import EntitiesEnum
 from pypsdm.models.input.container.mixins import ContainerMixin
 from pypsdm.models.result.container.participants import (
+    ParticipantsResultAggregates,
     SystemParticipantsResultContainer,
 )
 from pypsdm.models.result.container.raw_grid import RawGridResultContainer
+from pypsdm.models.result.participant.dict import RESULT_CHUNK_SIZE
 
 if TYPE_CHECKING:
     from pypsdm.models.input.container.grid import GridContainer
@@ -109,6 +114,34 @@ class GridResultContainer(ContainerMixin):
             self.participants.filter_by_date_time(time),
         )
 
+    def states_at(
+        self, times: Union[datetime, list[datetime]], favor_ids: bool = True
+    ) -> dict[EntitiesEnum, dict[str, DataFrame]]:
+        """
+        Returns a snapshot of the states of all grid and participant entities at the
+        given times. See `TimeSeriesDict.states_at` for more information.
+        """
+        return {
+            **self.raw_grid.states_at(times, favor_ids),
+            **self.participants.states_at(times, favor_ids),
+        }
+
+    def compact(self) -> GridResultContainer:
+        """
+        Returns the container with float32 instead of float64 result values. See
+        `pypsdm.processing.dataframe.compact_df` for details.
+        """
+        return GridResultContainer(self.raw_grid.compact(), self.participants.compact())
+
+    def drop_unchanged(self) -> GridResultContainer:
+        """
+        Returns the container without result rows that equal their predecessor. See
+        `TimeSeries.drop_unchanged` for details.
+        """
+        return GridResultContainer(
+            self.raw_grid.drop_unchanged(), self.participants.drop_unchanged()
+        )
+
     def interval(self, start: datetime, end: datetime):
         return GridResultContainer(
             self.raw_grid.interval(start, end),
@@ -144,6 +177,8 @@ class GridResultContainer(ContainerMixin):
         grid_container: Optional[GridContainer] = None,
         filter_start: Optional[datetime] = None,
         filter_end: Optional[datetime] = None,
+        compact: bool = False,
+        drop_unchanged: bool = False,
     ):
         res_files = [
             f for f in os.listdir(simulation_data_path) if f.endswith("_res.csv")
@@ -162,6 +197,8 @@ class GridResultContainer(ContainerMixin):
             grid_container=grid_container,
             filter_start=filter_start,
             filter_end=filter_end,
+            compact=compact,
+            drop_unchanged=drop_unchanged,
         )
 
         if simulation_end is None:
@@ -176,10 +213,38 @@ class GridResultContainer(ContainerMixin):
             filter_start=filter_start,
             filter_end=filter_end,
             delimiter=delimiter,
+            compact=compact,
+            drop_unchanged=drop_unchanged,
         )
 
         return cls(raw_grid, participants)
 
+    @classmethod
+    def aggregate_from_csv(
+        cls,
+        simulation_data_path: str | Path,
+        delimiter: str | None = None,
+        simulation_end: Optional[datetime] = None,
+        grid_container: Optional[GridContainer] = None,
+        chunksize: int = RESULT_CHUNK_SIZE,
+    ) -> ParticipantsResultAggregates:
+        """
+        Chunked alternative to `from_csv` for results that do not fit into memory.
+        Instead of loading the results, the participant energies, power sums and
+        nodal sums are aggregated while streaming through the result files (see
+        `SystemParticipantsResultContainer.aggregate_from_csv`). Unlike `from_csv`
+        the simulation end defaults to the latest participant result, so the node
+        results don't need to be read. Pass the simulation end if the participant
+        results end earlier than the simulation.
+        """
+        return SystemParticipantsResultContainer.aggregate_from_csv(
+            simulation_data_path,
+            simulation_end,
+            grid_container=grid_container,
+            delimiter=delimiter,
+            chunksize=chunksize,
+        )
+
     @classmethod
     def empty(cls):
         return cls(
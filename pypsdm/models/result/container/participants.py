@@ -3,13 +3,15 @@ from datetime import datetime
 from pathlib import Path
 from typing import Iterable, Optional, Self, Tuple, Union
 
-import pandas as pd
-from pandas import DataFrame, Series
+from loguru import logger
+from pandas import DataFrame, Series, Timestamp
 
 from pypsdm.models.enums import EntitiesEnum, SystemParticipantsEnum
 from pypsdm.models.input.container.grid import GridContainer
 from pypsdm.models.input.container.mixins import ResultContainerMixin
+from pypsdm.models.input.container.participants import SystemParticipantsContainer
 from pypsdm.models.result.participant.dict import (
+    RESULT_CHUNK_SIZE,
     EmsResult,
     EvcsResult,
     EvsResult,
@@ -21,8 +23,9 @@ from pypsdm.models.result.participant.dict import (
     WecsResult,
 )
 from pypsdm.models.result.participant.flex_options import FlexOptionsDict
-from pypsdm.models.ts.base import EntityKey, TimeSeriesDict
+from pypsdm.models.ts.base import EntityKey, TimeSeriesDict, entity_names
 from pypsdm.models.ts.types import ComplexPower, ComplexPowerDict
+from pypsdm.processing.series import join_series
 
 
 @dataclass
@@ -81,18 +84,18 @@ class SystemParticipantsResultContainer(ResultContainerMixin):
         raise NotImplementedError("Adding of ParticipantsResultContainer not supported")
 
     def p(self) -> DataFrame:
-        p_series = {
-            participants.entity_type().value: participants.p_sum()  # type: ignore
+        p_series = [
+            participants.p_sum().rename(participants.entity_type().value)  # type: ignore
             for participants in self.participants_to_list()
-        }
-        return pd.DataFrame(p_series).sort_index().ffill().fillna(0)
+        ]
+        return join_series(p_series).fillna(0)
 
     def q(self) -> DataFrame:
-        q_series = {
-            participants.entity_type().value: participants.q_sum()  # type: ignore
+        q_series = [
+            participants.q_sum().rename(participants.entity_type().value)  # type: ignore
             for participants in self.participants_to_list()
-        }
-        return pd.DataFrame(q_series).sort_index().ffill().fillna(0)
+        ]
+        return join_series(q_series).fillna(0)
 
     def p_sum(self) -> Series:
         return self.p().sum(axis=1).rename("p_sum")
@@ -129,10 +132,43 @@ class SystemParticipantsResultContainer(ResultContainerMixin):
 
     def sum(self) -> ComplexPower:
         participant_res = []
-        for participant in self.participants_to_list(include_em=False):
-            participant_res.append(participant.sum())
+        for participants in self.participants_to_list(include_em=False):
+            participant_res.extend(participants.values())
         return ComplexPower.sum(participant_res)
 
+    def nodal_power(
+        self, participants: SystemParticipantsContainer
+    ) -> ComplexPowerDict:
+        """
+        Sums up the power of the participants at each node. Energy management
+        results aggregate the results of their controlled assets and electric
+        vehicles are charged via their charging stations, so both are skipped.
+
+        Args:
+            participants: The corresponding participants to determine their nodes.
+
+        Returns:
+            The power per node uuid.
+        """
+        nodal_res: dict[str, list[ComplexPower]] = {}
+        for sp_type, res in self.participants_to_dict().items():
+            if sp_type in (
+                SystemParticipantsEnum.ENERGY_MANAGEMENT,
+                SystemParticipantsEnum.ELECTRIC_VEHICLE,
+            ):
+                continue
+            input_entities = participants.get_with_enum(sp_type)
+            nodes = input_entities.node if input_entities else Series(dtype=object)
+            for key, ts in res.items():
+                uuid = key.uuid if isinstance(key, EntityKey) else key
+                if uuid not in nodes.index:
+                    logger.warning(f"Participant {uuid} not in input participants")
+                    continue
+                nodal_res.setdefault(nodes[uuid], []).append(ts)
+        return ComplexPowerDict(
+            {node: ComplexPower.sum(res) for node, res in nodal_res.items()}
+        )
+
     def participants_to_dict(
         self, include_empty: bool = False
     ) -> dict[SystemParticipantsEnum, ComplexPowerDict]:
@@ -229,6 +265,8 @@ class SystemParticipantsResultContainer(ResultContainerMixin):
         delimiter: Optional[str] = None,
         filter_start: Optional[datetime] = None,
         filter_end: Optional[datetime] = None,
+        compact: bool = False,
+        drop_unchanged: bool = False,
     ):
         dct = cls.entities_from_csv(
             simulation_data_path,
@@ -237,6 +275,8 @@ class SystemParticipantsResultContainer(ResultContainerMixin):
             delimiter,
             filter_start,
             filter_end,
+            compact,
+            drop_unchanged,
         )
 
         res = SystemParticipantsResultContainer(dct)  # type: ignore
@@ -244,6 +284,89 @@ class SystemParticipantsResultContainer(ResultContainerMixin):
             res if not filter_start else res.interval(filter_start, filter_end)  # type: ignore
         )
 
+    @classmethod
+    def aggregate_from_csv(
+        cls,
+        simulation_data_path: str | Path,
+        simulation_end: Optional[datetime] = None,
+        grid_container: Optional[GridContainer] = None,
+        delimiter: Optional[str] = None,
+        chunksize: int = RESULT_CHUNK_SIZE,
+    ) -> "ParticipantsResultAggregates":
+        """
+        Aggregates the participant results while reading the result files one after
+        another in chunks of rows, so the memory is bounded by the chunk size
+        regardless of the simulation horizon (see
+        `EntitiesResultDictMixin.aggregate_from_csv`). The nodal sums require the
+        grid container to map the participants to their nodes.
+
+        Args:
+            simulation_data_path: The directory holding the result files.
+            simulation_end: The end of the simulation. Defaults to the latest result
+                of all participants.
+            grid_container: The corresponding grid to name the results and determine
+                the nodes of the participants.
+            delimiter: The csv delimiter.
+            chunksize: The number of rows to read at once.
+        """
+        streams = {}
+        for sp_type in SystemParticipantsResultContainer({}).participants_to_dict(
+            include_empty=True
+        ):
+            input_entities = (
+                grid_container.get_with_enum(sp_type) if grid_container else None
+            )
+            groups = None
+            if (
+                input_entities
+                and sp_type != SystemParticipantsEnum.ENERGY_MANAGEMENT
+                and "node" in input_entities.data.columns
+            ):
+                groups = input_entities.node.to_dict()
+            dict_type = sp_type.get_result_dict_type()
+            try:
+                stream = dict_type.stream_from_csv(
+                    simulation_data_path,  # type: ignore
+                    ["p", "q"],
+                    delimiter,
+                    groups,
+                    chunksize,
+                )
+            except FileNotFoundError:
+                continue
+            if stream is not None and stream.end is not None:
+                streams[sp_type] = (stream, dict_type, input_entities)
+
+        # all participants end together, by default at the latest result of any file
+        if simulation_end is None and streams:
+            simulation_end = Timestamp(
+                max(stream.end for stream, _, _ in streams.values())
+            )
+        energies = {}
+        power = {}
+        nodal_sums: dict[str, list[ComplexPower]] = {}
+        for sp_type, (stream, dict_type, input_entities) in streams.items():
+            stream.finish(simulation_end)
+            keys = dict_type.keys_from_uuids(stream.keys, input_entities)
+            energies[sp_type] = DataFrame(
+                {
+                    "energy": stream.total[:, 0],
+                    "load": stream.positive[:, 0],
+                    "generation": stream.negative[:, 0],
+                    "reactive_energy": stream.total[:, 1],
+                },
+                index=entity_names(keys),
+            )
+            power[sp_type] = ComplexPower.from_preprocessed(stream.sum())
+            for node, data in stream.group_sums().items():
+                nodal_sums.setdefault(node, []).append(
+                    ComplexPower.from_preprocessed(data)
+                )
+        nodal_power = ComplexPowerDict(
+            {node: ComplexPower.sum(sums) for node, sums in nodal_sums.items()}
+        )
+        return ParticipantsResultAggregates(energies, power, nodal_power)
+
     @classmethod
     def entity_keys(cls) -> set[SystemParticipantsEnum]:
         return set(
@@ -253,3 +376,58 @@ class SystemParticipantsResultContainer(ResultContainerMixin):
     @classmethod
     def empty(cls) -> Self:
         return cls({})
+
+
+@dataclass(frozen=True)
+class ParticipantsResultAggregates:
+    """
+    Aggregates of participant results that are gathered while streaming through the
+    result files (see `SystemParticipantsResultContainer.aggregate_from_csv`). They
+    provide the aggregations of the result container without holding the results of
+    the individual participants.
+
+    Attributes:
+        entity_energies: The energy, its load (positive) and generation (negative)
+            share as well as the reactive energy of each participant per participant
+            type (see `ComplexPowerDictMixin.energies`).
+        power: The summed power of all participants per participant type.
+        nodal_power: The summed power of all participants (except energy management
+            systems) connected to each node, keyed by node uuid.
+    """
+
+    entity_energies: dict[SystemParticipantsEnum, DataFrame]
+    power: dict[SystemParticipantsEnum, ComplexPower]
+    nodal_power: ComplexPowerDict
+
+    def energies(self) -> dict[SystemParticipantsEnum, float]:
+        return {
+            sp_type: float(energies["energy"].sum())
+            for sp_type, energies in self.entity_energies.items()
+        }
+
+    def load_and_generation_energies(
+        self,
+    ) -> dict[SystemParticipantsEnum, Tuple[float, float]]:
+        return {
+            sp_type: power.load_and_generation_energy()
+            for sp_type, power in self.power.items()
+        }
+
+    def p(self) -> DataFrame:
+        return join_series(
+            [power.p.rename(sp_type.value) for sp_type, power in self.power.items()]
+        ).fillna(0)
+
+    def q(self) -> DataFrame:
+        return join_series(
+            [power.q.rename(sp_type.value) for sp_type, power in self.power.items()]
+        ).fillna(0)
+
+    def p_sum(self) -> Series:
+        return self.p().sum(axis=1).rename("p_sum")
+
+    def q_sum(self) -> Series:
+        return self.q().sum(axis=1).rename("q_sum")
+
+    def nodal_energies(self) -> dict[str, float]:
+        return {node: power.energy() for node, power in self.nodal_power.items()}
@@ -125,6 +125,8 @@ class RawGridResultContainer(ResultContainerMixin):
         delimiter: Optional[str] = None,
         filter_start: Optional[datetime] = None,
         filter_end: Optional[datetime] = None,
+        compact: bool = False,
+        drop_unchanged: bool = False,
     ):
         dct = cls.entities_from_csv(
             simulation_data_path,
@@ -133,6 +135,8 @@ class RawGridResultContainer(ResultContainerMixin):
             delimiter,
             filter_start,
             filter_end,
+            compact,
+            drop_unchanged,
         )
         res = RawGridResultContainer(dct)  # type: ignore
         return (
@@ -30,7 +30,7 @@ class ConnectorCurrent(TimeSeries):
         data = self.data[["i_a_mag", "i_a_ang"]].rename(
             columns={"i_a_mag": "i_mag", "i_a_ang": "i_ang"}
         )
-        return ComplexCurrent(data)
+        return ComplexCurrent.from_preprocessed(data)
 
     @property
     def i_a_mag(self) -> Series:
@@ -55,7 +55,7 @@ class ConnectorCurrent(TimeSeries):
         data = self.data[["i_b_mag", "i_b_ang"]].rename(
             columns={"i_b_mag": "i_mag", "i_b_ang": "i_ang"}
         )
-        return ComplexCurrent(data)
+        return ComplexCurrent.from_preprocessed(data)
 
     @property
     def i_b_ang(self) -> Series:
@@ -4,25 +4,42 @@ import os
 import uuid
 from abc import abstractmethod
 from datetime import datetime
-from typing import TYPE_CHECKING, Self, Tuple, Type
+from typing import TYPE_CHECKING, Hashable, Iterable, Iterator, Self, Tuple, Type
 
 import pandas as pd
 from loguru import logger
 
-from pypsdm.io.utils import check_filter, csv_to_grpd_df, get_file_path, to_date_time
+from pypsdm.io.utils import (
+    check_filter,
+    csv_to_grpd_df,
+    get_file_path,
+    to_date_time,
+    to_date_times,
+)
 from pypsdm.models.enums import EntitiesEnum, SystemParticipantsEnum
 from pypsdm.models.input.entity import Entities
-from pypsdm.models.ts.base import EntityKey, TimeSeries, TimeSeriesDict
+from pypsdm.models.ts.base import (
+    DurationDigestDict,
+    EntityKey,
+    TimeSeries,
+    TimeSeriesDict,
+)
 from pypsdm.models.ts.types import (
     ComplexPower,
     ComplexPowerDict,
     ComplexPowerWithSoc,
     ComplexPowerWithSocDict,
 )
+from pypsdm.processing.dataframe import COMPACT_FLOAT_DTYPE, share_index
+from pypsdm.processing.sketch import DEFAULT_COMPRESSION, DurationDigestStream
+from pypsdm.processing.stream import EventAggregationStream
 
 if TYPE_CHECKING:
     from pypsdm.models.input.container.grid import GridContainer
 
+# number of rows read at once when streaming through result files
+RESULT_CHUNK_SIZE = 1_000_000
+
 
 class EntitiesResultDictMixin:
     def uuids(self) -> set[str]:
@@ -47,13 +64,36 @@ class EntitiesResultDictMixin:
         filter_start: datetime | None = None,
         filter_end: datetime | None = None,
         must_exist: bool = True,
+        compact: bool = False,
+        drop_unchanged: bool = False,
     ) -> Self:
+        """
+        Reads the results of the entity type from the simulation output.
+
+        Args:
+            simulation_data_path: The directory holding the result files.
+            delimiter: The csv delimiter.
+            simulation_end: The end of the simulation, used as end of all results.
+            input_entities: The corresponding input entities to name the results.
+            filter_start: Start of the interval to filter the results for.
+            filter_end: End of the interval to filter the results for.
+            must_exist: Whether to raise an error if the result file is missing.
+            compact: Whether to store the values as float32 instead of float64 (see
+                `pypsdm.processing.dataframe.compact_df`).
+            drop_unchanged: Whether to drop rows that equal their predecessor (see
+                `TimeSeries.drop_unchanged`).
+        """
         check_filter(filter_start, filter_end)
 
         file_name = cls.entity_type().get_csv_result_file_name()
         path = get_file_path(simulation_data_path, file_name)
         if path.exists():
-            grpd_df = csv_to_grpd_df(file_name, simulation_data_path, delimiter)
+            # compact values are parsed as float32 right away, so the file is never
+            # held in float64
+            float_dtype = COMPACT_FLOAT_DTYPE if compact else None
+            grpd_df = csv_to_grpd_df(
+                file_name, simulation_data_path, delimiter, float_dtype
+            )
         else:
             if must_exist:
                 raise FileNotFoundError(f"File {path} does not exist")
@@ -77,15 +117,178 @@ class EntitiesResultDictMixin:
             entity_key = EntityKey(key, name)  # type: ignore
             grp.drop(columns=["input_model"], inplace=True)
             ts = cls.result_type()(grp, simulation_end)
+            if compact:
+                ts = ts.compact()
             ts_dict[entity_key] = ts
 
         res = cls(ts_dict)
+        if drop_unchanged:
+            res = res.drop_unchanged()  # type: ignore
+        shared_indices: dict = {}
+        for ts in res.values():  # type: ignore
+            ts.data.index = share_index(ts.data.index, shared_indices)
         return (
             res
             if not filter_start
-            else res.filter_for_time_interval(filter_start, filter_end)  # type: ignore
+            else res.interval(filter_start, filter_end)  # type: ignore
         )
 
+    @classmethod
+    def duration_digests_from_csv(
+        cls,
+        simulation_data_path: str,
+        attributes: list[str] | None = None,
+        delimiter: str | None = None,
+        simulation_end: datetime | None = None,
+        input_entities: Entities | None = None,
+        chunksize: int = RESULT_CHUNK_SIZE,
+        compression: float = DEFAULT_COMPRESSION,
+    ) -> dict[str, DurationDigestDict]:
+        """
+        Builds duration weighted quantile sketches of the results of all entities
+        while reading the result file in chunks, so the results never need to fit
+        into memory (see `DurationDigestStream`). The events of each entity need to
+        be in chronological order within the file.
+
+        Args:
+            simulation_data_path: The directory holding the result files.
+            attributes: The attributes to build the sketches for. Defaults to all
+                numeric result columns.
+            delimiter: The csv delimiter.
+            simulation_end: The end of the simulation, until which the last state of
+                each entity holds. Defaults to the latest result.
+            input_entities: The corresponding input entities to name the results.
+            chunksize: The number of rows to read at once.
+            compression: The compression of the sketches.
+        Returns:
+            A DurationDigestDict per attribute.
+        """
+        stream = None
+        for chunk in cls.read_csv_chunks(simulation_data_path, delimiter, chunksize):
+            if stream is None:
+                attributes = attributes or cls._numeric_result_columns(chunk)
+                stream = DurationDigestStream(attributes, compression)
+            stream.update(
+                chunk["input_model"].to_numpy(),
+                chunk["time"],
+                chunk[attributes].to_numpy(dtype=float),
+            )
+        if stream is None:
+            return {attribute: DurationDigestDict() for attribute in attributes or []}
+
+        digests = stream.finish(simulation_end)
+        keys = cls.keys_from_uuids(next(iter(digests.values()), {}), input_entities)
+        return {
+            attribute: DurationDigestDict(
+                {key: digest for key, digest in zip(keys, entities.values())}
+            )
+            for attribute, entities in digests.items()
+        }
+
+    @classmethod
+    def aggregate_from_csv(
+        cls,
+        simulation_data_path: str,
+        attributes: list[str] | None = None,
+        delimiter: str | None = None,
+        simulation_end: datetime | None = None,
+        groups: dict[str, Hashable] | None = None,
+        chunksize: int = RESULT_CHUNK_SIZE,
+    ) -> EventAggregationStream | None:
+        """
+        Aggregates the results of all entities while reading the result file in
+        chunks, so the results never need to fit into memory (see
+        `EventAggregationStream`). The events of each entity need to be in
+        chronological order within the file.
+
+        Args:
+            simulation_data_path: The directory holding the result files.
+            attributes: The attributes to aggregate. Defaults to all numeric result
+                columns.
+            delimiter: The csv delimiter.
+            simulation_end: The end of the simulation, until which the last state of
+                each entity holds. Defaults to the latest result.
+            groups: Optional mapping of entity uuids to the group they are summed up
+                in (e.g. the node they are connected to).
+            chunksize: The number of rows to read at once.
+        Returns:
+            The finished stream holding the integrals of all entities as well as the
+            sums over all entities and groups. None if the result file is empty.
+        """
+        stream = cls.stream_from_csv(
+            simulation_data_path, attributes, delimiter, groups, chunksize
+        )
+        return stream.finish(simulation_end) if stream is not None else None
+
+    @classmethod
+    def stream_from_csv(
+        cls,
+        simulation_data_path: str,
+        attributes: list[str] | None = None,
+        delimiter: str | None = None,
+        groups: dict[str, Hashable] | None = None,
+        chunksize: int = RESULT_CHUNK_SIZE,
+    ) -> EventAggregationStream | None:
+        """
+        Streams the result file through an `EventAggregationStream` like
+        `aggregate_from_csv`, but returns it unfinished, so that the end of the
+        simulation can be determined from several files before finishing it.
+        """
+        stream = None
+        for chunk in cls.read_csv_chunks(simulation_data_path, delimiter, chunksize):
+            if stream is None:
+                attributes = attributes or cls._numeric_result_columns(chunk)
+                stream = EventAggregationStream(attributes, groups)
+            stream.update(
+                chunk["input_model"].to_numpy(),
+                chunk["time"],
+                chunk[attributes].to_numpy(dtype=float),
+            )
+        return stream
+
+    @classmethod
+    def read_csv_chunks(
+        cls,
+        simulation_data_path: str,
+        delimiter: str | None = None,
+        chunksize: int = RESULT_CHUNK_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Reads the result file of the entity type in chunks of the given number of
+        rows with the time column converted to datetime.
+        """
+        file_name = cls.entity_type().get_csv_result_file_name()
+        path = get_file_path(simulation_data_path, file_name)
+        if not path.exists():
+            raise FileNotFoundError(f"File {path} does not exist")
+        with pd.read_csv(path, delimiter=delimiter, chunksize=chunksize) as reader:
+            for chunk in reader:
+                chunk["time"] = to_date_times(chunk["time"])
+                yield chunk
+
+    @staticmethod
+    def _numeric_result_columns(chunk: pd.DataFrame) -> list[str]:
+        return [
+            column
+            for column in chunk.select_dtypes(include="number").columns
+            if column not in ("time", "uuid", "input_model")
+        ]
+
+    @staticmethod
+    def keys_from_uuids(
+        uuids: Iterable[str], input_entities: Entities | None
+    ) -> list[EntityKey]:
+        keys = []
+        for key in uuids:
+            name = None
+            if input_entities:
+                if key in input_entities:  # type: ignore
+                    name = input_entities[key].id  # type: ignore
+                else:
+                    logger.warning("Entity {} not in input entities".format(key))
+            keys.append(EntityKey(key, name))
+        return keys
+
     def to_csv(
         self,
         path: str,
@@ -100,19 +303,15 @@ class EntitiesResultDictMixin:
 
         def prepare_data(data: pd.DataFrame, input_model: str):
             data = data.copy()
-            data = (
-                data.resample("60s").ffill().resample(resample_rate).mean()
-                if resample_rate
-                else data
-            )
             data["uuid"] = data.apply(lambda _: str(uuid.uuid4()), axis=1)
             data["input_model"] = input_model
             data.index.name = "time"
             return data
 
+        entities = self.resample(resample_rate) if resample_rate else self  # type: ignore
         dfs = [
             prepare_data(participant.data, entity_key.uuid)
-            for entity_key, participant in self.items()  # type: ignore
+            for entity_key, participant in entities.items()  # type: ignore
         ]
         df = pd.concat(dfs)
         df.to_csv(os.path.join(path, file_name), sep=delimiter, index=True)
@@ -124,6 +323,8 @@ class EntitiesResultDictMixin:
         grid_container: GridContainer | None,
         entity: EntitiesEnum,
         delimiter: str | None = None,
+        compact: bool = False,
+        drop_unchanged: bool = False,
     ) -> "EntitiesResultDictMixin" | Tuple[Exception, EntitiesEnum]:
         try:
             if grid_container:
@@ -137,6 +338,8 @@ class EntitiesResultDictMixin:
                 simulation_end=simulation_end,
                 input_entities=input_entities,
                 must_exist=False,
+                compact=compact,
+                drop_unchanged=drop_unchanged,
             )
 
         except Exception as e:
@@ -11,7 +11,6 @@ from pypsdm.models.result.participant.dict import EntitiesResultDictMixin
 from pypsdm.models.ts.base import EntityKey, TimeSeries, TimeSeriesDict
 from pypsdm.models.ts.types import ComplexPower
 from pypsdm.processing.dataframe import add_df
-from pypsdm.processing.series import hourly_mean_resample
 
 
 @dataclass
@@ -25,9 +24,7 @@ class FlexOption(TimeSeries):
 
     def __add__(self, other: "FlexOption"):
         data = add_df(self.data, other.data)
-        return FlexOption(
-            data,
-        )
+        return FlexOption.from_preprocessed(data)
 
     def p_max(self):
         return self.data["p_max"]
@@ -50,11 +47,10 @@ class FlexOption(TimeSeries):
     def _p_to_complex_power(self, p_series: Series) -> ComplexPower:
         data = p_series.rename("p").to_frame()
         data["q"] = 0
-        return ComplexPower(data)
+        return ComplexPower.from_preprocessed(data)
 
     def hourly_resample(self):
-        updated_data = self.data.apply(lambda x: hourly_mean_resample(x))
-        return FlexOption(updated_data)  # type: ignore
+        return self.resample("1h")
 
     @staticmethod
     def attributes() -> List[str]:
@@ -1,10 +1,13 @@
 import copy
+import sys
 from abc import ABC
 from collections import UserDict
-from dataclasses import dataclass
+from dataclasses import FrozenInstanceError, dataclass
 from datetime import datetime
-from typing import Any, Iterable, Self, Tuple, Type, TypeVar, Union
+from typing import Any, Iterable, Self, Type, TypeVar, Union
+from weakref import WeakValueDictionary
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 from pandas import DataFrame, Series
@@ -12,7 +15,28 @@ from pandas.errors import ParserError
 
 from pypsdm.errors import ComparisonError
 from pypsdm.io.utils import to_date_time
-from pypsdm.processing.dataframe import compare_dfs, filter_data_for_time_interval
+from pypsdm.processing.dataframe import (
+    COMPARISON_OPS,
+    binary_op_df,
+    compact_df,
+    compare_dfs,
+    drop_unchanged_rows,
+    integrate_dfs,
+    interval_index,
+    interval_positions,
+    max_deviations,
+    memory_usage,
+    reduce_dfs,
+    resample_df,
+    resample_dfs,
+    result_dtype,
+    slice_interval,
+    state_positions,
+    states_at,
+    to_naive_index,
+)
+from pypsdm.processing.series import join_series
+from pypsdm.processing.sketch import DEFAULT_COMPRESSION, DurationDigest
 
 pd.set_option("mode.copy_on_write", True)
 
@@ -30,8 +54,44 @@ class TimeSeries:
         data = self.preprocess_data(data.copy(), end)
         self.data = data
 
+    @classmethod
+    def from_preprocessed(cls, data: DataFrame) -> Self:
+        """
+        Wraps data that is already preprocessed (see `preprocess_data`) without
+        copying or preprocessing it again. This is meant for transformations of
+        existing time series whose results are known to be valid. Thanks to copy on
+        write the data is only copied once either side modifies it.
+
+        Args:
+            data: Data with a sorted and unique datetime index, whose last entry
+                marks the end of the time series. Empty data is preprocessed as
+                usual.
+        """
+        if data.empty:
+            return cls(data)
+        ts = cls.__new__(cls)
+        ts.data = data
+        return ts
+
     def __add__(self, other):
-        raise NotImplementedError(f"__add__ is not implemented for {type(self)}")
+        if not isinstance(other, TimeSeries):
+            return NotImplemented
+        return self.combine(other, "add")
+
+    def __sub__(self, other):
+        if not isinstance(other, TimeSeries):
+            return NotImplemented
+        return self.combine(other, "sub")
+
+    def __mul__(self, other):
+        if not isinstance(other, TimeSeries):
+            return NotImplemented
+        return self.combine(other, "mul")
+
+    def __truediv__(self, other):
+        if not isinstance(other, TimeSeries):
+            return NotImplemented
+        return self.combine(other, "div")
 
     def __eq__(self, other: object):
         if not isinstance(other, type(self)):
@@ -53,31 +113,47 @@ class TimeSeries:
             if not (isinstance(start, datetime) and isinstance(stop, datetime)):
                 raise ValueError("Only datetime slicing is supported")
             return self.interval(start, stop)
-        elif isinstance(where, datetime):
-            filtered, dt = self._get_data_by_datetime(where)
-            data = pd.DataFrame(filtered).T
-            return self.__class__(self.preprocess_data(data, dt))
-        elif isinstance(where, list):
-            filtered = [self._get_data_by_datetime(time)[0] for time in where]
-            data = pd.DataFrame(pd.concat(filtered, axis=1)).T
-            max_dt = sorted(data.index)[-1]
-            return self.__class__(self.preprocess_data(data, max_dt))
+        elif isinstance(where, (datetime, list)):
+            return self.at(where)
         else:
             raise ValueError("Expected datetime slice, or datetime object(s).")
 
-    def _get_data_by_datetime(self, dt: datetime) -> Tuple[Series, datetime]:
-        if dt > self.data.index[-1]:
+    def at(
+        self, times: datetime | list[datetime], positions: np.ndarray | None = None
+    ) -> Self:
+        """
+        Returns the states at the given times, which are the last events at or
+        before each of them. Times before the first or after the last event are
+        mapped to the first or last event respectively. The data can also be
+        accessed via object[datetime] or object[list[datetime]].
+
+        Args:
+            times: The time or times of the states.
+            positions: Positions of the states within the index as determined via
+                `state_positions`, in case they are already known.
+        Returns:
+            A new TimeSeries object holding the states.
+        """
+        times = to_naive_index(times)
+        index = self.data.index
+        if positions is None:
+            positions = state_positions(index, times)
+        after = times > index[-1]
+        if after.any():
             logger.warning(
                 "Trying to access data after last time step. Returning last time step."
             )
-            return self.data.iloc[-1], self.data.index[-1]  # type: ignore
-        if dt < self.data.index[0]:
+        before = positions < 0
+        if before.any():
             logger.warning(
                 "Trying to access data before first time step. Returning first time step."
             )
-            return self.data.iloc[0], self.data.index[0]  # type: ignore
-        else:
-            return self.data.asof(dt), dt  # type: ignore
+        labels = times.where(~after, index[-1]).where(~before, index[0])
+        labels = labels.rename(TIME_COLUMN_NAME)
+        data = self.data.iloc[np.maximum(positions, 0)].set_axis(labels, axis=0)
+        if labels.is_monotonic_increasing and labels.is_unique:
+            return self.from_preprocessed(data)
+        return self.__class__(data)
 
     def compare(self, other) -> None:
         if not isinstance(other, type(self)):
@@ -93,14 +169,97 @@ class TimeSeries:
                 differences=[(type(self), str(e))],
             )
 
+    def combine(self, other: "TimeSeries", op: str) -> Self:
+        """
+        Combines the time series with another time series with the same attributes
+        in an event discrete manner. The resulting index is the union of both indices.
+
+        Args:
+            other: The other time series.
+            op: One of "add", "sub", "mul", "div", "max" or "min" (see
+                `pypsdm.processing.dataframe.binary_op_df` for time steps before the
+                first event of either time series). For element wise comparisons use
+                `binary_op_df`.
+        Returns:
+            A new time series holding the combined data.
+        """
+        if op in COMPARISON_OPS:
+            raise ValueError(
+                f"Comparison {op} does not result in a {type(self)}. Use binary_op_df."
+            )
+        return self.from_preprocessed(binary_op_df(self.data, other.data, op))
+
+    def resample(self, freq: str) -> Self:
+        """
+        Resamples the time series to the given frequency by exact time weighted
+        averaging of the piecewise constant values.
+
+        Args:
+            freq: The target frequency as pandas offset alias (e.g. "15min", "1h").
+        Returns:
+            A new time series holding the resampled data.
+        """
+        return self.from_preprocessed(resample_df(self.data, freq))
+
+    def compact(self) -> Self:
+        """
+        Returns the time series with float32 instead of float64 values. See
+        `pypsdm.processing.dataframe.compact_df` for details.
+        """
+        return self.from_preprocessed(compact_df(self.data))
+
+    def drop_unchanged(self) -> Self:
+        """
+        Returns the time series without the rows that equal their predecessor, which
+        are redundant given the piecewise constant states. The end is preserved.
+        """
+        return self.from_preprocessed(drop_unchanged_rows(self.data))
+
+    def maximum(self, other: "TimeSeries") -> Self:
+        """Event discrete element wise maximum of both time series."""
+        return self.combine(other, "max")
+
+    def minimum(self, other: "TimeSeries") -> Self:
+        """Event discrete element wise minimum of both time series."""
+        return self.combine(other, "min")
+
+    def __deepcopy__(self, memo: dict) -> Self:
+        # thanks to copy on write the data is shared until either side modifies it
+        ts = copy.copy(self)
+        ts.data = self.data.copy(deep=False)
+        memo[id(self)] = ts
+        return ts
+
     def copy(
         self,
         deep: bool = True,
     ) -> Self:
+        """
+        Copies the time series. A deep copy shares the underlying data with the
+        original until either of them is modified (copy on write), while a shallow
+        copy references the same DataFrame object.
+        """
         if deep:
             return copy.deepcopy(self)
         return copy.copy(self)
 
+    def concat(self, other: Self, deep: bool = True, keep: str = "last") -> Self:
+        """
+        Concatenates the data of both time series along the index.
+
+        Args:
+            other: The time series to append.
+            deep: Whether to return a deep copy in case one of both is empty.
+            keep: How to handle duplicate indexes. "last" by default.
+        """
+        if other.data.empty:
+            return self.copy(deep)
+        if self.data.empty:
+            return other.copy(deep)
+        data = pd.concat([self.data, other.data])
+        data = data[~data.index.duplicated(keep=keep)].sort_index()  # type: ignore
+        return self.from_preprocessed(data)
+
     @staticmethod
     def attributes():
         """
@@ -195,14 +354,57 @@ class TimeSeries:
         Returns:
             A new TimeSeries object with the filtered data.
         """
-        filtered_data = filter_data_for_time_interval(self.data, start, end)
-        return self.__class__(filtered_data, end)
+        data = self.data
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+        positions = interval_positions(data.index, start, end)
+        index = interval_index(data.index, start, positions, end)
+        return self.from_preprocessed(slice_interval(data, positions, index))
 
 
-@dataclass(frozen=True)
 class EntityKey:
+    """
+    Key of an entity within result dictionaries, identified by its uuid and
+    optionally named by the id of its input model. Keys compare equal to other keys
+    and strings of the same uuid.
+
+    Keys are immutable and interned: Creating a key with the same uuid and name
+    returns the existing instance, so all dictionaries of a grid share one key
+    object and one copy of its strings per entity.
+    """
+
+    __slots__ = ("uuid", "name", "__weakref__")
+    _interned: WeakValueDictionary = WeakValueDictionary()
+
     uuid: str
-    name: str | None = None
+    name: str | None
+
+    def __new__(cls, uuid: str, name: str | None = None) -> "EntityKey":
+        entity_key = cls._interned.get((cls, uuid, name))
+        if entity_key is None:
+            entity_key = super().__new__(cls)
+            object.__setattr__(entity_key, "uuid", _intern(uuid))
+            object.__setattr__(entity_key, "name", _intern(name))
+            cls._interned[(cls, entity_key.uuid, entity_key.name)] = entity_key
+        return entity_key
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __reduce__(self):
+        return (type(self), (self.uuid, self.name))
+
+    def __copy__(self) -> Self:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Self:
+        return self
+
+    def __repr__(self) -> str:
+        return f"EntityKey(uuid={self.uuid!r}, name={self.name!r})"
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, EntityKey):
@@ -219,6 +421,10 @@ class EntityKey:
         return self.name if self.name else self.uuid
 
 
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
 class TimeSeriesDict(UserDict[K, V]):
     def __init__(self, data: dict[K, V]):
         for ts in data.values():
@@ -226,27 +432,69 @@ class TimeSeriesDict(UserDict[K, V]):
                 raise ValueError(f"Expected TimeSeries object, got {type(ts)}")
         super().__init__(data)
 
+    def __setitem__(self, key: K, value: V) -> None:
+        self._key_index = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: K) -> None:
+        self._key_index = None
+        super().__delitem__(key)
+
     def __getitem__(self, key: Any) -> V:
         try:
             return super().__getitem__(key)
         except KeyError as e:
-            res = None
-            for k in self.keys():
-                if isinstance(k, EntityKey) and k.name == key:
-                    if res is not None:
-                        raise ValueError(
-                            f"Can't retrieve {key} from entity keys as it is ambiguous"
-                        )
-                    res = self[k]
-            if res is not None:
-                return res
-            raise e
+            k = self._key_by_name(key)
+            if k is None:
+                raise e
+            return self.data[k]
 
     def get_with_key(self, key: K | str) -> tuple[K, V]:
-        for k, v in self.items():
-            if k == key:
-                return k, v
-        raise KeyError(f"Key {key} not found in TimeSeriesDict")
+        """
+        Returns the stored key together with its time series. The key can be given
+        as key, uuid or, in case it is unambiguous, as entity name.
+        """
+        uuids, _, _ = self.key_index()
+        uuid = key.uuid if isinstance(key, EntityKey) else key
+        k = uuids.get(uuid)  # type: ignore
+        if k is None and key in self.data:
+            k = key
+        if k is None:
+            k = self._key_by_name(key)
+        if k is None:
+            raise KeyError(f"Key {key} not found in TimeSeriesDict")
+        return k, self.data[k]
+
+    def key_index(self) -> tuple[dict[str, K], dict[str, K], set[str]]:
+        """
+        Returns the mappings of uuid and entity name to the corresponding
+        EntityKey as well as the set of names shared by multiple entities. The
+        index is built lazily and rebuilt after the dict was modified.
+        """
+        index = getattr(self, "_key_index", None)
+        if index is None:
+            uuids, names, ambiguous = {}, {}, set()
+            for key in self.data:
+                if not isinstance(key, EntityKey):
+                    continue
+                uuids[key.uuid] = key
+                if key.name is not None:
+                    if key.name in names:
+                        ambiguous.add(key.name)
+                    names[key.name] = key
+            index = (uuids, names, ambiguous)
+            self._key_index = index
+        return index
+
+    def _key_by_name(self, name: Any) -> K | None:
+        _, names, ambiguous = self.key_index()
+        if not isinstance(name, str):
+            return None
+        if name in ambiguous:
+            raise ValueError(
+                f"Can't retrieve {name} from entity keys as it is ambiguous"
+            )
+        return names.get(name)
 
     def subset(self, keys: Iterable[K]) -> Self:
         """
@@ -273,29 +521,191 @@ class TimeSeriesDict(UserDict[K, V]):
 
     def filter_by_date_time(self, time: datetime | list[datetime]) -> Self:
         """
-        Filters the result by the given datetime or list of datetimes.
+        Filters the result by the given datetime or list of datetimes. The state
+        positions are determined once per distinct index object.
 
         Args:
             time: the time or list of times to filter by
         Returns:
             a new result containing only the given time or times
         """
-        return type(self)(
-            {uuid: result[time] for uuid, result in self.items()},
-        )
+        times = to_naive_index(time)
+        positions = {}
+        filtered = {}
+        for key, ts in self.items():
+            index = ts.data.index
+            cached = positions.get(id(index))
+            if cached is None:
+                # keep a reference to the index so its id can not be reused
+                cached = (index, state_positions(index, times))
+                positions[id(index)] = cached
+            filtered[key] = ts.at(times, cached[1])
+        return type(self)(filtered)
+
+    def states_at(
+        self,
+        times: datetime | list[datetime],
+        attributes: list[str] | None = None,
+        favor_ids: bool = True,
+    ) -> dict[str, DataFrame]:
+        """
+        Returns the states of all entities at the given times, which are the last
+        events at or before each of them. The states are gathered via binary search
+        over the shared indices of the entities instead of filtering each entity.
+
+        Args:
+            times: The time or times of the snapshot.
+            attributes: The attributes to gather. Defaults to the data columns of
+                the first entity.
+            favor_ids: Applies when using EntityKey as key. If True, the name
+                is used for the index otherwise uses the uuid.
+        Returns:
+            A DataFrame per attribute indexed by entity with the times as columns.
+            Entities without a state at a time (before their first event) are NaN.
+        """
+        times = to_naive_index(times)
+        if attributes is None:
+            attributes = (
+                list(next(iter(self.values())).data.columns) if self.data else []
+            )
+        states = states_at([ts.data for ts in self.values()], times, attributes)
+        names = self._entity_names(favor_ids)
+        return {
+            attribute: pd.DataFrame(values, index=names, columns=times)
+            for attribute, values in states.items()
+        }
 
     def interval(self, start: datetime, end: datetime) -> Self:
         """
         Filters the dictionary down to the given interval. End is inclusive.
+        The interval positions are determined once per distinct index object, so
+        time series sharing their index (see `share_index`) are sliced without any
+        additional search.
         """
-        return type(self)(
-            {uuid: result.interval(start, end) for uuid, result in self.items()},
-        )
+        slices = {}
+        filtered = {}
+        for key, ts in self.items():
+            data = ts.data
+            if not data.index.is_monotonic_increasing:
+                data = data.sort_index()
+            index_slice = slices.get(id(data.index))
+            if index_slice is None:
+                # keep a reference to the index so its id can not be reused
+                positions = interval_positions(data.index, start, end)
+                index_slice = (
+                    data.index,
+                    positions,
+                    interval_index(data.index, start, positions, end),
+                )
+                slices[id(data.index)] = index_slice
+            _, positions, index = index_slice
+            filtered[key] = ts.from_preprocessed(slice_interval(data, positions, index))
+        return type(self)(filtered)
+
+    def resample(self, freq: str) -> Self:
+        """
+        Resamples all time series of the dictionary to the given frequency by exact
+        time weighted averaging within a single kernel call over shared bins.
+
+        Args:
+            freq: The target frequency as pandas offset alias (e.g. "15min", "1h").
+        Returns:
+            A new dictionary holding the resampled time series.
+        """
+        if not self.data:
+            return type(self)({})
+        columns = next(iter(self.values())).data.columns
+        bins, values = resample_dfs([ts.data for ts in self.values()], freq, columns)
+        resampled = {}
+        for i, (key, ts) in enumerate(self.items()):
+            if ts.data.empty:
+                resampled[key] = ts.copy()
+                continue
+            start = bins.searchsorted(ts.data.index[0], side="right") - 1
+            stop = bins.searchsorted(ts.data.index[-1], side="right")
+            data = pd.DataFrame(
+                values[i, start:stop].astype(result_dtype([ts.data]), copy=False),
+                index=bins[start:stop].rename(TIME_COLUMN_NAME),
+                columns=columns,
+            )
+            resampled[key] = type(ts).from_preprocessed(data)
+        return type(self)(resampled)
 
-    def compare(self, other: Self) -> None:
+    def compact(self) -> Self:
+        """
+        Returns the dictionary with float32 instead of float64 values. See
+        `pypsdm.processing.dataframe.compact_df` for details.
+        """
+        return type(self)({key: ts.compact() for key, ts in self.items()})
+
+    def drop_unchanged(self) -> Self:
+        """
+        Drops all rows that equal their predecessor from the time series (see
+        `TimeSeries.drop_unchanged`) and logs the achieved reduction.
+        """
+        dropped = {key: ts.drop_unchanged() for key, ts in self.items()}
+        before = sum(len(ts) for ts in self.values())
+        after = sum(len(ts) for ts in dropped.values())
+        if before > 0:
+            logger.info(
+                f"Dropped {before - after} of {before} unchanged rows "
+                f"({(before - after) / before:.1%}) of {type(self).__name__}."
+            )
+        return type(self)(dropped)
+
+    def reduce(self, op: str = "sum", parallel: bool = False) -> V:
+        """
+        Reduces all time series of the dictionary to a single time series of the
+        same type in an event discrete manner within a single pass over the union
+        of their indices.
+
+        Args:
+            op: One of "sum", "prod", "max", "min" or "mean".
+            parallel: Whether to reduce chunks of the union index in parallel.
+        Returns:
+            The reduced time series.
+        """
+        if not self.data:
+            raise ValueError("Can not reduce an empty TimeSeriesDict.")
+        ts_type = type(next(iter(self.values())))
+        data = reduce_dfs([ts.data for ts in self.values()], op, parallel=parallel)
+        return ts_type.from_preprocessed(data)
+
+    def max(self, parallel: bool = False) -> V:
+        """Event discrete element wise maximum of all time series."""
+        return self.reduce("max", parallel)
+
+    def min(self, parallel: bool = False) -> V:
+        """Event discrete element wise minimum of all time series."""
+        return self.reduce("min", parallel)
+
+    def mean(self, parallel: bool = False) -> V:
+        """
+        Event discrete element wise mean of all time series. Time series only
+        take part after their first event.
+        """
+        return self.reduce("mean", parallel)
+
+    def compare(
+        self,
+        other: Self,
+        atol: float = 1e-8,
+        rtol: float = 1e-5,
+        stop_early: bool = False,
+        parallel: bool = False,
+    ) -> None:
         """
         Compares the data of the two dicts, which means comparing the data of their
-        time series. Raises a ComparisonError if the data is not equal.
+        time series. Raises a ComparisonError if the data is not equal, whose
+        differences hold the deviation table (see `deviations`) of all differing
+        entities.
+
+        Args:
+            other: The dict to compare with.
+            atol: The absolute tolerance.
+            rtol: The relative tolerance.
+            stop_early: Whether to stop comparing after the first differences.
+            parallel: Whether to compare the time series in parallel.
         """
         if not isinstance(other, type(self)):
             raise ComparisonError(
@@ -311,18 +721,104 @@ class TimeSeriesDict(UserDict[K, V]):
 
         differences = []
         for key, entity in self.items():
-            if key not in other:
-                differences.append(f"Entity {key} not in other")
-            else:
-                try:
-                    entity.compare(other[key])
-                except ComparisonError as e:
-                    differences.extend(e.differences)
+            other_entity = other.data[key]
+            if type(entity) is not type(other_entity):
+                differences.append(
+                    f"Entity {key}: {type(entity)} != {type(other_entity)}"
+                )
+            elif set(entity.data.columns) != set(other_entity.data.columns):
+                differences.append(
+                    f"Entity {key}: Columns {list(entity.data.columns)} != "
+                    f"{list(other_entity.data.columns)}"
+                )
         if differences:
             raise ComparisonError(
                 f"Comparison of {type(self)} failed", differences=differences
             )
 
+        deviations = self.deviations(other, atol, rtol, stop_early, parallel)
+        failed = deviations[deviations["mismatches"] > 0]
+        if not failed.empty:
+            raise ComparisonError(
+                f"Comparison of {type(self)} failed for {len(failed)} entities",
+                differences=[failed],
+            )
+
+    def deviations(
+        self,
+        other: Self,
+        atol: float = 1e-8,
+        rtol: float = 1e-5,
+        stop_early: bool = False,
+        parallel: bool = False,
+        favor_ids: bool = True,
+    ) -> DataFrame:
+        """
+        Compares the time series with the ones of the other dict with the same keys.
+        Both time series of an entity are aligned on the union of their indices and
+        compared in an event discrete manner, numeric attributes within vectorized
+        kernel calls. All attributes of any of the time series are compared, an
+        attribute missing in only one of two time series counts as mismatch. Two values are considered equal if
+        |a - b| <= atol + rtol * |b|.
+
+        Args:
+            other: The dict to compare with.
+            atol: The absolute tolerance.
+            rtol: The relative tolerance.
+            stop_early: Whether to stop comparing after the first chunk of entities
+                containing differences.
+            parallel: Whether to compare the time series in parallel.
+            favor_ids: Applies when using EntityKey as key. If True, the name
+                is used for the index otherwise uses the uuid.
+
+        Returns:
+            DataFrame indexed by entity holding the maximum absolute deviation of each
+            numeric attribute and the number of mismatching events ("mismatches").
+            Entities that were not compared due to stopping early have -1
+            mismatches.
+        """
+        if not self.data:
+            return pd.DataFrame(columns=["mismatches"])
+        a = self.dataframes()
+        b = [other.data[key].data for key in self.keys()]
+        # union of the columns of all time series, typed by their first occurrence
+        kinds: dict[str, str] = {}
+        for df in (*a, *b):
+            for column, dtype in df.dtypes.items():
+                kinds.setdefault(column, dtype.kind)
+        numeric = [c for c, kind in kinds.items() if kind in "biuf"]
+        deviation, mismatches = max_deviations(
+            a, b, numeric, atol, rtol, stop_early, parallel
+        )
+        others = [c for c in kinds if c not in numeric]
+        if others:
+            for i, (df_a, df_b) in enumerate(zip(a, b)):
+                if mismatches[i] < 0:
+                    continue
+                try:
+                    compare_dfs(
+                        df_a.reindex(columns=others), df_b.reindex(columns=others)
+                    )
+                except AssertionError:
+                    mismatches[i] += 1
+        table = pd.DataFrame(
+            deviation, index=self._entity_names(favor_ids), columns=numeric
+        )
+        table["mismatches"] = mismatches
+        return table
+
+    def dataframes(self) -> list[DataFrame]:
+        """Returns the data of all time series."""
+        return [ts.data for ts in self.values()]
+
+    def memory_usage(self, *others: "TimeSeriesDict") -> Series:
+        """
+        Returns the memory used by the data of all time series, optionally together
+        with other dicts (e.g. copies) to show how much memory they share. See
+        `pypsdm.processing.dataframe.memory_usage` for details.
+        """
+        return memory_usage(df for dct in (self, *others) for df in dct.dataframes())
+
     def concat(self: Self, other: Self, deep: bool = True, keep="last") -> Self:
         """
         Concatenates the data of the two dicts, which means concatenating
@@ -363,6 +859,122 @@ class TimeSeriesDict(UserDict[K, V]):
                 return key.uuid
         return str(key)
 
+    def _entity_names(self, favor_ids: bool = True) -> list[str]:
+        return entity_names(self.keys(), favor_ids)
+
+    def duration_digests(
+        self,
+        attributes: list[str] | None = None,
+        compression: float = DEFAULT_COMPRESSION,
+    ) -> dict[str, "DurationDigestDict"]:
+        """
+        Builds duration weighted quantile sketches of the given attributes of all
+        entities (see `DurationDigest`). For data that does not fit into memory, the
+        sketches can be built while reading the results in chunks (see
+        `EntitiesResultDictMixin.duration_digests_from_csv`).
+
+        Args:
+            attributes: The attributes to build the sketches for. Defaults to the
+                numeric data columns of the first entity.
+            compression: The compression of the sketches.
+        Returns:
+            A DurationDigestDict per attribute.
+        """
+        if attributes is None:
+            attributes = (
+                list(
+                    next(iter(self.values()))
+                    .data.select_dtypes(include="number")
+                    .columns
+                )
+                if self.data
+                else []
+            )
+        return {
+            attribute: DurationDigestDict(
+                {
+                    key: DurationDigest.from_series(ts.data[attribute], compression)
+                    for key, ts in self.items()
+                }
+            )
+            for attribute in attributes
+        }
+
+
+def entity_names(keys: Iterable, favor_ids: bool = True) -> list[str]:
+    """
+    Returns the names of the entities of the given keys in order. Falls back to the
+    uuids in case of duplicate or undefined ids.
+    """
+    keys = list(keys)
+    if favor_ids and keys and isinstance(keys[0], EntityKey):
+        names = {key.name for key in keys}
+        if len(names) < len(keys):
+            # Found duplicate or undefined ids, falling back to uuid usage.
+            favor_ids = False
+    return [TimeSeriesDict.extract_key(key, favor_ids) for key in keys]
+
+
+class DurationDigestDict(UserDict[K, DurationDigest]):
+    """
+    Duration weighted quantile sketches of one attribute per entity, which provide
+    the percentiles and duration curves of all entities without holding their
+    full time series.
+    """
+
+    def quantiles(self, q: float | list[float], favor_ids: bool = True) -> DataFrame:
+        """
+        Returns the duration weighted quantiles of all entities.
+
+        Args:
+            q: The quantile or quantiles within [0, 1].
+            favor_ids: Applies when using EntityKey as key. If True, the name
+                is used for the index otherwise uses the uuid.
+        Returns:
+            DataFrame with the entities as index and the quantiles as columns.
+        """
+        qs = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        values = np.array([digest.quantile(qs) for digest in self.values()])
+        return DataFrame(
+            values.reshape(len(self), len(qs)),
+            index=entity_names(self.keys(), favor_ids),
+            columns=qs,
+        )
+
+    def exceedance(self, x: float, favor_ids: bool = True) -> Series:
+        """
+        Returns the duration in hours each entity exceeds the value x.
+        """
+        return Series(
+            [digest.exceedance(x) for digest in self.values()],
+            index=entity_names(self.keys(), favor_ids),
+            dtype=float,
+        )
+
+    def duration_curves(
+        self, resolution: float = 1.0, favor_ids: bool = True
+    ) -> DataFrame:
+        """
+        Returns the duration curves of all entities (see
+        `DurationDigest.duration_curve`) with the duration in hours as index and the
+        entities as columns.
+        """
+        curves = [digest.duration_curve(resolution) for digest in self.values()]
+        if not curves:
+            return DataFrame()
+        res = pd.concat(curves, axis=1)
+        res.columns = entity_names(self.keys(), favor_ids)
+        return res
+
+    def merge(self, other: "DurationDigestDict") -> "DurationDigestDict":
+        """
+        Merges the sketches of both dicts, entities present in both are merged.
+        """
+        res = DurationDigestDict(self.data)
+        for key, digest in other.items():
+            res[key] = res[key].merge(digest) if key in res else digest
+        return res
+
 
 class TimeSeriesDictMixin(ABC):
     def attr_df(
@@ -379,7 +991,8 @@ class TimeSeriesDictMixin(ABC):
         Args:
             attr_name: The attribute name of the time series to extract from
                 the time series entities.
-            ffill: Forward fill the resulting nan values
+            ffill: Forward fill the resulting nan values, including missing values
+                within the time series
             favor_ids: Applies when using EntityKey as key. If True, the name
                 is used for the DataFrame column names otherwise uses the uuid.
 
@@ -389,20 +1002,37 @@ class TimeSeriesDictMixin(ABC):
         if not self.values():
             return pd.DataFrame()
 
-        if favor_ids and isinstance(next(iter(self.keys())), EntityKey):
-            names = {key.name for key in self.keys()}  # type: ignore
-            if len(names) < len(self.keys()):
-                # Found duplicate or undefined ids, falling back to uuid usage.
-                favor_ids = False
-
         series = []
-        for key, entity in self.items():
-            name = TimeSeriesDict.extract_key(key, favor_ids)
+        for name, entity in zip(self._entity_names(favor_ids), self.values()):
             if callable(getattr(entity, attr_name)):
                 series.append(getattr(entity, attr_name)(*args, **kwargs).rename(name))
             else:
                 series.append(getattr(entity.data, attr_name).rename(name))
-        data = pd.concat(series, axis=1).sort_index()
         if ffill:
-            return data.ffill()
-        return data
+            return join_series(series)
+        return pd.concat(series, axis=1).sort_index()
+
+    def integrate(self, attributes: list[str], favor_ids: bool = True) -> DataFrame:
+        """
+        Integrates the given attributes of all event discrete time series over time
+        within a single kernel call.
+
+        Args:
+            attributes: The attributes to integrate.
+            favor_ids: Applies when using EntityKey as key. If True, the name
+                is used for the index otherwise uses the uuid.
+
+        Returns:
+            DataFrame indexed by entity holding the integral of each attribute as
+            well as the integral of its positive (`<attribute>_pos`) and negative
+            (`<attribute>_neg`) values in value hours.
+        """
+        total, positive, negative = integrate_dfs(
+            [entity.data for entity in self.values()], attributes
+        )
+        data = {}
+        for i, attribute in enumerate(attributes):
+            data[attribute] = total[:, i]
+            data[f"{attribute}_pos"] = positive[:, i]
+            data[f"{attribute}_neg"] = negative[:, i]
+        return pd.DataFrame(data, index=self._entity_names(favor_ids))
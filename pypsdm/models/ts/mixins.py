@@ -6,7 +6,7 @@ import numpy as np
 from pandas import DataFrame, Series
 
 from pypsdm.models.ts.base import TimeSeriesDictMixin
-from pypsdm.processing.dataframe import divide_positive_negative
+from pypsdm.processing.dataframe import divide_positive_negative, integrate_periods
 from pypsdm.processing.series import (
     duration_weighted_sum,
     hourly_mean_resample,
@@ -45,11 +45,27 @@ class ActivePowerMixin(AttributeMixin):
         Returns:
             A series with the full load hours within the determined periods.
         """
-        return self.p.groupby(self.p.index.to_period(period)).apply(
-            lambda series: duration_weighted_sum(series.abs())
-        ) / (
-            device_power_kw / 1000
-        )  # convert to MW since results are in MW
+        periods, integrals = integrate_periods(
+            [self.data], ["p"], period, absolute=True  # type: ignore
+        )
+        full_load_energy = Series(integrals[0, :, 0], index=periods, name="p")
+        # convert to MW since results are in MW
+        return full_load_energy / (device_power_kw / 1000)
+
+    def energy_per_period(self, period="Y") -> Series:
+        """
+        Calculates the energy within the given periods. The energy of states that
+        hold across a period boundary is split exactly at the boundary.
+
+        Args:
+            period: The period to calculate the energy for. Default is year.
+                    Use to_period() aliases, like Y for year, M for month, D for day, etc.
+
+        Returns:
+            A series with the energy within the determined periods.
+        """
+        periods, integrals = integrate_periods([self.data], ["p"], period)  # type: ignore
+        return Series(integrals[0, :, 0], index=periods, name="energy")
 
     def annual_duration_series(self, drop_index=True):
         return (
@@ -74,10 +90,85 @@ class ActivePowerDictMixin(TimeSeriesDictMixin):
         return self.p(ffill).sum(axis=1).rename("p_sum")
 
     def energy(self) -> float:
-        sum = 0
-        for participant in self.values():  # type: ignore
-            sum += participant.energy()
-        return sum
+        return float(self.energies()["energy"].sum())
+
+    def energy_per_period(self, period="Y", favor_ids: bool = True) -> DataFrame:
+        """
+        Calculates the energy of all entities within the given periods in a single
+        kernel call. The energy of states that hold across a period boundary is
+        split exactly at the boundary.
+
+        Args:
+            period: The period to calculate the energy for. Default is year.
+                    Use to_period() aliases, like Y for year, M for month, D for day, etc.
+            favor_ids: Applies when using EntityKey as key. If True, the name
+                is used for the index otherwise uses the uuid.
+
+        Returns:
+            DataFrame of the energy with the entities as index and the periods as
+            columns.
+        """
+        periods, integrals = integrate_periods(
+            [entity.data for entity in self.values()], ["p"], period  # type: ignore
+        )
+        return DataFrame(
+            integrals[:, :, 0], index=self._entity_names(favor_ids), columns=periods
+        )
+
+    def full_load_hours(
+        self,
+        device_power_kw: float | dict,
+        period="Y",
+        favor_ids: bool = True,
+    ) -> DataFrame:
+        """
+        Calculates the full load hours of all entities within the given periods in
+        a single kernel call.
+
+        Args:
+            device_power_kw: The power of the devices in kW. Either a single value for
+                all devices or a mapping from the keys of this dict to the power.
+            period: The period to calculate the full load hours for. Default is year.
+                    Use to_period() aliases, like Y for year, M for month, D for day, etc.
+            favor_ids: Applies when using EntityKey as key. If True, the name
+                is used for the index otherwise uses the uuid.
+
+        Returns:
+            DataFrame of the full load hours with the entities as index and the
+            periods as columns.
+        """
+        periods, integrals = integrate_periods(
+            [entity.data for entity in self.values()],  # type: ignore
+            ["p"],
+            period,
+            absolute=True,
+        )
+        if isinstance(device_power_kw, dict):
+            device_power_kw = np.array(
+                [device_power_kw[key] for key in self.keys()], dtype=float  # type: ignore
+            )[:, np.newaxis]
+        # convert to MW since results are in MW
+        return DataFrame(
+            integrals[:, :, 0] / (device_power_kw / 1000),
+            index=self._entity_names(favor_ids),
+            columns=periods,
+        )
+
+    def energies(self, favor_ids: bool = True) -> DataFrame:
+        """
+        Integrates the active power of all entities within a single kernel call.
+
+        Args:
+            favor_ids: Applies when using EntityKey as key. If True, the name
+                is used for the index otherwise uses the uuid.
+
+        Returns:
+            DataFrame indexed by entity holding the energy as well as its load
+            (positive) and generation (negative) share.
+        """
+        return self.integrate(["p"], favor_ids).rename(
+            columns={"p": "energy", "p_pos": "load", "p_neg": "generation"}
+        )
 
 
 class ReactivePowerMixin(AttributeMixin):
@@ -103,6 +194,12 @@ class ReactivePowerDictMixin(TimeSeriesDictMixin):
             return Series(dtype=float)
         return self.q(ffill).sum(axis=1).rename("q_sum")
 
+    def reactive_energies(self, favor_ids: bool = True) -> Series:
+        """
+        Integrates the reactive power of all entities within a single kernel call.
+        """
+        return self.integrate(["q"], favor_ids)["q"].rename("reactive_energy")
+
 
 class ComplexPowerMixin(ActivePowerMixin, ReactivePowerMixin):
     def complex_power(self) -> Series:
@@ -117,6 +214,29 @@ class ComplexPowerDictMixin(ActivePowerDictMixin, ReactivePowerDictMixin):
     def complex_power(self, ffill=True, favor_ids=True) -> DataFrame:
         return self.p(ffill, favor_ids) + 1j * self.q(ffill, favor_ids)
 
+    def energies(self, favor_ids: bool = True) -> DataFrame:
+        """
+        Integrates the active and reactive power of all entities within a single
+        kernel call.
+
+        Args:
+            favor_ids: Applies when using EntityKey as key. If True, the name
+                is used for the index otherwise uses the uuid.
+
+        Returns:
+            DataFrame indexed by entity holding the energy, its load (positive) and
+            generation (negative) share as well as the reactive energy.
+        """
+        integrals = self.integrate(["p", "q"], favor_ids)
+        return integrals[["p", "p_pos", "p_neg", "q"]].rename(
+            columns={
+                "p": "energy",
+                "p_pos": "load",
+                "p_neg": "generation",
+                "q": "reactive_energy",
+            }
+        )
+
 
 class SocMixin(AttributeMixin):
     @property
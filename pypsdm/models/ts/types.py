@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from functools import reduce
 from typing import TYPE_CHECKING, List, Self, Sequence, Union
 
+import numpy as np
 from pandas import DataFrame
 
 from pypsdm.models.ts.base import K, TimeSeries, TimeSeriesDict
@@ -17,8 +17,8 @@ from pypsdm.models.ts.mixins import (
     WeatherDataDictMixin,
     WeatherDataMixin,
 )
-from pypsdm.processing.dataframe import add_df
-from pypsdm.processing.series import Tuple, add_series
+from pypsdm.processing.dataframe import add_df, binary_op_df, sum_dfs
+from pypsdm.processing.series import Tuple
 
 if TYPE_CHECKING:
     from pypsdm.db.weather.models import WeatherValue
@@ -33,19 +33,27 @@ class ComplexPower(TimeSeries, ComplexPowerMixin):
             self_data = self.data[ComplexPower.attributes()]
             other_data = other.data[ComplexPower.attributes()]
             data = add_df(self_data, other_data)
-            return ComplexPower(data)
+            return ComplexPower.from_preprocessed(data)
         else:
             raise ValueError(
                 f"Addition with type {type(other)} not or not yet supported"
             )
 
-    def __sub__(self, other: Self):
-        return self + (other * -1)
+    def __sub__(self, other: Self) -> "ComplexPower":
+        if isinstance(other, ComplexPower):
+            self_data = self.data[ComplexPower.attributes()]
+            other_data = other.data[ComplexPower.attributes()]
+            data = binary_op_df(self_data, other_data, "sub")
+            return ComplexPower.from_preprocessed(data)
+        else:
+            raise ValueError(
+                f"Subtraction with type {type(other)} not or not yet supported"
+            )
 
     def __mul__(self, other: Union[float, int]):
         if isinstance(other, float) or isinstance(other, int):
             updated_data = self.data * other
-            return ComplexPower(updated_data)
+            return ComplexPower.from_preprocessed(updated_data)
         else:
             raise ValueError(
                 f"Multiplication with type {type(other)} not or not yet supported"
@@ -55,12 +63,12 @@ class ComplexPower(TimeSeries, ComplexPowerMixin):
     __rmul__ = __mul__
 
     @classmethod
-    def sum(cls, results: Sequence[Self]) -> "ComplexPower":
+    def sum(cls, results: Sequence[Self], parallel: bool = False) -> "ComplexPower":
         if len(results) == 0:
             return cls.empty()
-        if len(results) == 1:
-            return results[0]
-        return reduce(lambda a, b: a + b, results)
+        attributes = ComplexPower.attributes()
+        data = sum_dfs([r.data[attributes] for r in results], parallel=parallel)
+        return ComplexPower.from_preprocessed(data)
 
     @staticmethod
     def attributes() -> List[str]:
@@ -68,8 +76,8 @@ class ComplexPower(TimeSeries, ComplexPowerMixin):
 
 
 class ComplexPowerDict(TimeSeriesDict[K, ComplexPower], ComplexPowerDictMixin):
-    def sum(self) -> ComplexPower:
-        return ComplexPower.sum(list(self.values()))
+    def sum(self, parallel: bool = False) -> ComplexPower:
+        return ComplexPower.sum(list(self.values()), parallel)
 
     def load_and_generation(self) -> Tuple[float, float]:
         return self.sum().load_and_generation_energy()
@@ -78,35 +86,42 @@ class ComplexPowerDict(TimeSeriesDict[K, ComplexPower], ComplexPowerDictMixin):
 @ComplexPower.register
 class ComplexPowerWithSoc(TimeSeries, ComplexPowerMixin, SocMixin):
     def as_complex_power(self) -> ComplexPower:
-        return ComplexPower(self.data.drop(columns=["soc"]))
+        return ComplexPower.from_preprocessed(self.data.drop(columns=["soc"]))
 
     def add_with_soc(
         self, this_capacity: float, other: "ComplexPowerWithSoc", other_capacity: float
     ) -> Self:
-        data = add_df(self.data.drop(columns=["soc"]), other.data.drop(columns=["soc"]))
-        total_capacity = this_capacity + other_capacity
-        soc = add_series(
-            self.soc * this_capacity / total_capacity,
-            other.soc * other_capacity / total_capacity,
-            "soc",
-        )
-        data["soc"] = soc
-        return self.__class__(
-            data,
-        )
+        agg = self.sum_with_soc([(this_capacity, self), (other_capacity, other)])
+        return self.from_preprocessed(agg.data)
 
     @staticmethod
     def sum_with_soc(
         results: list[Tuple[float, "ComplexPowerWithSoc"]],
     ) -> "ComplexPowerWithSoc":
+        """
+        Sums the power of all results and aggregates their state of charge weighted by
+        the respective capacities. Aggregation happens in one pass over the union
+        index of all results. Raises a ValueError if the capacities of multiple
+        results sum up to zero.
+
+        Args:
+            results: Tuples of capacity and the corresponding result.
+        """
         if len(results) == 0:
             return ComplexPowerWithSoc.empty()
         if len(results) == 1:
             return results[0][1]
-        this_capacity, agg = results[0]
-        for other_capacity, result in results[1::]:
-            agg = agg.add_with_soc(this_capacity, result, other_capacity)
-        return agg
+        capacities = np.array([capacity for capacity, _ in results], dtype=float)
+        if capacities.sum() == 0:
+            raise ValueError(
+                "Can not weight the state of charge, the capacities sum up to zero."
+            )
+        attributes = ComplexPowerWithSoc.attributes()
+        data = sum_dfs(
+            [result.data[attributes] for _, result in results],
+            weights={"soc": capacities / capacities.sum()},
+        )
+        return ComplexPowerWithSoc.from_preprocessed(data)
 
     @staticmethod
     def attributes() -> List[str]:
@@ -118,7 +133,7 @@ class ComplexPowerWithSocDict(
     TimeSeriesDict[K, ComplexPowerWithSoc], ComplexPowerDictMixin, SocDictMixin
 ):
     def sum(self) -> ComplexPower:
-        return ComplexPower.sum([v.as_complex_power() for v in self.values()])
+        return ComplexPower.sum(list(self.values()))
 
     def sum_with_soc(self, capacities: dict[K, float]) -> ComplexPowerWithSoc:
         if not self:
@@ -162,10 +177,10 @@ class ComplexVoltagePower(ComplexVoltage, ComplexPower):
         return super().__eq__(other)
 
     def as_complex_voltage(self):
-        return ComplexVoltage(self.data[ComplexVoltage.attributes()])
+        return ComplexVoltage.from_preprocessed(self.data[ComplexVoltage.attributes()])
 
     def as_complex_power(self):
-        return ComplexPower(self.data[ComplexPower.attributes()])
+        return ComplexPower.from_preprocessed(self.data[ComplexPower.attributes()])
 
 
 @ComplexVoltageDict.register
@@ -184,10 +199,10 @@ class ComplexVoltagePowerDict(
 class CoordinateWeather(TimeSeries, WeatherDataMixin):
 
     def __add__(self, other) -> Self:
-        return self.__class__(add_df(self.data, other.data))
+        return self.from_preprocessed(add_df(self.data, other.data))
 
     def __mul__(self, other: float | int) -> Self:
-        return self.__class__(self.data * other)
+        return self.from_preprocessed(self.data * other)
 
     __rmul__ = __mul__
 
@@ -1,9 +1,106 @@
 from datetime import datetime
+from typing import Iterable, Sequence
 
+import numba
+import numpy as np
 import pandas as pd
-from pandas import DataFrame
+from numpy.lib.array_utils import byte_bounds
+from pandas import DataFrame, DatetimeIndex, Index, PeriodIndex, Series
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
 
-from pypsdm.processing.numba import add_2d_array
+from pypsdm.processing.numba import (
+    OP_ADD,
+    OP_DIV,
+    OP_EQ,
+    OP_GE,
+    OP_GT,
+    OP_LE,
+    OP_LT,
+    OP_MAX,
+    OP_MIN,
+    OP_MUL,
+    OP_NE,
+    OP_SUB,
+    REDUCE_MAX,
+    REDUCE_MEAN,
+    REDUCE_MIN,
+    REDUCE_PROD,
+    REDUCE_SUM,
+    add_2d_array,
+    binary_op_2d_array,
+    compare_2d_arrays,
+    compare_2d_arrays_parallel,
+    integrate_2d_arrays,
+    integrate_bins_2d_arrays,
+    reduce_2d_arrays,
+    reduce_2d_arrays_parallel,
+    resample_2d_arrays,
+)
+
+COMPACT_FLOAT_DTYPE = np.dtype("float32")
+
+
+def compact_df(df: DataFrame) -> DataFrame:
+    """
+    Casts the float64 columns of the dataframe to float32, which halves the memory of
+    its values. Derived complex quantities then result in complex64. The datetime
+    index is kept as is, as it is already stored as int64 nanoseconds since epoch.
+
+    NOTE: float32 holds about 7 significant digits. The kernels compute in float64
+    and cast their results back to float32 (see `result_dtype`), so errors do not
+    accumulate over long time series, but single values are only exact up to a
+    relative error of about 6e-8.
+    """
+    columns = df.select_dtypes(include="float64").columns
+    if len(columns) == 0:
+        return df
+    return df.astype({column: COMPACT_FLOAT_DTYPE for column in columns})
+
+
+def result_dtype(dfs: Iterable[DataFrame]) -> np.dtype:
+    """
+    Returns the dtype of kernel results computed from the values of the given
+    dataframes: float32 if all of them hold compact float32 values only (see
+    `compact_df`) and float64 otherwise.
+    """
+    dtypes = [dtype for df in dfs for dtype in df.dtypes]
+    if dtypes and all(dtype == COMPACT_FLOAT_DTYPE for dtype in dtypes):
+        return COMPACT_FLOAT_DTYPE
+    return np.dtype("float64")
+
+
+def changed_rows(df: DataFrame) -> np.ndarray:
+    """
+    Returns a boolean mask of the rows of the event discrete dataframe that differ
+    from their predecessor in at least one column. NaN values are considered equal
+    to each other. The first and last row are always marked, the latter as it marks
+    the end of the time series.
+    """
+    changed = np.zeros(len(df), dtype=bool)
+    if len(df) == 0:
+        return changed
+    changed[0] = changed[-1] = True
+    for column in df.columns:
+        values = df[column].to_numpy()
+        differs = values[1:] != values[:-1]
+        if values.dtype.kind in "fc" or values.dtype == object:
+            missing = pd.isna(values)
+            differs &= ~(missing[1:] & missing[:-1])
+        changed[1:] |= differs
+    return changed
+
+
+def drop_unchanged_rows(df: DataFrame) -> DataFrame:
+    """
+    Drops the rows of the event discrete dataframe that equal their predecessor.
+    Since states are piecewise constant, these rows hold no information. The last
+    row is kept to preserve the end of the time series.
+    """
+    changed = changed_rows(df)
+    if changed.all():
+        return df
+    return df.iloc[np.flatnonzero(changed)]
 
 
 def add_df(a: pd.DataFrame, b: pd.DataFrame):
@@ -38,9 +135,323 @@ def add_df(a: pd.DataFrame, b: pd.DataFrame):
         a.values,
         b.values,  # type: ignore
     )
+    values = values.astype(result_dtype([a, b]), copy=False)
     return pd.DataFrame(values, index=index, columns=a.columns)  # type: ignore
 
 
+BINARY_OPS = {
+    "add": OP_ADD,
+    "sub": OP_SUB,
+    "mul": OP_MUL,
+    "div": OP_DIV,
+    "max": OP_MAX,
+    "min": OP_MIN,
+    "eq": OP_EQ,
+    "ne": OP_NE,
+    "lt": OP_LT,
+    "le": OP_LE,
+    "gt": OP_GT,
+    "ge": OP_GE,
+}
+
+COMPARISON_OPS = {"eq", "ne", "lt", "le", "gt", "ge"}
+
+# Values of a dataframe before its first event. Like in `reduce_dfs` inactive
+# operands don't take part in products and extrema, sums and differences treat them
+# as zero. All other operations are undefined (NaN) while an operand is inactive.
+BINARY_FILL_VALUES = {
+    "add": 0.0,
+    "sub": 0.0,
+    "mul": 1.0,
+    "max": -np.inf,
+    "min": np.inf,
+}
+
+REDUCTIONS = {
+    "sum": REDUCE_SUM,
+    "prod": REDUCE_PROD,
+    "max": REDUCE_MAX,
+    "min": REDUCE_MIN,
+    "mean": REDUCE_MEAN,
+}
+
+
+def binary_op_df(
+    a: DataFrame, b: DataFrame, op: str, fill_value: float | None = None
+) -> DataFrame:
+    """
+    Combines two dataframes with different indices in an event discrete manner
+    using the given binary operation. Comparisons result in boolean columns.
+    Before the first event of a dataframe, "add" and "sub" treat it as zero and
+    "mul", "max" and "min" return the other operand (see `reduce_dfs`). All other
+    operations are NaN there, which makes comparisons other than "ne" False.
+
+    Args:
+        a: The left operand.
+        b: The right operand.
+        op: One of "add", "sub", "mul", "div", "max", "min", "eq", "ne", "lt", "le",
+            "gt" or "ge".
+        fill_value: The value of a dataframe before its first event, defaults to
+            the value in `BINARY_FILL_VALUES` or NaN.
+    """
+    if op not in BINARY_OPS:
+        raise ValueError(f"Unknown operation {op}. Expected one of {list(BINARY_OPS)}")
+    if set(a.columns) != set(b.columns):
+        diff = set(a.columns).symmetric_difference(set(b.columns))
+        raise ValueError(
+            f"DataFrames have different columns: {diff} not in both DataFrames."
+        )
+    if len(a) == 0 and len(b) == 0:
+        return a
+    if fill_value is None:
+        fill_value = BINARY_FILL_VALUES.get(op, np.nan)
+
+    dfs = [df if df.index.is_monotonic_increasing else df.sort_index() for df in (a, b)]
+    index = Index(
+        np.unique(np.concatenate([df.index.to_numpy() for df in dfs if len(df) > 0])),
+        name=a.index.name if len(a) > 0 else b.index.name,
+    )
+    values = binary_op_2d_array(
+        BINARY_OPS[op],
+        to_int_index(index),
+        to_int_index(dfs[0].index) if len(dfs[0]) > 0 else np.empty(0, np.int64),
+        to_int_index(dfs[1].index) if len(dfs[1]) > 0 else np.empty(0, np.int64),
+        dfs[0].to_numpy(dtype="float64"),
+        dfs[1].reindex(columns=a.columns).to_numpy(dtype="float64"),
+        fill_value,
+        fill_value,
+    )
+    values = values.astype(result_dtype([a, b]), copy=False)
+    res = pd.DataFrame(values, index=index, columns=a.columns)
+    return res.astype(bool) if op in COMPARISON_OPS else res
+
+
+def reduce_dfs(
+    dfs: Sequence[DataFrame],
+    op: str = "sum",
+    weights: dict[str, Sequence[float]] | None = None,
+    parallel: bool = False,
+) -> DataFrame:
+    """
+    Reduces an arbitrary number of dataframes with different indices in an event
+    discrete manner. In contrast to folding the dataframes pairwise, the union
+    index is built once and all dataframes are reduced in a single pass over it.
+    Dataframes only take part in the reduction after their first event.
+
+    Args:
+        dfs: The dataframes to reduce.
+        op: One of "sum", "prod", "max", "min" or "mean".
+        weights: Optional mapping of column name to one weight per dataframe. The
+            values of the column are multiplied with the weight of their dataframe
+            before the reduction (e.g. to build capacity weighted averages).
+        parallel: Whether to reduce chunks of the union index in parallel.
+    """
+    if op not in REDUCTIONS:
+        raise ValueError(f"Unknown reduction {op}. Expected one of {list(REDUCTIONS)}")
+    if len(dfs) == 0:
+        return pd.DataFrame()
+
+    columns = dfs[0].columns
+    for df in dfs[1:]:
+        if not columns.equals(df.columns):
+            diff = set(columns).symmetric_difference(set(df.columns))
+            if diff:
+                raise ValueError(
+                    f"DataFrames have different columns: {diff} not in all DataFrames."
+                )
+
+    if weights is None:
+        dfs = [df for df in dfs if len(df) > 0]
+        if len(dfs) == 1:
+            return dfs[0]
+    if sum(len(df) for df in dfs) == 0:
+        return pd.DataFrame(columns=columns)
+
+    index, idx_flat, offsets, values = flatten_dfs(dfs, columns)
+    if weights is not None:
+        lengths = np.diff(offsets)
+        for col, col_weights in weights.items():
+            if len(col_weights) != len(dfs):
+                raise ValueError(
+                    f"Expected {len(dfs)} weights for column {col} but got {len(col_weights)}."
+                )
+            col_idx = columns.get_loc(col)
+            values[:, col_idx] *= np.repeat(np.asarray(col_weights), lengths)
+
+    if parallel:
+        res = reduce_2d_arrays_parallel(
+            REDUCTIONS[op],
+            to_int_index(index),
+            idx_flat,
+            offsets,
+            values,
+            numba.get_num_threads(),
+        )
+    else:
+        res = reduce_2d_arrays(
+            REDUCTIONS[op], to_int_index(index), idx_flat, offsets, values
+        )
+    res = res.astype(result_dtype(dfs), copy=False)
+    return pd.DataFrame(res, index=index, columns=columns)
+
+
+def sum_dfs(
+    dfs: Sequence[DataFrame],
+    weights: dict[str, Sequence[float]] | None = None,
+    parallel: bool = False,
+) -> DataFrame:
+    """
+    Sums an arbitrary number of dataframes with different indices in an event
+    discrete manner. See `reduce_dfs` for details.
+    """
+    return reduce_dfs(dfs, "sum", weights, parallel)
+
+
+def integrate_dfs(
+    dfs: Sequence[DataFrame], columns: Sequence[str]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Integrates the given columns of event discrete dataframes with datetime index over
+    time within a single kernel call.
+
+    Returns:
+        Arrays of shape (len(dfs), len(columns)) holding the integral as well as the
+        integral of the positive and negative values in value hours.
+    """
+    if len(dfs) == 0:
+        empty = np.zeros((0, len(columns)))
+        return empty, empty, empty
+    _, idx_flat, offsets, values = flatten_dfs(dfs, Index(columns), union=False)
+    return integrate_2d_arrays(idx_flat, offsets, values)
+
+
+def integrate_periods(
+    dfs: Sequence[DataFrame],
+    columns: Sequence[str],
+    period: str = "Y",
+    absolute: bool = False,
+) -> tuple[PeriodIndex, np.ndarray]:
+    """
+    Integrates event discrete dataframes with datetime index per period within a
+    single kernel call. Values that hold across a period boundary are split exactly
+    at the boundary.
+
+    Args:
+        dfs: The dataframes to integrate.
+        columns: The columns to integrate.
+        period: The period as `to_period()` alias, like Y for year, M for month, etc.
+        absolute: Whether to integrate the absolute values.
+
+    Returns:
+        The periods and an array of shape (len(dfs), number of periods, len(columns))
+        holding the integrals in value hours.
+    """
+    non_empty = [df for df in dfs if len(df) > 0]
+    if len(non_empty) == 0:
+        return PeriodIndex([], freq=period), np.zeros((len(dfs), 0, len(columns)))
+    start = min(df.index.min() for df in non_empty)
+    end = max(df.index.max() for df in non_empty)
+    periods = pd.period_range(start.to_period(period), end.to_period(period))
+    bins = periods.to_timestamp(how="start").append(
+        DatetimeIndex([(periods[-1] + 1).to_timestamp(how="start")])
+    )
+    _, idx_flat, offsets, values = flatten_dfs(dfs, Index(columns), union=False)
+    if absolute:
+        values = np.abs(values)
+    res = integrate_bins_2d_arrays(idx_flat, offsets, values, to_int_index(bins))
+    return periods, res
+
+
+def resample_bins(start: datetime, end: datetime, freq: str) -> DatetimeIndex:
+    """
+    Returns the edges of the bins with the given frequency that cover the time
+    between start and end (inclusive). The first bin starts at start floored to the
+    frequency, the last edge closes the bin that contains end.
+    """
+    offset = to_offset(freq)
+    if isinstance(offset, Tick):
+        first = pd.Timestamp(start).floor(offset)
+    else:
+        first = offset.rollback(pd.Timestamp(start).normalize())
+    starts = pd.date_range(first, end, freq=offset)
+    return starts.append(DatetimeIndex([starts[-1] + offset]))
+
+
+def resample_dfs(
+    dfs: Sequence[DataFrame], freq: str, columns: Sequence[str]
+) -> tuple[DatetimeIndex, np.ndarray]:
+    """
+    Resamples event discrete dataframes into shared bins of the given frequency by
+    time weighted averaging. In contrast to upsampling and averaging, the piecewise
+    constant values are integrated exactly within a single kernel call.
+
+    Returns:
+        The bin starts and an array of shape (len(dfs), number of bins, len(columns)).
+        Bins which do not overlap with a dataframe are NaN.
+    """
+    non_empty = [df for df in dfs if len(df) > 0]
+    if len(non_empty) == 0:
+        return DatetimeIndex([]), np.zeros((len(dfs), 0, len(columns)))
+    start = min(df.index.min() for df in non_empty)
+    end = max(df.index.max() for df in non_empty)
+    bins = resample_bins(start, end, freq)
+    _, idx_flat, offsets, values = flatten_dfs(dfs, Index(columns), union=False)
+    res = resample_2d_arrays(idx_flat, offsets, values, to_int_index(bins))
+    return bins[:-1], res
+
+
+def resample_df(df: DataFrame, freq: str) -> DataFrame:
+    """
+    Resamples an event discrete dataframe to the given frequency by exact time
+    weighted averaging. See `resample_dfs` for details.
+    """
+    if df.empty:
+        return df
+    bins, values = resample_dfs([df], freq, df.columns)
+    values = values[0].astype(result_dtype([df]), copy=False)
+    return pd.DataFrame(values, index=bins.rename(df.index.name), columns=df.columns)
+
+
+def flatten_dfs(
+    dfs: Sequence[DataFrame], columns: Index, union: bool = True
+) -> tuple[Index | None, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Brings the dataframes into the flattened layout expected by the n-ary numba
+    kernels: The sorted indices and float values of all dataframes are concatenated
+    and the offsets mark the start of each dataframe.
+
+    Args:
+        dfs: The dataframes to flatten.
+        columns: The columns to extract in the given order.
+        union: Whether to build the union index of all dataframes.
+
+    Returns:
+        The sorted union index (None if not requested), the concatenated integer
+        indices, the offsets and the concatenated values.
+    """
+    dfs = [df if df.index.is_monotonic_increasing else df.sort_index() for df in dfs]
+    offsets = np.zeros(len(dfs) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(df) for df in dfs])
+    indices = [df.index.to_numpy() for df in dfs if len(df) > 0]
+    raw_index = np.concatenate(indices) if indices else np.empty(0, dtype=np.int64)
+    values = np.concatenate(
+        [df.reindex(columns=columns).to_numpy(dtype="float64") for df in dfs]
+    )
+    index = Index(np.unique(raw_index), name=dfs[0].index.name) if union else None
+    return index, to_int_index(raw_index), offsets, values
+
+
+def to_int_index(index: Index | np.ndarray) -> np.ndarray:
+    """
+    Returns the index as integer array (nanoseconds since epoch for datetime indices),
+    which is the representation the numba kernels operate on.
+    """
+    values = np.asarray(index)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").view("int64")
+    return values
+
+
 def divide_positive_negative(df: DataFrame):
     positive = df.copy()
     positive[positive < 0] = 0
@@ -56,28 +467,250 @@ def filter_data_for_time_interval(
         return data
     if not data.index.is_monotonic_increasing:
         data = data.sort_index()
+    positions = interval_positions(data.index, start, end)
+    return slice_interval(data, positions, interval_index(data.index, start, positions))
+
 
+def interval_positions(
+    index: Index, start: datetime, end: datetime
+) -> tuple[int, int] | None:
+    """
+    Determines the positions of the event discrete data that lies within the interval
+    via binary search on the sorted index. The first position is the one of start if
+    present and otherwise the one of the last event before start. End is inclusive.
+
+    Returns:
+        The start and stop position for positional slicing or None if there is no data
+        within the interval.
+    """
     # Remove time zone to make datetime objects comparable
     if start.tzinfo is not None:
         start = start.replace(tzinfo=None)
     if end.tzinfo is not None:
         end = end.replace(tzinfo=None)
 
-    # we want the first value to be start if present and if not the last value before start
-    all_after_start = (data.index > start).all()
-    all_after_end = (data.index >= end).all()
-    if all_after_start and all_after_end:
-        return data.drop(data.index)
-    elif all_after_start:
-        start_row = data.index[0]
-        start = start_row
-    else:
-        before_start = data.index[data.index <= start]
-        start_row = before_start[-1]
-    # since this is the start of the time interval
-    end_row = data.index[data.index <= end][-1]
-    filtered_data = data[start_row:end_row]
-    return filtered_data.rename(index={filtered_data.loc[start_row].name: start})
+    if len(index) == 0 or (index[0] > start and index[0] >= end):
+        return None
+    # last event at or before start, or the first event if all events are after start
+    start_pos = max(index.searchsorted(start, side="right") - 1, 0)
+    stop_pos = index.searchsorted(end, side="right")
+    return start_pos, stop_pos
+
+
+def interval_index(
+    index: Index,
+    start: datetime,
+    positions: tuple[int, int] | None,
+    end: datetime | None = None,
+) -> Index:
+    """
+    Returns the index of the data within the interval given its positions (see
+    `interval_positions`). In case the interval starts between two events, the label
+    of the last event before start is replaced by start. If end is given and the data
+    ends before it, end is appended to hold the last state.
+    """
+    if positions is None:
+        return index[:0]
+    if start.tzinfo is not None:
+        start = start.replace(tzinfo=None)
+    start_pos, stop_pos = positions
+    sliced = index[start_pos:stop_pos]
+    if sliced[0] < start:
+        sliced = sliced.delete(0).insert(0, start)
+    if end is not None:
+        if end.tzinfo is not None:
+            end = end.replace(tzinfo=None)
+        if sliced[-1] < end:
+            sliced = sliced.insert(len(sliced), end)
+    return sliced
+
+
+def share_index(index: Index, shared: dict[tuple, list[Index]]) -> Index:
+    """
+    Returns an equal index out of the shared indices if there is one, otherwise adds
+    the index to them. Assigning the returned index to dataframes lets equal indices
+    share one object, which saves memory and allows computing index positions once
+    for all of them.
+
+    Args:
+        index: The index to share.
+        shared: The shared indices grouped by length, first and last label.
+    """
+    if len(index) == 0:
+        return index
+    candidates = shared.setdefault((len(index), index[0], index[-1]), [])
+    for candidate in candidates:
+        if candidate.equals(index):
+            return candidate
+    candidates.append(index)
+    return index
+
+
+def to_naive_index(times: datetime | Sequence[datetime] | Index) -> DatetimeIndex:
+    """Returns the given time or times as time zone naive DatetimeIndex."""
+    if isinstance(times, datetime):
+        times = [times]
+    index = pd.DatetimeIndex(times)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index
+
+
+def state_positions(index: Index, times: Index) -> np.ndarray:
+    """
+    Determines the positions of the event discrete states that are valid at the given
+    times via binary search on the sorted index. A state is valid from its own event
+    until the next one, so the position is the one of the last event at or before
+    each time. Times before the first event are assigned the position -1.
+    """
+    return np.searchsorted(to_int_index(index), to_int_index(times), side="right") - 1
+
+
+def states_at(
+    dfs: Sequence[DataFrame], times: Index, columns: Sequence[str]
+) -> dict[str, np.ndarray]:
+    """
+    Gathers the states of multiple event discrete dataframes at the given times.
+    Positions are determined once per distinct index object, so dataframes sharing
+    their index (see `share_index`) are gathered without any additional search.
+
+    Args:
+        dfs: The dataframes with sorted datetime indices.
+        times: The times at which to gather the states.
+        columns: The columns to gather.
+    Returns:
+        Arrays of shape (len(dfs), len(times)) per column. The entries are NaN where a
+        dataframe has no state, i.e. before its first event or if it lacks the column.
+        Non numeric columns result in object arrays.
+    """
+    times = to_int_index(times)
+    states = {c: np.full((len(dfs), len(times)), np.nan) for c in columns}
+    positions = {}
+    for i, df in enumerate(dfs):
+        if df.empty:
+            continue
+        cached = positions.get(id(df.index))
+        if cached is None:
+            # keep a reference to the index so its id can not be reused
+            pos = state_positions(df.index, times)
+            cached = (df.index, pos, pos >= 0)
+            positions[id(df.index)] = cached
+        _, pos, valid = cached
+        for column in columns:
+            if column not in df.columns:
+                continue
+            values = df[column].to_numpy()
+            if values.dtype.kind not in "iuf" and states[column].dtype != object:
+                states[column] = states[column].astype(object)
+            states[column][i, valid] = values[pos[valid]]
+    return states
+
+
+def slice_interval(
+    data: DataFrame, positions: tuple[int, int] | None, index: Index
+) -> DataFrame:
+    """
+    Slices the data given the positions and the index determined via
+    `interval_positions` and `interval_index`. Since the data is sliced positionally,
+    the result shares its values with data until either of them is modified. In case
+    the index holds an appended end, the last state is repeated for it.
+    """
+    if positions is None:
+        return data.iloc[:0]
+    start_pos, stop_pos = positions
+    if len(index) > stop_pos - start_pos:
+        take = np.append(np.arange(start_pos, stop_pos), stop_pos - 1)
+        return data.iloc[take].set_axis(index, axis=0)
+    return data.iloc[start_pos:stop_pos].set_axis(index, axis=0)
+
+
+def memory_usage(dfs: Iterable[DataFrame]) -> Series:
+    """
+    Determines the memory used by the values and indices of the given dataframes.
+    Dataframes that are copies of each other or slices of the same data share their
+    underlying buffers thanks to copy on write, which is accounted for by counting
+    each buffer once.
+
+    Returns:
+        Series holding the size in bytes of all dataframes as if they held their own
+        buffers ("total"), the size of the distinct buffers ("unique") and the size
+        saved by sharing ("shared").
+    """
+    total = 0
+    bounds = []
+    for df in dfs:
+        arrays = [df[column].to_numpy() for column in df.columns]
+        if not isinstance(df.index, pd.RangeIndex):
+            arrays.append(np.asarray(df.index))
+        for array in arrays:
+            total += array.nbytes
+            if array.nbytes > 0:
+                bounds.append(byte_bounds(array))
+    # size of the union of all memory ranges
+    unique = 0
+    end = 0
+    for low, high in sorted(bounds):
+        if high > end:
+            unique += high - max(low, end)
+            end = high
+    return pd.Series(
+        {"total": total, "unique": unique, "shared": total - unique}, name="bytes"
+    )
+
+
+def max_deviations(
+    a: Sequence[DataFrame],
+    b: Sequence[DataFrame],
+    columns: Sequence[str],
+    atol: float = 1e-8,
+    rtol: float = 1e-5,
+    stop_early: bool = False,
+    parallel: bool = False,
+    chunk_size: int = 1024,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compares pairs of event discrete dataframes within vectorized kernel calls. The
+    i-th dataframe of a is compared with the i-th dataframe of b on the union of
+    their indices, so dataframes describing the same states with different events
+    are considered equal. See `compare_2d_arrays` for the tolerance semantics.
+
+    Args:
+        a: The dataframes to compare.
+        b: The dataframes to compare against.
+        columns: The (numeric) columns to compare.
+        atol: The absolute tolerance.
+        rtol: The relative tolerance.
+        stop_early: Whether to stop after the first chunk of dataframes containing
+            a mismatch.
+        parallel: Whether to compare the dataframes of a chunk in parallel.
+        chunk_size: The number of dataframe pairs per kernel call when stopping
+            early.
+
+    Returns:
+        The maximum absolute deviation of shape (len(a), len(columns)) and the
+        number of mismatching events per pair. Pairs that were not compared due to
+        stopping early are NaN and -1 respectively.
+    """
+    if len(a) != len(b):
+        raise ValueError(
+            f"Expected the same number of DataFrames: {len(a)} != {len(b)}"
+        )
+    deviation = np.full((len(a), len(columns)), np.nan)
+    mismatches = np.full(len(a), -1, dtype=np.int64)
+    kernel = compare_2d_arrays_parallel if parallel else compare_2d_arrays
+    step = chunk_size if stop_early else max(len(a), 1)
+    for start in range(0, len(a), step):
+        stop = start + step
+        _, idx_a, offsets_a, values_a = flatten_dfs(a[start:stop], columns, False)
+        _, idx_b, offsets_b, values_b = flatten_dfs(b[start:stop], columns, False)
+        dev, mis = kernel(
+            idx_a, offsets_a, values_a, idx_b, offsets_b, values_b, atol, rtol
+        )
+        deviation[start:stop] = dev
+        mismatches[start:stop] = mis
+        if stop_early and mis.any():
+            break
+    return deviation, mismatches
 
 
 def compare_dfs(a: DataFrame, b: DataFrame, check_like=True, **kwargs):
@@ -1,7 +1,30 @@
 import numpy as np
-from numba import jit
+from numba import jit, prange
 from numpy import ndarray
 
+NS_PER_HOUR = 3_600_000_000_000
+
+# Operation codes of the binary event discrete kernels
+OP_ADD = 0
+OP_SUB = 1
+OP_MUL = 2
+OP_DIV = 3
+OP_MAX = 4
+OP_MIN = 5
+OP_EQ = 6
+OP_NE = 7
+OP_LT = 8
+OP_LE = 9
+OP_GT = 10
+OP_GE = 11
+
+# Operation codes of the n-ary event discrete reduction kernels
+REDUCE_SUM = 0
+REDUCE_PROD = 1
+REDUCE_MAX = 2
+REDUCE_MIN = 3
+REDUCE_MEAN = 4
+
 
 @jit
 def add_array(idx: ndarray, idx_a: ndarray, idx_b: ndarray, a: ndarray, b: ndarray):
@@ -128,3 +151,640 @@ def add_2d_array(idx: ndarray, idx_a: ndarray, idx_b: ndarray, a: ndarray, b: nd
             k = k + 1
             i = i + 1
     return res
+
+
+@jit(cache=True, error_model="numpy")
+def apply_binary_op(op: int, x: float, y: float) -> float:
+    """
+    Applies the binary operation with the given operation code. Comparisons return
+    1.0 if they hold and 0.0 otherwise.
+    """
+    if op == OP_ADD:
+        return x + y
+    elif op == OP_SUB:
+        return x - y
+    elif op == OP_MUL:
+        return x * y
+    elif op == OP_DIV:
+        return x / y
+    elif op == OP_MAX:
+        return max(x, y)
+    elif op == OP_MIN:
+        return min(x, y)
+    elif op == OP_EQ:
+        return 1.0 if x == y else 0.0
+    elif op == OP_NE:
+        return 1.0 if x != y else 0.0
+    elif op == OP_LT:
+        return 1.0 if x < y else 0.0
+    elif op == OP_LE:
+        return 1.0 if x <= y else 0.0
+    elif op == OP_GT:
+        return 1.0 if x > y else 0.0
+    elif op == OP_GE:
+        return 1.0 if x >= y else 0.0
+    return np.nan
+
+
+@jit(cache=True, error_model="numpy")
+def binary_op_2d_array(
+    op: int,
+    idx: ndarray,
+    idx_a: ndarray,
+    idx_b: ndarray,
+    a: ndarray,
+    b: ndarray,
+    fill_a: float = 0.0,
+    fill_b: float = 0.0,
+):
+    """
+    Combines two multi-column time series with different indices in an event
+    discrete manner using the binary operation with the given operation code. The
+    state of a system stays constant until a new event occurs. The resulting time
+    series index is a union of the indices of the input time series.
+
+    Args:
+        op: int, the operation code (see OP_* constants)
+        idx: ndarray, the index of the resulting time series (union of idx_a and idx_b)
+        idx_a: ndarray, the index of the first time series
+        idx_b: ndarray, the index of the second time series
+        a: ndarray, the values of the first time series
+        b: ndarray, the values of the second time series
+        fill_a: float, the value of the first time series before its first event
+        fill_b: float, the value of the second time series before its first event
+
+    Returns:
+        ndarray, the resulting time series
+    """
+    cols = a.shape[1]
+    res = np.empty((len(idx), cols))
+    len_a, len_b = len(idx_a), len(idx_b)
+    j, k = 0, 0
+
+    for i in range(len(idx)):
+        while j < len_a and idx_a[j] <= idx[i]:
+            j = j + 1
+        while k < len_b and idx_b[k] <= idx[i]:
+            k = k + 1
+        for col in range(cols):
+            x = a[j - 1, col] if j > 0 else fill_a
+            y = b[k - 1, col] if k > 0 else fill_b
+            res[i, col] = apply_binary_op(op, x, y)
+    return res
+
+
+def _reduce_2d_arrays(
+    op: int,
+    idx: ndarray,
+    idx_flat: ndarray,
+    offsets: ndarray,
+    values: ndarray,
+    nr_chunks: int = 1,
+):
+    """
+    Reduces an arbitrary number of multi-column time series with different indices in
+    an event discrete manner within a single merge of their events. The state of a
+    system stays constant until a new event occurs. Time series which did not have
+    their first event yet do not take part in the reduction. If no time series is
+    active, sums are zero and all other reductions are NaN.
+
+    The events are bucketed by their position within the union index and applied in
+    order to a segment tree over the current values of all time series, whose root
+    holds the reduction. This takes O((events * log(time series) + union) * columns)
+    instead of visiting every time series at every timestamp of the union index.
+
+    The time series are passed in a flattened layout: The (sorted) indices and values
+    of all time series are concatenated and the offsets mark where each of them starts.
+
+    Args:
+        op: int, the reduction code (see REDUCE_* constants)
+        idx: ndarray, the index of the resulting time series (union of all indices)
+        idx_flat: ndarray, the concatenated indices of all time series
+        offsets: ndarray, the start position of each time series within idx_flat plus
+            a trailing entry holding the total length
+        values: ndarray, the concatenated values of all time series
+        nr_chunks: int, the number of chunks the union index is split into. Chunks
+            are processed in parallel by `reduce_2d_arrays_parallel`.
+
+    Returns:
+        ndarray, the resulting time series
+    """
+    nr_series = len(offsets) - 1
+    nr_events = len(idx_flat)
+    cols = values.shape[1]
+    res = np.empty((len(idx), cols))
+    if len(idx) == 0:
+        return res
+    nr_chunks = max(1, min(nr_chunks, len(idx)))
+    chunk_size = (len(idx) + nr_chunks - 1) // nr_chunks
+
+    if op == REDUCE_PROD:
+        init, combine = 1.0, OP_MUL
+    elif op == REDUCE_MAX:
+        init, combine = -np.inf, OP_MAX
+    elif op == REDUCE_MIN:
+        init, combine = np.inf, OP_MIN
+    else:
+        init, combine = 0.0, OP_ADD
+
+    # bucket the events by the position of their timestamp within the union index,
+    # events of the same time series keep their order
+    series = np.empty(nr_events, dtype=np.int64)
+    for s in range(nr_series):
+        series[offsets[s] : offsets[s + 1]] = s
+    event_pos = np.searchsorted(idx, idx_flat)
+    bucket = np.zeros(len(idx) + 2, dtype=np.int64)
+    for p in range(nr_events):
+        bucket[event_pos[p] + 1] += 1
+    bucket = np.cumsum(bucket)
+    fill = bucket.copy()
+    events = np.empty(nr_events, dtype=np.int64)
+    for p in range(nr_events):
+        events[fill[event_pos[p]]] = p
+        fill[event_pos[p]] += 1
+
+    leaves = 1
+    while leaves < nr_series:
+        leaves = 2 * leaves
+
+    for c in prange(nr_chunks):
+        start = c * chunk_size
+        stop = min(start + chunk_size, len(idx))
+        if start >= stop:
+            continue
+        # state of all time series before the first timestamp of the chunk
+        tree = np.full((2 * leaves, cols), init)
+        active = np.zeros(nr_series, dtype=np.bool_)
+        nr_active = 0
+        for s in range(nr_series):
+            series_idx = idx_flat[offsets[s] : offsets[s + 1]]
+            p = offsets[s] + np.searchsorted(series_idx, idx[start])
+            if p > offsets[s]:
+                active[s] = True
+                nr_active = nr_active + 1
+                tree[leaves + s] = values[p - 1]
+        for k in range(leaves - 1, 0, -1):
+            for col in range(cols):
+                tree[k, col] = apply_binary_op(
+                    combine, tree[2 * k, col], tree[2 * k + 1, col]
+                )
+
+        for i in range(start, stop):
+            for e in range(bucket[i], bucket[i + 1]):
+                p = events[e]
+                s = series[p]
+                if not active[s]:
+                    active[s] = True
+                    nr_active = nr_active + 1
+                k = leaves + s
+                tree[k] = values[p]
+                k = k // 2
+                while k > 0:
+                    for col in range(cols):
+                        tree[k, col] = apply_binary_op(
+                            combine, tree[2 * k, col], tree[2 * k + 1, col]
+                        )
+                    k = k // 2
+            for col in range(cols):
+                if op == REDUCE_SUM:
+                    res[i, col] = tree[1, col]
+                elif nr_active == 0:
+                    res[i, col] = np.nan
+                elif op == REDUCE_MEAN:
+                    res[i, col] = tree[1, col] / nr_active
+                else:
+                    res[i, col] = tree[1, col]
+    return res
+
+
+reduce_2d_arrays = jit(cache=True, error_model="numpy")(_reduce_2d_arrays)
+reduce_2d_arrays_parallel = jit(cache=True, error_model="numpy", parallel=True)(
+    _reduce_2d_arrays
+)
+
+
+@jit(cache=True)
+def integrate_2d_arrays(idx_flat: ndarray, offsets: ndarray, values: ndarray):
+    """
+    Integrates an arbitrary number of multi-column event discrete time series over
+    time. Each value holds until the next event of its time series, the last value of
+    each time series marks the end of the time series and carries no duration. NaN
+    values are skipped.
+
+    The time series are passed in a flattened layout: The (sorted) indices and values
+    of all time series are concatenated and the offsets mark where each of them starts.
+
+    Args:
+        idx_flat: ndarray, the concatenated indices of all time series in nanoseconds
+        offsets: ndarray, the start position of each time series within idx_flat plus
+            a trailing entry holding the total length
+        values: ndarray, the concatenated values of all time series
+
+    Returns:
+        Tuple of ndarrays with shape (number of time series, columns) holding the
+        integral as well as the integral of the positive and negative values in
+        value hours.
+    """
+    nr_series = len(offsets) - 1
+    cols = values.shape[1]
+    total = np.zeros((nr_series, cols))
+    positive = np.zeros((nr_series, cols))
+    negative = np.zeros((nr_series, cols))
+
+    for s in range(nr_series):
+        for p in range(offsets[s], offsets[s + 1] - 1):
+            duration = (idx_flat[p + 1] - idx_flat[p]) / NS_PER_HOUR
+            for col in range(cols):
+                value = values[p, col]
+                if np.isnan(value):
+                    continue
+                area = value * duration
+                total[s, col] += area
+                if value > 0:
+                    positive[s, col] += area
+                else:
+                    negative[s, col] += area
+    return total, positive, negative
+
+
+@jit(cache=True)
+def resample_2d_arrays(
+    idx_flat: ndarray, offsets: ndarray, values: ndarray, bins: ndarray
+):
+    """
+    Resamples an arbitrary number of multi-column event discrete time series into
+    the given bins by exactly integrating their piecewise constant values and
+    dividing by the covered duration of each bin. The last value of each time series
+    marks its end. A bin that only touches a time series at a single point (e.g. a
+    bin starting at the end of the time series) holds the state at that point. NaN
+    values are skipped.
+
+    The time series are passed in a flattened layout: The (sorted) indices and values
+    of all time series are concatenated and the offsets mark where each of them starts.
+
+    Args:
+        idx_flat: ndarray, the concatenated indices of all time series
+        offsets: ndarray, the start position of each time series within idx_flat plus
+            a trailing entry holding the total length
+        values: ndarray, the concatenated values of all time series
+        bins: ndarray, the sorted edges of the bins (one more than the number of bins)
+
+    Returns:
+        ndarray of shape (number of time series, number of bins, columns). Bins
+        which do not overlap with a time series are NaN.
+    """
+    nr_series = len(offsets) - 1
+    nr_bins = len(bins) - 1
+    cols = values.shape[1]
+    res = np.full((nr_series, nr_bins, cols), np.nan)
+    acc = np.empty(cols)
+    weight = np.empty(cols)
+
+    for s in range(nr_series):
+        first, last = offsets[s], offsets[s + 1] - 1
+        if last < first:
+            continue
+        p = first
+        for b in range(nr_bins):
+            if bins[b + 1] <= idx_flat[first] or bins[b] > idx_flat[last]:
+                continue
+            start = max(bins[b], idx_flat[first])
+            stop = min(bins[b + 1], idx_flat[last])
+            while p < last and idx_flat[p + 1] <= start:
+                p = p + 1
+            if start == stop:
+                for col in range(cols):
+                    res[s, b, col] = values[p, col]
+                continue
+
+            acc[:] = 0.0
+            weight[:] = 0.0
+            q = p
+            while q < last and idx_flat[q] < stop:
+                duration = min(idx_flat[q + 1], stop) - max(idx_flat[q], start)
+                if duration > 0:
+                    for col in range(cols):
+                        if not np.isnan(values[q, col]):
+                            acc[col] += values[q, col] * duration
+                            weight[col] += duration
+                q = q + 1
+            for col in range(cols):
+                if weight[col] > 0:
+                    res[s, b, col] = acc[col] / weight[col]
+    return res
+
+
+@jit(cache=True)
+def integrate_bins_2d_arrays(
+    idx_flat: ndarray, offsets: ndarray, values: ndarray, bins: ndarray
+):
+    """
+    Integrates an arbitrary number of multi-column event discrete time series over
+    time, split exactly at the given bin edges. Each value holds until the next event
+    of its time series, the last value of each time series marks its end. NaN values
+    are skipped.
+
+    The time series are passed in a flattened layout: The (sorted) indices and values
+    of all time series are concatenated and the offsets mark where each of them starts.
+
+    Args:
+        idx_flat: ndarray, the concatenated indices of all time series in nanoseconds
+        offsets: ndarray, the start position of each time series within idx_flat plus
+            a trailing entry holding the total length
+        values: ndarray, the concatenated values of all time series
+        bins: ndarray, the sorted edges of the bins in nanoseconds (one more than the
+            number of bins)
+
+    Returns:
+        ndarray of shape (number of time series, number of bins, columns) holding the
+        integral within each bin in value hours.
+    """
+    nr_series = len(offsets) - 1
+    nr_bins = len(bins) - 1
+    cols = values.shape[1]
+    res = np.zeros((nr_series, nr_bins, cols))
+
+    for s in range(nr_series):
+        b = 0
+        for p in range(offsets[s], offsets[s + 1] - 1):
+            seg_start, seg_end = idx_flat[p], idx_flat[p + 1]
+            while b < nr_bins and bins[b + 1] <= seg_start:
+                b = b + 1
+            k = b
+            while k < nr_bins and bins[k] < seg_end:
+                duration = min(bins[k + 1], seg_end) - max(bins[k], seg_start)
+                if duration > 0:
+                    for col in range(cols):
+                        value = values[p, col]
+                        if not np.isnan(value):
+                            res[s, k, col] += value * duration / NS_PER_HOUR
+                k = k + 1
+    return res
+
+
+def _compare_2d_arrays(
+    idx_a: ndarray,
+    offsets_a: ndarray,
+    values_a: ndarray,
+    idx_b: ndarray,
+    offsets_b: ndarray,
+    values_b: ndarray,
+    atol: float,
+    rtol: float,
+):
+    """
+    Compares pairs of multi-column event discrete time series within a single pass
+    over the union of each pair's indices. At every event of either time series the
+    current states are compared, two values are considered equal if
+    |a - b| <= atol + rtol * |b|. NaN values are equal to NaN values only. Differing
+    end times of a pair count as one mismatch.
+
+    The time series are passed in a flattened layout (see `integrate_2d_arrays`), the
+    i-th time series of a is compared with the i-th time series of b.
+
+    Returns:
+        Tuple of the maximum absolute deviation per pair and column (inf if only one
+        of both values is NaN) and the number of mismatching events per pair.
+    """
+    nr_series = len(offsets_a) - 1
+    cols = values_a.shape[1]
+    deviation = np.zeros((nr_series, cols))
+    mismatches = np.zeros(nr_series, dtype=np.int64)
+
+    for s in prange(nr_series):
+        i, i_end = offsets_a[s], offsets_a[s + 1]
+        j, j_end = offsets_b[s], offsets_b[s + 1]
+        if (i == i_end) != (j == j_end):
+            mismatches[s] += 1
+            continue
+        if i == i_end:
+            continue
+        if idx_a[i_end - 1] != idx_b[j_end - 1]:
+            mismatches[s] += 1
+        pos_a = -1
+        pos_b = -1
+        while i < i_end or j < j_end:
+            if j == j_end or (i < i_end and idx_a[i] <= idx_b[j]):
+                t = idx_a[i]
+            else:
+                t = idx_b[j]
+            if i < i_end and idx_a[i] == t:
+                pos_a = i
+                i += 1
+            if j < j_end and idx_b[j] == t:
+                pos_b = j
+                j += 1
+            mismatch = False
+            for col in range(cols):
+                x = values_a[pos_a, col] if pos_a >= 0 else np.nan
+                y = values_b[pos_b, col] if pos_b >= 0 else np.nan
+                if x == y or (np.isnan(x) and np.isnan(y)):
+                    continue
+                diff = abs(x - y)
+                if np.isnan(diff):
+                    diff = np.inf
+                if not diff <= atol + rtol * abs(y):
+                    mismatch = True
+                if diff > deviation[s, col]:
+                    deviation[s, col] = diff
+            if mismatch:
+                mismatches[s] += 1
+    return deviation, mismatches
+
+
+compare_2d_arrays = jit(cache=True)(_compare_2d_arrays)
+compare_2d_arrays_parallel = jit(cache=True, parallel=True)(_compare_2d_arrays)
+
+
+@jit(cache=True)
+def _k1(q: float, norm: float) -> float:
+    return norm * np.arcsin(2 * min(max(q, 0.0), 1.0) - 1)
+
+
+@jit(cache=True)
+def _k1_inverse(k: float, norm: float) -> float:
+    return (np.sin(min(k / norm, np.pi / 2)) + 1) / 2
+
+
+@jit(cache=True)
+def compress_centroids(
+    means: ndarray, weights: ndarray, exact: ndarray, compression: float
+):
+    """
+    Compresses weighted centroids of a t-digest in a single pass. Neighbouring
+    centroids are merged as long as the merged centroid stays within one unit of the
+    k1 scale function k(q) = compression / (2 pi) * asin(2q - 1), which keeps the
+    centroids at the tails of the distribution small and thereby the tail quantiles
+    accurate. Exact centroids, which only hold a single distinct value, are always
+    merged with exact centroids of the same value, so repeated values are kept
+    without loss.
+
+    Args:
+        means: ndarray, the means of the centroids sorted in ascending order
+        weights: ndarray, the positive weights of the centroids
+        exact: ndarray, whether each centroid only holds a single distinct value
+        compression: float, the compression parameter, the number of centroids
+            after compression is in the order of the compression
+
+    Returns:
+        Tuple of ndarrays holding the means, weights and exactness of the compressed
+        centroids.
+    """
+    n = len(means)
+    res_means = np.empty(n)
+    res_weights = np.empty(n)
+    res_exact = np.empty(n, dtype=np.bool_)
+    if n == 0:
+        return res_means, res_weights, res_exact
+    total = weights.sum()
+    norm = compression / (2 * np.pi)
+
+    j = 0
+    res_means[0] = means[0]
+    res_weights[0] = weights[0]
+    res_exact[0] = exact[0]
+    # weight of all centroids left of the current one
+    left = 0.0
+    limit = total * _k1_inverse(_k1(0.0, norm) + 1.0, norm)
+    for i in range(1, n):
+        merged = res_weights[j] + weights[i]
+        if res_exact[j] and exact[i] and res_means[j] == means[i]:
+            res_weights[j] = merged
+        elif left + merged <= limit:
+            res_means[j] += (means[i] - res_means[j]) * weights[i] / merged
+            res_weights[j] = merged
+            res_exact[j] = False
+        else:
+            left += res_weights[j]
+            limit = total * _k1_inverse(_k1(left / total, norm) + 1.0, norm)
+            j += 1
+            res_means[j] = means[i]
+            res_weights[j] = weights[i]
+            res_exact[j] = exact[i]
+    return res_means[: j + 1], res_weights[: j + 1], res_exact[: j + 1]
+
+
+@jit(cache=True)
+def backward_forward_sweep(
+    order: ndarray,
+    parent: ndarray,
+    y_series: ndarray,
+    y_shunt: ndarray,
+    s: ndarray,
+    v: ndarray,
+    tolerance: float,
+    max_iterations: int,
+) -> ndarray:
+    """
+    Solves the power flow of radial grids for multiple time steps at once. Each
+    iteration accumulates the currents from the leaves towards the roots (backward
+    sweep) and updates the voltages from the roots towards the leaves (forward sweep)
+    until the voltages change less than the tolerance. Convergence is tracked per
+    time step, converged time steps are no longer updated.
+
+    Args:
+        order: ndarray, the buses in breadth first order starting at the roots
+        parent: ndarray, the parent of each bus, -1 for the roots
+        y_series: ndarray, the series admittance of each bus towards its parent
+        y_shunt: ndarray, the shunt admittance of each bus
+        s: ndarray of shape (buses, time steps), the apparent power drawn at each bus
+        v: ndarray of shape (buses, time steps), the start voltages which are updated
+            in place, the voltages of the roots are kept
+        tolerance: float, the maximum voltage change of a converged solution
+        max_iterations: int, the maximum number of iterations
+
+    Returns:
+        ndarray holding the number of iterations of each time step, -1 for time steps
+        that did not converge or whose voltages are not finite.
+    """
+    n_steps = v.shape[1]
+    iterations = np.full(n_steps, -1, dtype=np.int64)
+    active = np.arange(n_steps)
+    i = np.empty_like(v)
+    delta = np.empty(n_steps)
+    for iteration in range(1, max_iterations + 1):
+        for k in order:
+            for t in active:
+                i[k, t] = np.conj(s[k, t] / v[k, t]) + y_shunt[k] * v[k, t]
+        for idx in range(len(order) - 1, -1, -1):
+            k = order[idx]
+            if parent[k] >= 0:
+                for t in active:
+                    i[parent[k], t] += i[k, t]
+        delta[active] = 0.0
+        for k in order:
+            if parent[k] < 0:
+                continue
+            for t in active:
+                v_new = v[parent[k], t] - i[k, t] / y_series[k]
+                # NaN deltas are kept, so that diverged time steps never converge
+                change = abs(v_new - v[k, t])
+                if not change <= delta[t]:
+                    delta[t] = change
+                v[k, t] = v_new
+        nr_active = 0
+        for t in active:
+            if delta[t] < tolerance:
+                iterations[t] = iteration
+            elif np.isfinite(delta[t]):
+                active[nr_active] = t
+                nr_active += 1
+        active = active[:nr_active]
+        if nr_active == 0:
+            break
+    return iterations
+
+
+@jit(cache=True)
+def depth_first_branches(
+    indptr: ndarray, indices: ndarray, active: ndarray, roots: ndarray
+):
+    """
+    Decomposes a graph into branches, which are the parts of the graph that are
+    reachable from a root via one of its neighbours without passing another root.
+    Each branch holds its nodes in depth first preorder. The traversal is iterative
+    and visits each node and edge at most once.
+
+    Args:
+        indptr: ndarray, the index pointers of the CSR adjacency
+        indices: ndarray, the neighbour of each entry of the CSR adjacency
+        active: ndarray, whether each entry of the CSR adjacency is traversed
+        roots: ndarray, the distinct roots, whose branches are gathered in order
+
+    Returns:
+        Tuple of ndarrays holding the nodes of all branches, the offsets of the
+        branches within the nodes and the root of each branch.
+    """
+    n_nodes = len(indptr) - 1
+    visited = np.zeros(n_nodes, dtype=np.bool_)
+    visited[roots] = True
+    order = np.empty(n_nodes, dtype=np.int64)
+    offsets = np.empty(n_nodes + 1, dtype=np.int64)
+    branch_roots = np.empty(n_nodes, dtype=np.int64)
+    stack = np.empty(len(indices) + 1, dtype=np.int64)
+    n = 0
+    n_branches = 0
+    for root in roots:
+        for k in range(indptr[root], indptr[root + 1]):
+            if not active[k] or visited[indices[k]]:
+                continue
+            offsets[n_branches] = n
+            branch_roots[n_branches] = root
+            n_branches += 1
+            stack[0] = indices[k]
+            top = 1
+            while top > 0:
+                top -= 1
+                node = stack[top]
+                if visited[node]:
+                    continue
+                visited[node] = True
+                order[n] = node
+                n += 1
+                # push in reverse so the first neighbour is visited first
+                for j in range(indptr[node + 1] - 1, indptr[node] - 1, -1):
+                    if active[j] and not visited[indices[j]]:
+                        stack[top] = indices[j]
+                        top += 1
+    offsets[n_branches] = n
+    return order[:n], offsets[: n_branches + 1], branch_roots[:n_branches]
@@ -0,0 +1,24 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def process_pool(max_workers: int | None = None, **kwargs) -> ProcessPoolExecutor:
+    """
+    Returns a process pool whose workers don't inherit the threads of this process.
+    Forking a process after numba started the thread pool of a parallel kernel is
+    unsafe (e.g. for the GNU OpenMP threading layer), so the workers are forked from
+    a forkserver that has pypsdm preloaded, or spawned where no forkserver is
+    available. The arguments of the tasks and the initializer are pickled.
+
+    Args:
+        max_workers: The number of worker processes, defaults to the number of
+            processors.
+        kwargs: Further arguments of the `ProcessPoolExecutor`.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        # only takes effect when the forkserver is started by the first pool
+        context.set_forkserver_preload(["pypsdm"])
+    else:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers, mp_context=context, **kwargs)
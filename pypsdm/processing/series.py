@@ -1,23 +1,39 @@
-from typing import Tuple
+from typing import Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame, Series
 
+from pypsdm.processing.dataframe import (
+    integrate_dfs,
+    resample_df,
+    state_positions,
+    to_int_index,
+)
 from pypsdm.processing.numba import add_array
 
 
 def duration_weighted_series(series: Series):
     series.sort_index(inplace=True)
     values = series[:-1].reset_index(drop=True)
-    duration = (
-        (series.index[1::] - series.index[:-1])
-        .to_series()
-        .apply(lambda x: x.total_seconds() / 3600)
-        .reset_index(drop=True)
+    duration = Series(
+        (series.index[1::] - series.index[:-1]).total_seconds() / 3600,
     )
     return pd.concat([values.rename("values"), duration.rename("duration")], axis=1)
 
 
+def integrate_series(series: Series) -> Tuple[float, float, float]:
+    """
+    Integrates an event discrete time series over time.
+
+    Returns:
+        The integral as well as the integral of the positive and negative values
+        in value hours.
+    """
+    total, positive, negative = integrate_dfs([series.to_frame("values")], ["values"])
+    return float(total[0, 0]), float(positive[0, 0]), float(negative[0, 0])
+
+
 def weighted_series_sum(weighted_series: DataFrame) -> float:
     if len(weighted_series) == 0:
         return 0.0
@@ -25,8 +41,7 @@ def weighted_series_sum(weighted_series: DataFrame) -> float:
 
 
 def duration_weighted_sum(series: Series) -> float:
-    weighted_series = duration_weighted_series(series)
-    return weighted_series_sum(weighted_series)
+    return integrate_series(series)[0]
 
 
 def add_series(a: pd.Series, b: pd.Series, name: str | None = None):
@@ -45,30 +60,74 @@ def add_series(a: pd.Series, b: pd.Series, name: str | None = None):
     )
 
 
-def join_series(series: list[Series]) -> DataFrame:
-    first_series = series[0]
-    df = first_series.rename(first_series.name).to_frame()
-    for series in series[1:]:
-        df = df.join(series.rename(series.name), how="outer").fillna(method="ffill")
-    return df
+def join_series(series: Sequence[Series]) -> DataFrame:
+    """
+    Joins event discrete series on the union of their indices within a single pass
+    per series. Each column holds the state of its series at each time, which is its
+    last value at or before that time (i.e. the series is forward filled). Missing
+    values within a series are forward filled as well, which equals concatenating
+    the series and forward filling the result. Before the first event of a series
+    the column is NaN.
+
+    Args:
+        series: The series to join. Their names become the column names.
+    Returns:
+        DataFrame with the sorted union index holding one column per series.
+    """
+    if len(series) == 0:
+        return DataFrame()
+    series = [s if s.index.is_monotonic_increasing else s.sort_index() for s in series]
+    series = [s.ffill() if s.hasnans else s for s in series]
+    non_empty = [s.index for s in series if len(s) > 0]
+    index = pd.Index(
+        (
+            np.unique(np.concatenate([i.to_numpy() for i in non_empty]))
+            if non_empty
+            else []
+        ),
+        name=non_empty[0].name if non_empty else series[0].index.name,
+    )
+    int_index = to_int_index(index)
+
+    positions = {}
+    for s in series:
+        if id(s.index) not in positions:
+            # keep a reference to the index so its id can not be reused
+            positions[id(s.index)] = (s.index, state_positions(s.index, int_index))
+    missing = any((positions[id(s.index)][1] < 0).any() for s in series)
+    dtype = np.result_type(*[s.dtype for s in series])
+    if missing and dtype.kind in "iu":
+        dtype = np.dtype("float64")
+    elif missing and dtype.kind not in "fc":
+        dtype = np.dtype(object)
+
+    shape = (len(index), len(series))
+    values = np.full(shape, np.nan, dtype=dtype) if missing else np.empty(shape, dtype)
+    for j, s in enumerate(series):
+        pos = positions[id(s.index)][1]
+        valid = pos >= 0
+        values[valid, j] = s.to_numpy()[pos[valid]]
+    return DataFrame(values, index=index, columns=[s.name for s in series])
+
+
+def resample_series(series: Series, freq: str) -> Series:
+    """
+    Resamples an event discrete series to the given frequency by exact time weighted
+    averaging of its piecewise constant values.
+    """
+    return resample_df(series.to_frame(), freq).iloc[:, 0].rename(series.name)
 
 
 def hourly_mean_resample(series: Series) -> Series:
-    return series.resample("60s").ffill().resample("1h").mean()
+    return resample_series(series, "1h")
 
 
 def pos_and_neg_area(p_ts: Series) -> Tuple[float, float]:
     """
     Calculate the positive and negative area under the curve of a time series.
     """
-    weighted_series = duration_weighted_series(p_ts)
-    load_filter = weighted_series["values"] > 0
-    weighted_load = weighted_series[load_filter]
-    weighted_generation = weighted_series[~load_filter]
-    return (
-        weighted_series_sum(weighted_load),
-        weighted_series_sum(weighted_generation),
-    )
+    _, positive, negative = integrate_series(p_ts)
+    return positive, negative
 
 
 def divide_positive_negative(series: Series):
@@ -0,0 +1,276 @@
+from datetime import datetime
+from typing import Hashable, Self, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy import ndarray
+from pandas import Index, Series
+
+from pypsdm.processing.dataframe import to_int_index, to_naive_index
+from pypsdm.processing.numba import NS_PER_HOUR, compress_centroids
+
+DEFAULT_COMPRESSION = 100.0
+# number of buffered values per unit of compression before the digest is compressed
+BUFFER_FACTOR = 10
+
+
+class DurationDigest:
+    """
+    Mergeable quantile sketch (t-digest) of the values of event discrete data that
+    weights each value with the duration it holds. The sketch holds a bounded number
+    of centroids that are small at the tails of the distribution, so the memory is
+    independent of the length of the data while high and low quantiles remain
+    accurate. Values are added in batches and digests of disjoint data can be merged,
+    which allows building them while streaming through the data.
+
+    Durations are given in hours, so the total duration and the duration curve are
+    in hours as well.
+    """
+
+    __slots__ = (
+        "compression",
+        "min",
+        "max",
+        "_means",
+        "_weights",
+        "_exact",
+        "_buffer",
+        "_size",
+    )
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.min = np.inf
+        self.max = -np.inf
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        # whether a centroid only holds a single distinct value
+        self._exact = np.empty(0, dtype=bool)
+        self._buffer: list[tuple[ndarray, ndarray, ndarray]] = []
+        self._size = 0
+
+    @classmethod
+    def from_series(
+        cls, series: Series, compression: float = DEFAULT_COMPRESSION
+    ) -> Self:
+        """
+        Builds the digest of an event discrete series. Each value holds until the next
+        event, the last value marks the end of the series and carries no duration.
+        """
+        if not series.index.is_monotonic_increasing:
+            series = series.sort_index()
+        durations = np.diff(to_int_index(series.index)) / NS_PER_HOUR
+        return cls(compression).update(series.to_numpy()[:-1], durations)
+
+    def update(self, values: ndarray, durations: ndarray) -> Self:
+        """
+        Adds values weighted by the duration in hours they hold. NaN values and
+        values without duration are skipped.
+
+        Returns:
+            The digest itself.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        durations = np.asarray(durations, dtype=np.float64)
+        valid = (durations > 0) & ~np.isnan(values)
+        if not valid.all():
+            values = values[valid]
+            durations = durations[valid]
+        if len(values) == 0:
+            return self
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._buffer.append((values, durations, np.ones(len(values), dtype=bool)))
+        self._size += len(values)
+        if self._size > BUFFER_FACTOR * self.compression:
+            self._compress()
+        return self
+
+    def merge(self, other: "DurationDigest") -> "DurationDigest":
+        """
+        Merges two digests into a new one that describes the union of their data.
+        """
+        res = DurationDigest(max(self.compression, other.compression))
+        res.min = min(self.min, other.min)
+        res.max = max(self.max, other.max)
+        for digest in [self, other]:
+            digest._compress()
+            res._buffer.append((digest._means, digest._weights, digest._exact))
+        res._compress()
+        return res
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        means = np.concatenate([self._means] + [b[0] for b in self._buffer])
+        weights = np.concatenate([self._weights] + [b[1] for b in self._buffer])
+        exact = np.concatenate([self._exact] + [b[2] for b in self._buffer])
+        order = np.argsort(means, kind="stable")
+        self._means, self._weights, self._exact = compress_centroids(
+            means[order], weights[order], exact[order], self.compression
+        )
+        self._buffer = []
+        self._size = 0
+
+    def centroids(self) -> tuple[ndarray, ndarray]:
+        """
+        Returns the means and weights (durations) of the centroids in ascending order.
+        """
+        self._compress()
+        return self._means, self._weights
+
+    @property
+    def total_duration(self) -> float:
+        """
+        The total duration of all added values in hours.
+        """
+        return float(self.centroids()[1].sum())
+
+    def _interpolation_points(self) -> tuple[ndarray, ndarray]:
+        # The value of an exact centroid holds over its whole weight, the value of
+        # any other centroid is assumed at its center of mass. The minimum and
+        # maximum bound the distribution on both sides.
+        means, weights = self.centroids()
+        left = np.cumsum(weights) - weights
+        spread = np.where(self._exact, 0, weights / 2)
+        points = np.column_stack([left + spread, left + weights - spread]).ravel()
+        durations = np.concatenate([[0.0], points, [weights.sum()]])
+        values = np.concatenate([[self.min], np.repeat(means, 2), [self.max]])
+        return durations, values
+
+    def quantile(self, q: float | Sequence[float]) -> float | ndarray:
+        """
+        Returns the duration weighted quantiles, i.e. the values that are not
+        exceeded during the given share of the total duration. NaN if the digest is
+        empty.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if ((q < 0) | (q > 1)).any():
+            raise ValueError(f"Quantiles must be within [0, 1], got {q}")
+        if len(self.centroids()[0]) == 0:
+            res = np.full(q.shape, np.nan)
+        else:
+            durations, values = self._interpolation_points()
+            res = np.interp(q * durations[-1], durations, values)
+        return float(res) if res.ndim == 0 else res
+
+    def cdf(self, x: float | Sequence[float]) -> float | ndarray:
+        """
+        Returns the share of the total duration the values are at or below x.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if len(self.centroids()[0]) == 0:
+            res = np.full(x.shape, np.nan)
+        else:
+            durations, values = self._interpolation_points()
+            res = np.interp(x, values, durations) / durations[-1]
+        return float(res) if res.ndim == 0 else res
+
+    def exceedance(self, x: float | Sequence[float]) -> float | ndarray:
+        """
+        Returns the duration in hours the values exceed x.
+        """
+        return (1 - self.cdf(x)) * self.total_duration
+
+    def duration_curve(self, resolution: float = 1.0) -> Series:
+        """
+        Returns the duration curve, which holds the values sorted in descending order
+        over the duration in hours they are exceeded. Each step of the given
+        resolution in hours holds the value at its center.
+        """
+        total = self.total_duration
+        durations = np.arange(0, total, resolution)
+        shares = 1 - np.minimum(durations + resolution / 2, total) / total
+        values = self.quantile(shares) if len(durations) else np.empty(0)
+        return Series(values, index=Index(durations, name="duration"))
+
+
+class DurationDigestStream:
+    """
+    Builds duration weighted digests per entity and column of event discrete data
+    that is read in chunks, e.g. via `pd.read_csv(..., chunksize=...)`. Only the
+    digests and the last event of each entity are kept in memory. The last event of
+    an entity is added once its duration is known, which is either with its next
+    event or at the end of the stream (see `finish`).
+
+    The events of an entity may be spread over several chunks but need to be in
+    chronological order across chunks.
+    """
+
+    def __init__(
+        self, columns: Sequence[str], compression: float = DEFAULT_COMPRESSION
+    ):
+        self.columns = list(columns)
+        self.compression = compression
+        self.digests: dict[str, dict[Hashable, DurationDigest]] = {
+            column: {} for column in self.columns
+        }
+        self.end: int | None = None
+        self._last: dict[Hashable, tuple[int, ndarray]] = {}
+
+    def update(
+        self,
+        keys: Sequence[Hashable],
+        times: Sequence[datetime] | Index,
+        values: ndarray,
+    ):
+        """
+        Adds a chunk of events.
+
+        Args:
+            keys: The entity of each event.
+            times: The time of each event.
+            values: Array of shape (events, columns) holding the values of each event.
+        """
+        if len(keys) == 0:
+            return
+        codes, uniques = pd.factorize(np.asarray(keys, dtype=object))
+        times = to_int_index(to_naive_index(times))
+        values = np.asarray(values, dtype=np.float64).reshape(len(codes), -1)
+        order = np.lexsort((times, codes))
+        codes, times, values = codes[order], times[order], values[order]
+        self.end = max(times.max(), self.end) if self.end is not None else times.max()
+
+        durations = np.diff(times) / NS_PER_HOUR
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(codes)) + 1])
+        stops = np.concatenate([starts[1:], [len(codes)]])
+        for start, stop in zip(starts, stops):
+            key = uniques[codes[start]]
+            last = self._last.get(key)
+            if last is not None and times[start] < last[0]:
+                raise ValueError(
+                    f"Events of {key} are not in chronological order across chunks"
+                )
+            for col, column in enumerate(self.columns):
+                digest = self.digests[column].get(key)
+                if digest is None:
+                    digest = DurationDigest(self.compression)
+                    self.digests[column][key] = digest
+                if last is not None:
+                    digest.update(
+                        last[1][col : col + 1],
+                        np.array([(times[start] - last[0]) / NS_PER_HOUR]),
+                    )
+                digest.update(
+                    values[start : stop - 1, col], durations[start : stop - 1]
+                )
+            self._last[key] = (times[stop - 1], values[stop - 1])
+
+    def finish(
+        self, end: datetime | None = None
+    ) -> dict[str, dict[Hashable, DurationDigest]]:
+        """
+        Adds the last event of each entity, which holds until the given end or the
+        latest event of the stream.
+
+        Returns:
+            The digests per column and entity.
+        """
+        end_ns = to_int_index(to_naive_index(end))[0] if end else self.end
+        for key, (time, values) in self._last.items():
+            for col, column in enumerate(self.columns):
+                self.digests[column][key].update(
+                    values[col : col + 1], np.array([(end_ns - time) / NS_PER_HOUR])
+                )
+        self._last = {}
+        return self.digests
@@ -0,0 +1,208 @@
+from datetime import datetime
+from typing import Hashable, Mapping, Self, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy import ndarray
+from pandas import DataFrame, Index
+
+from pypsdm.processing.dataframe import to_int_index, to_naive_index
+from pypsdm.processing.numba import NS_PER_HOUR
+
+# group code of entities that are not part of any group
+NO_GROUP = -1
+
+
+class EventAggregationStream:
+    """
+    Aggregates event discrete data that is read in chunks, e.g. via
+    `pd.read_csv(..., chunksize=...)`, so the memory is bounded by the chunk size
+    instead of the length of the data. Only the last event of each entity is carried
+    across chunk boundaries, since each value holds until the next event of its
+    entity.
+
+    The stream gathers the integral of each entity (see `integrate_2d_arrays`) and
+    the sum over all entities as well as over groups of entities as event discrete
+    data. The sums are gathered as changes of the summed value at each event, which
+    are partial aggregates that are merged by adding them up.
+
+    The events of an entity may be spread over several chunks but need to be in
+    chronological order across chunks.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        groups: Mapping[Hashable, Hashable] | None = None,
+    ):
+        """
+        Args:
+            columns: The names of the value columns.
+            groups: Optional mapping of entities to the group they are summed up in.
+        """
+        self.columns = list(columns)
+        self.groups = groups if groups is not None else {}
+        self.end: int | None = None
+        self.keys: list[Hashable] = []
+        self._ids: dict[Hashable, int] = {}
+        self._group_codes: dict[Hashable, int] = {}
+        self._group = np.empty(0, dtype=np.int64)
+        self._last_time = np.empty(0, dtype=np.int64)
+        self._last_values = np.empty((0, len(self.columns)))
+        self._has_last = np.empty(0, dtype=bool)
+        self.total = np.empty((0, len(self.columns)))
+        self.positive = np.empty((0, len(self.columns)))
+        self.negative = np.empty((0, len(self.columns)))
+        self._deltas: list[DataFrame] = []
+        self._pending = 0
+        self._aggregated = 0
+
+    def _register(self, keys: ndarray) -> ndarray:
+        new = [key for key in keys if key not in self._ids]
+        if new:
+            for key in new:
+                self._ids[key] = len(self.keys)
+                self.keys.append(key)
+            groups = [
+                (
+                    self._group_codes.setdefault(
+                        self.groups[key], len(self._group_codes)
+                    )
+                    if key in self.groups
+                    else NO_GROUP
+                )
+                for key in new
+            ]
+            n, cols = len(new), len(self.columns)
+            self._group = np.concatenate([self._group, groups])
+            self._last_time = np.concatenate([self._last_time, np.zeros(n, np.int64)])
+            self._last_values = np.vstack([self._last_values, np.zeros((n, cols))])
+            self._has_last = np.concatenate([self._has_last, np.zeros(n, bool)])
+            self.total = np.vstack([self.total, np.zeros((n, cols))])
+            self.positive = np.vstack([self.positive, np.zeros((n, cols))])
+            self.negative = np.vstack([self.negative, np.zeros((n, cols))])
+        return np.array([self._ids[key] for key in keys], dtype=np.int64)
+
+    def update(
+        self,
+        keys: Sequence[Hashable],
+        times: Sequence[datetime] | Index,
+        values: ndarray,
+    ):
+        """
+        Adds a chunk of events.
+
+        Args:
+            keys: The entity of each event.
+            times: The time of each event.
+            values: Array of shape (events, columns) holding the values of each event.
+        """
+        if len(keys) == 0:
+            return
+        codes, uniques = pd.factorize(np.asarray(keys, dtype=object))
+        ids = self._register(uniques)[codes]
+        times = to_int_index(to_naive_index(times))
+        values = np.asarray(values, dtype=np.float64).reshape(len(ids), -1)
+        order = np.lexsort((times, ids))
+        ids, times, values = ids[order], times[order], values[order]
+        self.end = max(times.max(), self.end) if self.end is not None else times.max()
+
+        # The predecessor of each event is the previous event of its entity, which is
+        # the carried last event for the first event of each entity in this chunk.
+        first = np.flatnonzero(np.concatenate([[True], ids[1:] != ids[:-1]]))
+        last = np.concatenate([first[1:], [len(ids)]]) - 1
+        prev_time = np.concatenate([[0], times[:-1]])
+        prev_values = np.vstack([values[:1], values[:-1]])
+        has_prev = np.ones(len(ids), dtype=bool)
+        prev_time[first] = self._last_time[ids[first]]
+        prev_values[first] = self._last_values[ids[first]]
+        has_prev[first] = self._has_last[ids[first]]
+        if (has_prev[first] & (times[first] < prev_time[first])).any():
+            raise ValueError("Events are not in chronological order across chunks")
+
+        # NaN values are skipped by the integrals and sums
+        prev_values = np.where(has_prev[:, np.newaxis], prev_values, 0)
+        prev_values = np.nan_to_num(prev_values)
+        durations = np.where(has_prev, times - prev_time, 0) / NS_PER_HOUR
+        self._integrate(ids, prev_values, durations)
+        self._add_deltas(ids, times, np.nan_to_num(values) - prev_values)
+
+        self._last_time[ids[last]] = times[last]
+        self._last_values[ids[last]] = values[last]
+        self._has_last[ids[last]] = True
+
+    def _integrate(self, ids: ndarray, values: ndarray, durations: ndarray):
+        area = values * durations[:, np.newaxis]
+        n = len(self.keys)
+        for col in range(len(self.columns)):
+            self.total[:, col] += np.bincount(ids, area[:, col], n)
+            positive = np.where(values[:, col] > 0, area[:, col], 0)
+            self.positive[:, col] += np.bincount(ids, positive, n)
+            self.negative[:, col] += np.bincount(ids, area[:, col] - positive, n)
+
+    def _add_deltas(self, ids: ndarray, times: ndarray, deltas: ndarray):
+        partial = DataFrame(deltas, columns=self.columns)
+        partial["group"] = self._group[ids]
+        partial["time"] = times
+        self._deltas.append(partial.groupby(["group", "time"]).sum())
+        self._pending += len(self._deltas[-1])
+        # merge the partial aggregates once they outgrow the merged ones
+        if self._pending > self._aggregated:
+            self._merge_deltas()
+
+    def _merge_deltas(self):
+        if len(self._deltas) > 1:
+            self._deltas = [pd.concat(self._deltas).groupby(level=[0, 1]).sum()]
+        self._aggregated = len(self._deltas[0]) if self._deltas else 0
+        self._pending = 0
+
+    def finish(self, end: datetime | None = None) -> Self:
+        """
+        Adds the last event of each entity, which holds until the given end or the
+        latest event of the stream.
+        """
+        if self.end is None:
+            return self
+        end_ns = to_int_index(to_naive_index(end))[0] if end else self.end
+        ids = np.flatnonzero(self._has_last)
+        values = np.nan_to_num(self._last_values[ids])
+        self._integrate(ids, values, (end_ns - self._last_time[ids]) / NS_PER_HOUR)
+        # the sums end with the stream as well
+        self._add_deltas(
+            ids, np.full(len(ids), end_ns), np.zeros((len(ids), len(self.columns)))
+        )
+        self._has_last[:] = False
+        self.end = end_ns
+        self._merge_deltas()
+        return self
+
+    def _cumulate(self, deltas: DataFrame) -> DataFrame:
+        deltas = deltas.groupby(level="time").sum().sort_index()
+        index = pd.DatetimeIndex(deltas.index.to_numpy().astype("datetime64[ns]"))
+        return DataFrame(
+            deltas.cumsum().to_numpy(), index=index.rename("time"), columns=self.columns
+        )
+
+    def sum(self) -> DataFrame:
+        """
+        Returns the sum over all entities as event discrete data.
+        """
+        self._merge_deltas()
+        if not self._deltas:
+            return DataFrame(columns=self.columns, index=pd.DatetimeIndex([]))
+        return self._cumulate(self._deltas[0])
+
+    def group_sums(self) -> dict[Hashable, DataFrame]:
+        """
+        Returns the sum over the entities of each group as event discrete data.
+        """
+        self._merge_deltas()
+        if not self._deltas:
+            return {}
+        deltas = self._deltas[0]
+        groups = deltas.index.get_level_values("group")
+        return {
+            group: self._cumulate(deltas[groups == code])
+            for group, code in self._group_codes.items()
+            if (groups == code).any()
+        }
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pypsdm.analysis.power_flow import PowerFlowStore, power_flow
+from pypsdm.models.gwr import GridWithResults
+from pypsdm.models.input.container.grid import GridContainer
+from pypsdm.models.ts.types import ComplexPower, ComplexPowerDict
+
+
+@pytest.fixture(scope="module")
+def gwr(input_path_sb, result_path_sb) -> GridWithResults:
+    return GridWithResults.from_csv(input_path_sb, result_path_sb)
+
+
+@pytest.fixture(scope="module")
+def simple_grid(input_path_sg) -> GridContainer:
+    return GridContainer.from_csv(input_path_sg)
+
+
+def test_power_flow_reproduces_results(gwr: GridWithResults):
+    nodal_power = gwr.participants_res.nodal_power(gwr.participants)
+    res = gwr.raw_grid.power_flow(nodal_power)
+    assert res.converged
+    assert len(res.nodes) == len(gwr.nodes)
+    assert len(res.lines) == len(gwr.lines)
+
+    # the results of a time step are based on the power of the previous one
+    for key, ts in gwr.nodes_res.items():
+        expected = ts.data.iloc[1:]
+        actual = res.nodes[key].data.shift(1).loc[expected.index]
+        assert np.allclose(actual.v_mag, expected.v_mag, atol=1e-8)
+        assert np.allclose(actual.v_ang, expected.v_ang, atol=1e-6)
+    for key, ts in gwr.lines_res.items():
+        expected = ts.data.iloc[1:]
+        actual = res.lines[key].data.shift(1).loc[expected.index]
+        assert np.allclose(actual.i_a_mag, expected.i_a_mag, atol=1e-6)
+        assert np.allclose(actual.i_b_mag, expected.i_b_mag, atol=1e-6)
+
+
+def test_power_flow_sweep(simple_grid: GridContainer):
+    raw_grid = simple_grid.raw_grid
+    rng = np.random.default_rng(1)
+    index = pd.date_range("2021-01-01", periods=24, freq="h")
+    nodal_power = ComplexPowerDict(
+        {
+            uuid: ComplexPower(
+                pd.DataFrame(
+                    {"p": rng.uniform(-0.05, 0.1, 24), "q": rng.uniform(0, 0.02, 24)},
+                    index=index,
+                )
+            )
+            for uuid in raw_grid.nodes.data[~raw_grid.nodes.slack].index
+        }
+    )
+    newton_raphson = raw_grid.power_flow(nodal_power)
+    sweep = raw_grid.power_flow(nodal_power, method="sweep", tolerance=1e-12)
+    assert newton_raphson.converged and sweep.converged
+    for key, ts in newton_raphson.nodes.items():
+        assert np.allclose(ts.data, sweep.nodes[key].data, atol=1e-8)
+    for key, ts in newton_raphson.lines.items():
+        assert np.allclose(ts.i_a_mag, sweep.lines[key].i_a_mag, atol=1e-6)
+
+
+@pytest.mark.parametrize("method", ["newton_raphson", "zbus", "sweep"])
+def test_power_flow_diverging_time_step(simple_grid: GridContainer, method: str):
+    raw_grid = simple_grid.raw_grid
+    index = pd.date_range("2021-01-01", periods=3, freq="h")
+    nodal_power = ComplexPowerDict(
+        {
+            uuid: ComplexPower(
+                pd.DataFrame({"p": [0.05, 1e4, 0.05], "q": 0.0}, index=index)
+            )
+            for uuid in raw_grid.nodes.data[~raw_grid.nodes.slack].index
+        }
+    )
+    for chunk_size in (3, 1):
+        res = power_flow(raw_grid, nodal_power, method=method, chunk_size=chunk_size)
+        iterations = res.iterations.tolist()
+        assert iterations[1] == -1
+        # the failed time step neither spoils the following one nor its results
+        assert iterations[2] == iterations[0] >= 0
+        for ts in res.nodes.values():
+            assert ts.data.iloc[1].isna().all()
+            assert np.allclose(ts.data.iloc[2], ts.data.iloc[0])
+
+
+def test_power_flow_sweep_meshed(gwr: GridWithResults):
+    nodal_power = gwr.participants_res.nodal_power(gwr.participants)
+    with pytest.raises(ValueError):
+        gwr.raw_grid.power_flow(nodal_power, method="sweep")
+
+
+def test_power_flow_zbus(gwr: GridWithResults):
+    nodal_power = gwr.participants_res.nodal_power(gwr.participants)
+    newton_raphson = gwr.raw_grid.power_flow(nodal_power)
+    zbus = gwr.raw_grid.power_flow(nodal_power, method="zbus")
+    assert zbus.converged
+    for key, ts in newton_raphson.nodes.items():
+        assert np.allclose(ts.data, zbus.nodes[key].data, atol=1e-8)
+
+
+def test_batch_power_flow(gwr: GridWithResults, simple_grid: GridContainer, tmp_path):
+    nodal_power = gwr.participants_res.nodal_power(gwr.participants)
+    scenarios = {
+        "base": nodal_power,
+        "scaled": ComplexPowerDict({k: v * 1.5 for k, v in nodal_power.items()}),
+    }
+    store = gwr.raw_grid.batch_power_flow(
+        scenarios, tmp_path, chunk_size=100, max_workers=2
+    )
+    reopened = PowerFlowStore.open(tmp_path, gwr.raw_grid)
+    with pytest.raises(ValueError):
+        PowerFlowStore.open(tmp_path, simple_grid.raw_grid)
+    assert reopened.scenarios == ["base", "scaled"]
+    assert reopened.times.equals(store.times)
+    for scenario, power in scenarios.items():
+        expected = gwr.raw_grid.power_flow(power, method="zbus")
+        actual = reopened.result(scenario)
+        assert actual.converged
+        for key, ts in expected.nodes.items():
+            assert np.allclose(ts.data, actual.nodes[key].data, atol=1e-8)
+        for key, ts in expected.lines.items():
+            assert np.allclose(ts.data, actual.lines[key].data, atol=1e-6)
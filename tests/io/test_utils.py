@@ -1,8 +1,9 @@
 from datetime import datetime
 
+import numpy as np
 import pytest
 
-from pypsdm.io.utils import DateTimePattern, check_filter
+from pypsdm.io.utils import DateTimePattern, check_filter, read_csv
 
 
 def test_check_filter_both_dates_provided_valid():
@@ -49,3 +50,11 @@ def test_date_time_pattern():
         DateTimePattern.UTC_TIME_PATTERN_EXTENDED.value
     )
     assert datetime_str == datetime_str_b
+
+
+def test_read_csv_float_dtype(result_path_sb):
+    data = read_csv(result_path_sb, "transformer_2_w_res.csv", float_dtype="float32")
+    assert data["i_a_mag"].dtype == np.float32
+    assert data["tap_pos"].dtype == np.int64
+    expected = read_csv(result_path_sb, "transformer_2_w_res.csv")
+    np.testing.assert_allclose(data["i_a_mag"], expected["i_a_mag"], rtol=1e-7)
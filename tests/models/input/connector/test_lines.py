@@ -4,6 +4,7 @@ import os
 import numpy as np
 import pandas as pd
 import pytest
+from scipy import sparse
 
 from pypsdm.models.input.connector.lines import Lines
 from pypsdm.models.input.container.grid import GridContainer
@@ -143,7 +144,7 @@ def test_admittance_matrix(simple_grid):
         "6a4547a8-630b-46e4-8144-9cd649e67c07": 4,
     }
 
-    Y = simple_grid.lines.admittance_matrix(uuid_idx)
+    Y = simple_grid.lines.admittance_matrix(uuid_idx, dense=True)
 
     # SIMONA pu result
     nom_imp = 0.266666666666666
@@ -157,3 +158,25 @@ def test_admittance_matrix(simple_grid):
     expected = [x / nom_imp for x in first_row]
 
     assert np.allclose(Y[0], expected)
+
+
+def test_admittance_matrix_parallel_devices(simple_grid):
+    lines = simple_grid.lines
+    uuid_idx = {uuid: idx for idx, uuid in enumerate(simple_grid.nodes.uuid)}
+    Y = lines.admittance_matrix(uuid_idx)
+    assert sparse.issparse(Y)
+
+    data = lines.data.copy()
+    data["parallel_devices"] = 2
+    Y_parallel = Lines(data).admittance_matrix(uuid_idx)
+    assert np.allclose(Y_parallel.toarray(), 2 * Y.toarray())
+
+
+def test_admittance_matrix_per_unit(simple_grid):
+    lines = simple_grid.lines
+    uuid_idx = {uuid: idx for idx, uuid in enumerate(simple_grid.nodes.uuid)}
+    Y = lines.admittance_matrix(uuid_idx, dense=True)
+    Y_pu = lines.admittance_matrix(uuid_idx, dense=True, per_unit=True)
+    v_rated = lines.v_rated.unique()
+    assert len(v_rated) == 1
+    assert np.allclose(Y_pu, Y * v_rated[0] ** 2)
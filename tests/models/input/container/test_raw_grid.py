@@ -3,6 +3,7 @@ from copy import deepcopy
 import pytest
 
 from pypsdm.errors import ComparisonError
+from pypsdm.models.enums import RawGridElementsEnum
 from pypsdm.models.input.container.raw_grid import RawGridContainer
 
 
@@ -29,6 +30,46 @@ def test_build_networkx_graph(raw_grid):
         assert G.edges[(line["node_a"], line["node_b"])]["weight"] == line["length"]
 
 
+def test_topology(raw_grid):
+    topology = raw_grid.topology
+    assert raw_grid.topology is topology
+    assert topology.n_nodes == len(raw_grid.nodes)
+
+    # lines and closed switches by default
+    adjacency = topology.adjacency()
+    G = raw_grid.build_networkx_graph()
+    assert adjacency.nnz == 2 * len(G.edges)
+    for a, b in G.edges:
+        i, j = topology.index([a, b])
+        assert adjacency[i, j] == 1
+
+    slack = topology.index(raw_grid.nodes.get_slack_nodes().uuid)[0]
+    assert len(topology.neighbors(slack)) == 0
+    transformers = topology.edge_mask([RawGridElementsEnum.TRANSFORMER_2_W])
+    downstream = topology.neighbors(slack, transformers)
+    assert topology.nodes[downstream].tolist() == [raw_grid.find_slack_downstream()]
+
+
+def test_topology_follows_data(input_path_sb):
+    raw_grid = RawGridContainer.from_csv(input_path_sb)
+    topology = raw_grid.topology
+    n_edges = len(raw_grid.build_networkx_graph().edges)
+    switch = raw_grid.switches.data.index[~raw_grid.switches.closed][0]
+
+    # copies don't share the cache with the original
+    copied = deepcopy(raw_grid)
+    copied.switches.data.loc[switch, "closed"] = True
+    assert copied.topology.closed.sum() == topology.closed.sum() + 1
+    assert raw_grid.topology is topology
+
+    # in place edits rebuild the topology once invalidated
+    raw_grid.switches.data.loc[switch, "closed"] = True
+    assert raw_grid.topology is topology
+    raw_grid.invalidate_topology()
+    assert raw_grid.topology is not topology
+    assert len(raw_grid.build_networkx_graph().edges) == n_edges + 1
+
+
 def test_create_empty():
     empty_container = RawGridContainer.empty()
     if empty_container:
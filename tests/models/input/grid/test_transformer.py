@@ -81,7 +81,7 @@ def test_admittance_matrix(trafo: Transformers2W):
         "6a4547a8-630b-46e4-8144-9cd649e67c07": 4,
     }
 
-    Y = trafo.admittance_matrix(uuid_idx)
+    Y = trafo.admittance_matrix(uuid_idx, dense=True)
 
     # SIMONA pu result
     nom_imp = 0.266666666666666
@@ -1,8 +1,15 @@
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
+import pytest
 
-from pypsdm.models.enums import EntitiesEnum
+from pypsdm.models.enums import (
+    EntitiesEnum,
+    RawGridElementsEnum,
+    SystemParticipantsEnum,
+)
+from pypsdm.models.input.container.grid import GridContainer
 from pypsdm.models.result.container.grid import GridResultContainer
 from pypsdm.models.result.container.participants import (
     SystemParticipantsResultContainer,
@@ -84,3 +91,79 @@ def test_interval():
             assert r.data.index[-1] <= end
             assert len(r) == 2
     assert grid[start:end] == filt
+
+
+def test_states_at():
+    grid = get_container()
+    times = [datetime(2021, 1, 2, 12), datetime(2021, 1, 4)]
+    states = grid.states_at(times)
+    assert set(states.keys()) == set(grid.raw_grid.to_dict().keys()) | set(
+        grid.participants.to_dict().keys()
+    )
+    nodes = states[RawGridElementsEnum.NODE]
+    assert set(nodes.keys()) == set(grid.nodes["a"].data.columns)
+    assert list(nodes["v_mag"].loc["a"]) == [1.0, 3.0]
+
+
+def test_copy_shares_data():
+    grid = get_container()
+    copied = grid.copy()
+    assert copied == grid
+    usage = grid.memory_usage(copied)
+    assert usage["unique"] == grid.memory_usage()["unique"]
+    assert usage["shared"] == usage["total"] / 2
+
+
+def test_from_csv_drop_unchanged(result_path_sb):
+    grid = GridResultContainer.from_csv(result_path_sb)
+    dropped = GridResultContainer.from_csv(result_path_sb, drop_unchanged=True)
+    assert len(dropped.nodes) == len(grid.nodes)
+    # the voltage of the slack node never changes, only its first and last row
+    # are kept, all other nodes change with every row
+    slack = "b0bbd85c-6540-4418-b083-455daed681bd"
+    for key, ts in grid.nodes.items():
+        if key.uuid == slack:
+            assert len(ts) == 145
+            assert dropped.nodes[key].data.index.equals(ts.data.index[[0, -1]])
+        else:
+            assert dropped.nodes[key].data.index.equals(ts.data.index)
+    # the states at the original timestamps are unchanged
+    times = list(grid.nodes[slack].data.index)
+    expected = grid.nodes.states_at(times)
+    for attribute, states in dropped.nodes.states_at(times).items():
+        pd.testing.assert_frame_equal(states, expected[attribute])
+    grid.loads.compare(dropped.loads, atol=0, rtol=0)
+    grid.nodes.compare(dropped.nodes, atol=0, rtol=0)
+
+
+def test_aggregate_from_csv(input_path_sb, result_path_sb):
+    grid = GridContainer.from_csv(input_path_sb)
+    results = GridResultContainer.from_csv(result_path_sb, grid_container=grid)
+    aggregates = GridResultContainer.aggregate_from_csv(
+        result_path_sb, grid_container=grid, chunksize=1000
+    )
+    participants = results.participants
+
+    energies = participants.energies()
+    assert aggregates.energies().keys() == energies.keys()
+    for sp_type, energy in aggregates.energies().items():
+        assert energy == pytest.approx(energies[sp_type])
+    expected = participants.load_and_generation_energies()
+    for sp_type, (
+        load,
+        generation,
+    ) in aggregates.load_and_generation_energies().items():
+        assert load == pytest.approx(expected[sp_type][0])
+        assert generation == pytest.approx(expected[sp_type][1])
+    pd.testing.assert_frame_equal(
+        aggregates.entity_energies[SystemParticipantsEnum.LOAD].sort_index(),
+        participants.loads.energies().sort_index(),
+    )
+
+    p_sum = participants.p_sum()
+    assert aggregates.p_sum().index.equals(p_sum.index)
+    assert np.allclose(aggregates.p_sum(), p_sum)
+
+    node = next(iter(aggregates.nodal_power.keys()))
+    nodal = participants.subset(grid.node_participants_map[node].uuids()).p_sum()
+    assert np.allclose(aggregates.nodal_power[node].p.reindex(nodal.index), nodal)
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 from pypsdm.models.result.participant.dict import LoadsResult
@@ -66,3 +67,30 @@ def test_to_csv(tmp_path):
     loads.to_csv(tmp_path)
     loads_b = LoadsResult.from_csv(tmp_path)
     assert loads == loads_b
+
+
+def test_duration_digests_from_csv(tmp_path):
+    data_str = """
+time,p,q,uuid,input_model
+2021-01-01 00:00:00,0.0,0.0,a,a
+2021-01-02 00:00:00,1.0,-1.0,a,a
+2021-01-01 00:00:00,2.0,0.0,b,b
+2021-01-03 00:00:00,-2.0,2.0,a,a
+2021-01-02 00:00:00,4.0,0.0,b,b
+2021-01-04 00:00:00,3.0,3.0,a,a
+"""
+    with open(tmp_path / "load_res.csv", "w") as f:
+        f.write(data_str)
+    loads = LoadsResult.from_csv(tmp_path)
+    digests = LoadsResult.duration_digests_from_csv(tmp_path, chunksize=2)
+    assert set(digests.keys()) == {"p", "q"}
+    expected = loads.duration_digests(["p", "q"])
+    for attribute in ["p", "q"]:
+        pd.testing.assert_frame_equal(
+            digests[attribute].quantiles([0, 0.5, 0.9]),
+            expected[attribute].quantiles([0, 0.5, 0.9]),
+        )
+    exceedance = digests["p"].exceedance(3.5)
+    assert np.allclose(exceedance[["a", "b"]], [0.0, 48.0])
+    curves = digests["p"].duration_curves(resolution=24)
+    assert list(curves["a"]) == [1.0, 0.0, -2.0]
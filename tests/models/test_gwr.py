@@ -4,7 +4,11 @@ from datetime import datetime
 
 import pytest
 
+from pypsdm.models.enums import RawGridElementsEnum
 from pypsdm.models.gwr import GridWithResults
+from pypsdm.models.result.container.grid import GridResultContainer
+from pypsdm.models.result.container.raw_grid import RawGridResultContainer
+from pypsdm.models.ts.base import entity_names
 
 
 @pytest.fixture(scope="module")
@@ -85,3 +89,40 @@ def test_build_extended_nodes_result(gwr):
             continue
         p_delta = (expected.p - actual.p).abs()
         assert (p_delta < 1e-8).all(), f"Unexpected deviation for {uuid}"
+
+
+def test_build_extended_nodes_result_chunked(gwr):
+    expected = gwr.build_extended_nodes_result()
+    chunked = gwr.build_extended_nodes_result(chunk_size=3)
+    parallel = gwr.build_extended_nodes_result(
+        chunk_size=3, parallel=True, max_workers=2
+    )
+    assert chunked == expected
+    assert parallel == expected
+
+
+def test_build_extended_nodes_result_missing_node(gwr):
+    expected = gwr.build_extended_nodes_result()
+    uuids = entity_names(gwr.nodes_res.keys(), favor_ids=False)
+    keys = list(gwr.nodes_res.keys())
+    uuid_to_idx = {uuid: idx for idx, uuid in enumerate(gwr.nodes.uuid.to_list())}
+    Y = gwr.raw_grid.admittance_matrix(uuid_to_idx).tocsr()
+    missing = uuid_to_idx[uuids[0]]
+    neighbours = {
+        gwr.nodes.uuid.iloc[idx] for idx in Y[[missing]].indices if idx != missing
+    }
+    assert neighbours
+    results = GridResultContainer(
+        raw_grid=RawGridResultContainer(
+            {RawGridElementsEnum.NODE: gwr.nodes_res.subset(keys[1:])}
+        ),
+        participants=gwr.participants_res,
+    )
+    ext_nodes_res = GridWithResults(gwr.grid, results).build_extended_nodes_result()
+    assert len(ext_nodes_res) == len(keys) - 1
+    for key, uuid in zip(keys[1:], uuids[1:]):
+        data = ext_nodes_res[key].data[["p", "q"]]
+        if uuid in neighbours:
+            assert data.isna().all().all()
+        else:
+            assert data.equals(expected[key].data[["p", "q"]])
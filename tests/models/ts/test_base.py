@@ -1,10 +1,18 @@
+import copy
+import pickle
+from dataclasses import FrozenInstanceError
 from datetime import datetime
 
 import pandas as pd
 import pytest
 
 from pypsdm.errors import ComparisonError
-from pypsdm.models.ts.base import TIME_COLUMN_NAME, TimeSeries, TimeSeriesDict
+from pypsdm.models.ts.base import (
+    TIME_COLUMN_NAME,
+    EntityKey,
+    TimeSeries,
+    TimeSeriesDict,
+)
 
 
 def get_sample_data():
@@ -37,6 +45,21 @@ def test_preprocess_data():
     assert result["p"][-1] == 1
 
 
+def test_operators():
+    a = TimeSeries(get_sample_data())
+    data = get_sample_data().iloc[1:]
+    data["p"] = [2.0, 2.0, 1.0]
+    b = TimeSeries(data)
+
+    assert (a + b).data["p"].tolist() == [0.0, 3.0, 4.0, 4.0]
+    assert (a - b).data["p"].tolist() == [0.0, -1.0, 0.0, 2.0]
+    assert (a * b).data["p"].tolist() == [0.0, 2.0, 4.0, 3.0]
+    assert (a / b).data["p"].tolist()[1:] == [0.5, 1.0, 3.0]
+    assert a.maximum(b).data["p"].tolist() == [0.0, 2.0, 2.0, 3.0]
+    with pytest.raises(TypeError):
+        a + 1
+
+
 def test_interval():
     data = get_sample_data()
     ts = TimeSeries(data)
@@ -59,6 +82,26 @@ def test_interval():
     assert result == ts[start:end]
 
 
+def test_from_preprocessed():
+    ts = TimeSeries(get_sample_data())
+    wrapped = TimeSeries.from_preprocessed(ts.data)
+    assert wrapped == ts
+    assert wrapped.data is ts.data
+    assert TimeSeries.from_preprocessed(ts.data.iloc[:0]) == TimeSeries.empty()
+
+    start, end = datetime(2021, 1, 1, 12), datetime(2021, 1, 2, 12)
+    expected = TimeSeries(
+        pd.DataFrame(
+            {"p": [0, 1]},
+            index=pd.DatetimeIndex(
+                [start, datetime(2021, 1, 2)], name=TIME_COLUMN_NAME
+            ),
+        ),
+        end,
+    )
+    assert ts.interval(start, end) == expected
+
+
 def test_eq():
     data = get_sample_data()
     ts = TimeSeries(data)
@@ -91,6 +134,119 @@ def test_dct_interval():
         assert len(result[key]) == 2
 
 
+def test_dct_interval_shared_index():
+    dct = get_sample_dict()
+    shared = dct["a"].data.index
+    for ts in dct.values():
+        ts.data.index = shared
+    dct["d"] = TimeSeries(get_sample_data().iloc[2:])
+
+    start, end = datetime(2021, 1, 2, 12), datetime(2021, 1, 3, 12)
+    result = dct.interval(start, end)
+    for key in ["a", "b", "c", "d"]:
+        assert result[key] == dct[key].interval(start, end)
+    assert result["a"].data.index[0] == pd.Timestamp(start)
+    assert result["d"].data.index[0] == pd.Timestamp("2021-01-03")
+
+
+def test_getitem_datetimes():
+    ts = TimeSeries(get_sample_data())
+    result = ts[datetime(2021, 1, 2, 12)]
+    assert len(result) == 1
+    assert result.data.index[0] == pd.Timestamp("2021-01-02 12:00")
+    assert result.data["p"].iloc[0] == 1
+
+    times = [datetime(2020, 12, 31), datetime(2021, 1, 3), datetime(2021, 1, 5)]
+    result = ts[times]
+    assert list(result.data.index) == [
+        pd.Timestamp("2021-01-01"),
+        pd.Timestamp("2021-01-03"),
+        pd.Timestamp("2021-01-04"),
+    ]
+    assert list(result.data["p"]) == [0, 2, 3]
+
+
+def test_dct_filter_by_date_time():
+    dct = get_sample_dict()
+    times = [datetime(2021, 1, 1, 6), datetime(2021, 1, 3, 18)]
+    result = dct.filter_by_date_time(times)
+    for key in ["a", "b", "c"]:
+        assert result[key] == dct[key][times]
+        assert list(result[key].data["p"]) == [0, 2]
+
+
+def test_dct_states_at():
+    dct = get_sample_dict()
+    dct["d"] = TimeSeries(get_sample_data().iloc[2:])
+    times = [datetime(2021, 1, 1, 6), datetime(2021, 1, 3, 18), datetime(2021, 1, 5)]
+    states = dct.states_at(times)
+    assert list(states.keys()) == ["p"]
+    p = states["p"]
+    assert list(p.index) == ["a", "b", "c", "d"]
+    assert list(p.columns) == [pd.Timestamp(t) for t in times]
+    assert list(p.loc["a"]) == [0, 2, 3]
+    assert pd.isna(p.loc["d"].iloc[0])
+    assert list(p.loc["d"].iloc[1:]) == [2, 3]
+
+
+def test_dct_copy_shares_data():
+    dct = get_sample_dict()
+    copied = copy.deepcopy(dct)
+    usage = dct.memory_usage(copied)
+    assert usage["unique"] == dct.memory_usage()["unique"]
+    assert usage["shared"] == usage["total"] / 2
+
+    copied["a"].data.loc[copied["a"].data.index[0], "p"] = 10
+    assert dct["a"].data["p"].iloc[0] == 0
+    assert dct.memory_usage(copied)["shared"] < usage["shared"]
+
+
+def test_concat():
+    data = get_sample_data()
+    ts = TimeSeries(data)
+    a = TimeSeries(data.iloc[:2])
+    b = TimeSeries(data.iloc[1:])
+    assert a.concat(b) == ts
+    assert a.concat(TimeSeries.empty()) == a
+    result = get_sample_dict().concat(get_sample_dict())
+    assert result["a"] == ts
+
+
+def test_entity_key_interning():
+    key = EntityKey("uuid-a", "a")
+    assert EntityKey("uuid-a", "a") is key
+    assert EntityKey("uuid-a") is not key
+    assert EntityKey("uuid-a") == key == "uuid-a"
+    assert hash(key) == hash("uuid-a")
+    assert pickle.loads(pickle.dumps(key)) is key
+    assert copy.deepcopy(key) is key
+    assert not hasattr(key, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        key.name = "b"  # type: ignore
+
+
+def test_dct_lookup_by_name():
+    a, b, c = EntityKey("uuid-a", "a"), EntityKey("uuid-b", "b"), EntityKey("uuid-c")
+    dct = TimeSeriesDict(
+        {a: TimeSeries(get_sample_data()), b: TimeSeries(get_sample_data())}
+    )
+    assert dct["a"] is dct[a]
+    assert dct["uuid-b"] is dct[b]
+    assert dct.get_with_key("uuid-a") == (a, dct[a])
+    assert dct.get_with_key("b") == (b, dct[b])
+    assert dct.get_with_key(EntityKey("uuid-b"))[0].name == "b"
+    with pytest.raises(KeyError):
+        dct.get_with_key("c")
+
+    dct[c] = TimeSeries(get_sample_data())
+    assert dct.get_with_key("uuid-c")[0] is c
+    dct[EntityKey("uuid-d", "a")] = TimeSeries(get_sample_data())
+    with pytest.raises(ValueError):
+        dct["a"]
+    del dct["uuid-d"]
+    assert dct["a"] is dct[a]
+
+
 def test_compare():
     dct = get_sample_dict()
     dct2 = get_sample_dict()
@@ -99,3 +255,36 @@ def test_compare():
     # raises comparison error
     with pytest.raises(ComparisonError):
         dct.compare(dct2)
+
+
+def test_compare_tolerance():
+    dct = get_sample_dict()
+    dct2 = get_sample_dict()
+    data = get_sample_data()
+    data["p"] = data["p"] + 1e-3
+    dct2["b"] = TimeSeries(data)
+    with pytest.raises(ComparisonError) as e:
+        dct.compare(dct2)
+    assert list(e.value.differences[0].index) == ["b"]
+    assert dct.compare(dct2, atol=1e-2) is None
+
+    deviations = dct.deviations(dct2)
+    assert list(deviations.columns) == ["p", "mismatches"]
+    assert deviations.loc["b", "p"] == pytest.approx(1e-3)
+    assert list(deviations["mismatches"]) == [0, 4, 0]
+
+
+def test_deviations_column_union():
+    dct = get_sample_dict()
+    dct2 = get_sample_dict()
+    for d in (dct, dct2):
+        data = get_sample_data()
+        data["q"] = [0.0, 1.0, 2.0, 3.0]
+        d["b"] = TimeSeries(data)
+    data = get_sample_data()
+    data["q"] = [0.0, 1.0, 2.5, 3.0]
+    dct2["b"] = TimeSeries(data)
+    deviations = dct.deviations(dct2)
+    assert list(deviations.columns) == ["p", "q", "mismatches"]
+    assert deviations.loc["b", "q"] == pytest.approx(0.5)
+    assert list(deviations["mismatches"]) == [0, 1, 0]
@@ -1,6 +1,8 @@
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
+import pytest
 
 from pypsdm.db.weather.models import WeatherValue
 from pypsdm.models.ts.base import TIME_COLUMN_NAME, EntityKey
@@ -74,6 +76,91 @@ def test_mul():
     pd.testing.assert_series_equal(res.q, s.q * 0)
 
 
+def test_sum():
+    a = get_complex_power()
+    b = get_complex_power()
+    b.data.index = b.data.index + pd.Timedelta(hours=12)
+    c = get_complex_power() * 2
+    res = ComplexPower.sum([a, b, c])
+    expected = a + b + c
+    pd.testing.assert_frame_equal(res.data, expected.data, check_freq=False)
+
+    dct = ComplexPowerDict(
+        {EntityKey("a"): a, EntityKey("b"): b, EntityKey("c"): c},
+    )
+    pd.testing.assert_frame_equal(dct.sum().data, expected.data, check_freq=False)
+
+    assert ComplexPower.sum([]) == ComplexPower.empty()
+
+
+def test_dict_reductions():
+    dct = get_power_dict()
+    dct[EntityKey("b")] = dct[EntityKey("b")] * 2
+
+    res = dct.max()
+    assert isinstance(res, ComplexPower)
+    pd.testing.assert_frame_equal(
+        res.data, dct[EntityKey("a")].maximum(dct[EntityKey("b")]).data
+    )
+
+    res = dct.mean()
+    pd.testing.assert_frame_equal(res.data, (dct.sum() * (1 / 3)).data)
+
+
+def test_energies():
+    dct = get_power_dict()
+    dct[EntityKey("b")] = dct[EntityKey("b")] * 2
+    energies = dct.energies()
+
+    assert energies.index.tolist() == ["a", "b", "c"]
+    for key, ts in dct.items():
+        load, generation = ts.load_and_generation_energy()
+        assert energies.loc[key.uuid, "energy"] == ts.energy()
+        assert energies.loc[key.uuid, "load"] == load
+        assert energies.loc[key.uuid, "generation"] == generation
+        assert energies.loc[key.uuid, "reactive_energy"] == ts.reactive_energy()
+    assert dct.energy() == energies["energy"].sum()
+
+
+def test_dict_resample():
+    dct = get_power_dict()
+    dct[EntityKey("b")] = ComplexPower(dct[EntityKey("b")].data.iloc[1:])
+    res = dct.resample("12h")
+
+    assert isinstance(res, ComplexPowerDict)
+    for key, ts in dct.items():
+        pd.testing.assert_frame_equal(
+            res[key].data, ts.resample("12h").data, check_freq=False
+        )
+    assert res[EntityKey("b")].data.index[0] == pd.Timestamp("2021-01-02")
+    assert len(res[EntityKey("a")]) == 7
+
+
+def test_full_load_hours():
+    data = pd.DataFrame(
+        {
+            TIME_COLUMN_NAME: ["2021-12-31 12:00", "2022-01-01 06:00", "2022-01-02"],
+            "p": [-0.002, 0.001, 0.001],
+            "q": [0.0, 0.0, 0.0],
+        },
+    )
+    ts = ComplexPower(data)
+
+    # energy crossing the year boundary is split at the boundary
+    energy = ts.energy_per_period("Y")
+    assert energy.index.astype(str).tolist() == ["2021", "2022"]
+    assert energy.tolist() == pytest.approx([-0.024, -0.012 + 0.018])
+    flh = ts.full_load_hours(1, "Y")
+    assert flh.tolist() == pytest.approx([24.0, 12.0 + 18.0])
+
+    dct = ComplexPowerDict({EntityKey("a"): ts, EntityKey("b"): ts * 2})
+    flh = dct.full_load_hours({EntityKey("a"): 1, EntityKey("b"): 4}, "Y")
+    assert flh.loc["a"].tolist() == pytest.approx([24.0, 30.0])
+    assert flh.loc["b"].tolist() == pytest.approx([12.0, 15.0])
+    energy = dct.energy_per_period("Y")
+    assert energy.loc["b"].tolist() == pytest.approx([-0.048, 0.012])
+
+
 def get_sample_data_soc():
     data = pd.DataFrame(
         {
@@ -103,6 +190,23 @@ def test_add_with_soc():
     pd.testing.assert_series_equal(res.soc, expected_soc)
 
 
+def test_sum_with_soc():
+    a = get_sample_data_soc()
+    b = get_sample_data_soc()
+    b.data["soc"] = b.data["soc"] * 2
+    c = get_sample_data_soc()
+    c.data["soc"] = c.data["soc"] * 3
+    res = ComplexPowerWithSoc.sum_with_soc([(10, a), (20, b), (30, c)])
+
+    expected_soc = (a.soc * 10 + b.soc * 20 + c.soc * 30) / 60
+    pd.testing.assert_series_equal(res.soc, expected_soc)
+    pd.testing.assert_series_equal(res.p, a.p * 3)
+    pd.testing.assert_series_equal(res.q, a.q * 3)
+
+    with pytest.raises(ValueError):
+        ComplexPowerWithSoc.sum_with_soc([(0, a), (0, b)])
+
+
 def test_p():
     dct = get_power_dict()
     res = dct.p()
@@ -235,3 +339,72 @@ def test_weather_add_mult():
     pd.testing.assert_frame_equal(res.data, data * 2, check_dtype=False)
     res = weather + CoordinateWeather.empty()
     pd.testing.assert_frame_equal(res.data, data, check_dtype=False)
+
+
+def get_random_power_dict(nr_entities: int = 20, nr_events: int = 500, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2021-01-01")
+    dct = {}
+    for i in range(nr_entities):
+        offsets = np.sort(rng.choice(365 * 24 * 60, nr_events, replace=False))
+        data = pd.DataFrame(
+            {
+                "p": rng.normal(0, 100, nr_events),
+                "q": rng.normal(0, 10, nr_events),
+            },
+            index=pd.DatetimeIndex(
+                start + pd.to_timedelta(offsets, "min"), name="time"
+            ),
+        )
+        dct[EntityKey(str(i))] = ComplexPower(data)
+    return ComplexPowerDict(dct)
+
+
+def test_compact_precision():
+    # float32 holds 24 significant bits, i.e. a relative rounding error of at most
+    # 2**-24 ~ 6e-8 per value. Kernels compute in float64, so aggregates of compact
+    # values deviate from the float64 path by the rounding of their inputs and of
+    # the result only.
+    eps = 2.0**-24
+    dct = get_random_power_dict()
+    compact = dct.compact()
+    for key, ts in compact.items():
+        assert list(ts.data.dtypes) == [np.float32, np.float32]
+        assert ts.data.index.equals(dct[key].data.index)
+        np.testing.assert_allclose(ts.data, dct[key].data, rtol=eps, atol=0)
+
+    full_sum = dct.sum().data
+    compact_sum = compact.sum().data
+    assert list(compact_sum.dtypes) == [np.float32, np.float32]
+    abs_sum = ComplexPowerDict(
+        {k: ComplexPower.from_preprocessed(v.data.abs()) for k, v in dct.items()}
+    ).sum()
+    bound = 2 * eps * abs_sum.data.to_numpy() + eps * full_sum.abs().to_numpy()
+    assert (np.abs(compact_sum.to_numpy() - full_sum.to_numpy()) <= bound).all()
+
+    full_energies = dct.energies()
+    compact_energies = compact.energies()
+    abs_energy = dct.integrate(["p"])["p_pos"] - dct.integrate(["p"])["p_neg"]
+    assert (
+        (compact_energies["energy"] - full_energies["energy"]).abs() <= eps * abs_energy
+    ).all()
+
+    # time weighted means are bounded by the largest absolute value
+    key = EntityKey("0")
+    compact_resampled = compact.resample("1D")[key].data
+    assert list(compact_resampled.dtypes) == [np.float32, np.float32]
+    np.testing.assert_allclose(
+        compact_resampled,
+        dct.resample("1D")[key].data,
+        rtol=0,
+        atol=2 * eps * dct[key].data.abs().to_numpy().max(),
+    )
+
+
+def test_compact_complex():
+    dct = get_voltage_dict()
+    compact = dct.compact()
+    v_complex = compact.v_complex()
+    assert (v_complex.dtypes == np.complex64).all()
+    # complex64 consists of two float32, the deviation stays within their rounding
+    np.testing.assert_allclose(v_complex, dct.v_complex(), rtol=1e-6)
@@ -1,10 +1,18 @@
+import numpy as np
 import pandas as pd
+import pytest
 from numpy import float64
 
 from pypsdm.processing.dataframe import (
     add_df,
+    binary_op_df,
     divide_positive_negative,
+    drop_unchanged_rows,
     filter_data_for_time_interval,
+    max_deviations,
+    reduce_dfs,
+    share_index,
+    sum_dfs,
 )
 
 index = pd.date_range("2012-01-01 10:00:00", "2012-01-01 13:00:00", freq="h")
@@ -43,6 +51,100 @@ def test_add_df():
     pd.testing.assert_frame_equal(res, expected)
 
 
+def test_sum_dfs():
+    a = pd.DataFrame(index=[1, 3, 5], data={"a": [1, 2, 3], "b": [1, 2, 3]})
+    b = pd.DataFrame(index=[2, 3], data={"a": [4.0, 5.0], "b": [4.0, 5.0]})
+    c = pd.DataFrame(index=[0, 4], data={"a": [1.0, 2.0], "b": [1.0, 2.0]})
+    res = sum_dfs([a, b, c])
+
+    expected = add_df(add_df(a, b), c)
+    pd.testing.assert_frame_equal(res, expected)
+
+    # empty dataframes are ignored
+    res = sum_dfs([a, b.iloc[:0], c])
+    pd.testing.assert_frame_equal(res, add_df(a, c))
+
+    # summing works with unsorted index
+    res = sum_dfs([a.reindex(index=[5, 3, 1]), b, c.reindex(index=[4, 0])])
+    pd.testing.assert_frame_equal(res, expected)
+
+    with pytest.raises(ValueError):
+        sum_dfs([a, b.rename(columns={"a": "c"})])
+
+
+def test_binary_op_df():
+    a = pd.DataFrame(index=[1, 3, 5], data={"a": [1.0, 2.0, 3.0]})
+    b = pd.DataFrame(index=[2, 3], data={"a": [4.0, 1.0]})
+
+    res = binary_op_df(a, b, "sub")
+    expected = pd.DataFrame(index=[1, 2, 3, 5], data={"a": [1.0, -3.0, 1.0, 2.0]})
+    pd.testing.assert_frame_equal(res, expected)
+
+    res = binary_op_df(a, b, "max")
+    expected = pd.DataFrame(index=[1, 2, 3, 5], data={"a": [1.0, 4.0, 2.0, 3.0]})
+    pd.testing.assert_frame_equal(res, expected)
+
+    # comparisons with an inactive operand don't hold
+    res = binary_op_df(a, b, "gt")
+    expected = pd.DataFrame(index=[1, 2, 3, 5], data={"a": [False, False, True, True]})
+    pd.testing.assert_frame_equal(res, expected)
+
+    res = binary_op_df(a, a.iloc[:0], "sub")
+    pd.testing.assert_frame_equal(res, a)
+
+    with pytest.raises(ValueError):
+        binary_op_df(a, b, "pow")
+
+
+def test_reduce_dfs():
+    a = pd.DataFrame(index=[1, 3, 5], data={"a": [1.0, 2.0, 3.0]})
+    b = pd.DataFrame(index=[2, 3], data={"a": [4.0, 1.0]})
+    c = pd.DataFrame(index=[4], data={"a": [-1.0]})
+    dfs = [a, b, c]
+    index = [1, 2, 3, 4, 5]
+
+    expected = {
+        "sum": [1.0, 5.0, 3.0, 2.0, 3.0],
+        "prod": [1.0, 4.0, 2.0, -2.0, -3.0],
+        "max": [1.0, 4.0, 2.0, 2.0, 3.0],
+        "min": [1.0, 1.0, 1.0, -1.0, -1.0],
+        "mean": [1.0, 2.5, 1.5, 2.0 / 3, 1.0],
+    }
+    for op, values in expected.items():
+        expected_df = pd.DataFrame(index=index, data={"a": values})
+        pd.testing.assert_frame_equal(reduce_dfs(dfs, op), expected_df)
+        pd.testing.assert_frame_equal(reduce_dfs(dfs, op, parallel=True), expected_df)
+
+    with pytest.raises(ValueError):
+        reduce_dfs(dfs, "median")
+
+
+def test_binary_op_df_disjoint_starts():
+    a = pd.DataFrame(index=[1, 3], data={"a": [-2.0, -1.0]})
+    b = pd.DataFrame(index=[2, 3], data={"a": [-4.0, 2.0]})
+    index = [1, 2, 3]
+
+    expected = {
+        "add": [-2.0, -6.0, 1.0],
+        "sub": [-2.0, 2.0, -3.0],
+        "mul": [-2.0, 8.0, -2.0],
+        "div": [np.nan, 0.5, -0.5],
+        "max": [-2.0, -2.0, 2.0],
+        "min": [-2.0, -4.0, -1.0],
+    }
+    for op, values in expected.items():
+        expected_df = pd.DataFrame(index=index, data={"a": values})
+        pd.testing.assert_frame_equal(binary_op_df(a, b, op), expected_df)
+        if op in ("max", "min"):
+            pd.testing.assert_frame_equal(reduce_dfs([a, b], op), expected_df)
+    expected_df = pd.DataFrame(index=index, data={"a": expected["mul"]})
+    pd.testing.assert_frame_equal(reduce_dfs([a, b], "prod"), expected_df)
+
+    res = binary_op_df(a, b, "lt")
+    expected_df = pd.DataFrame(index=index, data={"a": [False, False, True]})
+    pd.testing.assert_frame_equal(res, expected_df)
+
+
 def test_filter_data_for_time_interval():
     input_data = {
         "time": [
@@ -177,3 +279,53 @@ def test_filter_data_for_time_interval():
     expected_5.index.name = "time"
 
     pd.testing.assert_frame_equal(res_5, expected_5)
+
+
+def test_share_index():
+    shared: dict = {}
+    a = pd.date_range("2012-01-01 10:00:00", "2012-01-01 13:00:00", freq="h")
+    b = pd.DatetimeIndex(a.to_list())
+    c = a[1:]
+    assert share_index(a, shared) is a
+    assert share_index(b, shared) is a
+    assert share_index(c, shared) is c
+
+
+def test_max_deviations():
+    a = df.astype(float64)
+    # same states with a redundant event
+    b = pd.concat([a, a.iloc[[1]].set_axis([index[1] + pd.Timedelta("30min")])])
+    b = b.sort_index()
+    c = a.copy()
+    c.iloc[2, 0] = -2.5
+    d = a.iloc[:3]
+
+    deviation, mismatches = max_deviations(
+        [a, a, a, a], [b, c, d, a.iloc[:0]], ["p", "q"]
+    )
+    assert list(mismatches) == [0, 1, 2, 1]
+    assert deviation[0].tolist() == [0.0, 0.0]
+    assert deviation[1].tolist() == [0.5, 0.0]
+
+    _, mismatches = max_deviations([a], [c], ["p", "q"], atol=0.5)
+    assert mismatches[0] == 0
+
+    deviation, mismatches = max_deviations(
+        [a, a, a], [c, a, a], ["p", "q"], stop_early=True, chunk_size=1
+    )
+    assert list(mismatches) == [1, -1, -1]
+    assert pd.isna(deviation[1]).all()
+
+
+def test_drop_unchanged_rows():
+    data = pd.DataFrame(
+        {
+            "p": [1.0, 1.0, 2.0, float("nan"), float("nan"), 2.0, 2.0],
+            "q": [0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0],
+        },
+        index=pd.date_range("2021-01-01", periods=7, freq="h"),
+    )
+    dropped = drop_unchanged_rows(data)
+    assert list(dropped.index) == list(data.index[[0, 2, 3, 5, 6]])
+    assert drop_unchanged_rows(dropped) is dropped
+    assert drop_unchanged_rows(data.iloc[:0]).empty
@@ -1,7 +1,16 @@
+import numpy as np
 import pandas as pd
 from numpy import float64
 
-from pypsdm.processing.series import add_series, divide_positive_negative
+from pypsdm.processing.series import (
+    add_series,
+    divide_positive_negative,
+    duration_weighted_sum,
+    hourly_mean_resample,
+    join_series,
+    pos_and_neg_area,
+    resample_series,
+)
 
 
 def test_divide_series():
@@ -32,3 +41,61 @@ def test_add_series():
     b = b.reindex(index=[3, 2])
     res = add_series(a, b, "test")
     pd.testing.assert_series_equal(res, expected)
+
+
+def test_duration_weighted_sum():
+    index = pd.date_range("2012-01-01 10:00:00", "2012-01-01 13:00:00", freq="h")
+    index = index.insert(1, pd.Timestamp("2012-01-01 10:30:00"))
+    series = pd.Series(index=index, data=[1.0, 2.0, -2.0, 4.0, 3.0])
+    assert duration_weighted_sum(series) == 0.5 + 1.0 - 2.0 + 4.0
+    assert pos_and_neg_area(series) == (5.5, -2.0)
+
+    # last value carries no duration
+    assert duration_weighted_sum(series.iloc[:1]) == 0.0
+    assert duration_weighted_sum(series.iloc[:0]) == 0.0
+
+
+def test_hourly_mean_resample():
+    index = pd.date_range("2012-01-01 10:00:00", "2012-01-01 13:00:00", freq="15min")
+    series = pd.Series(index=index, data=range(len(index)), dtype=float64, name="p")
+    res = hourly_mean_resample(series)
+
+    # matches upsampling to minutes for minute aligned data
+    expected = series.resample("60s").ffill().resample("1h").mean()
+    pd.testing.assert_series_equal(res, expected, check_freq=False)
+
+
+def test_resample_series_sub_minute():
+    index = pd.DatetimeIndex(
+        ["2012-01-01 10:00:00", "2012-01-01 10:00:30", "2012-01-01 10:15:00"]
+    )
+    series = pd.Series(index=index, data=[2.0, 1.0, 5.0])
+    res = resample_series(series, "10min")
+
+    expected = pd.Series(
+        index=pd.date_range("2012-01-01 10:00:00", periods=2, freq="10min"),
+        data=[(2.0 * 30 + 1.0 * 570) / 600, 1.0],
+    )
+    pd.testing.assert_series_equal(res, expected, check_freq=False)
+
+
+def test_join_series():
+    index = pd.date_range("2012-01-01 10:00:00", periods=3, freq="h")
+    a = pd.Series([1, 2, 3], index=index, name="a")
+    b = pd.Series([4.0, 5.0], index=index[1:] + pd.Timedelta("30min"), name="b")
+    c = pd.Series([6, 7, 8], index=index, name="c")
+
+    joined = join_series([a, b, c])
+    expected = pd.concat([a, b, c], axis=1).sort_index().ffill()
+    pd.testing.assert_frame_equal(joined, expected)
+
+    joined = join_series([a, c])
+    assert list(joined.dtypes) == ["int64", "int64"]
+    assert join_series([]).empty
+
+    # missing values within a series hold the previous state
+    d = pd.Series([np.nan, 1.0, np.nan], index=index, name="d")
+    joined = join_series([b, d])
+    expected = pd.concat([b, d], axis=1).sort_index().ffill()
+    pd.testing.assert_frame_equal(joined, expected)
+    assert joined["d"].tolist()[1:] == [1.0, 1.0, 1.0, 1.0]
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from pypsdm.processing.sketch import DurationDigest, DurationDigestStream
+
+
+def test_duration_digest_quantiles():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=20000)
+    durations = rng.uniform(0.25, 2, size=20000)
+    order = np.argsort(values)
+    cumulative = np.cumsum(durations[order]) / durations.sum()
+
+    a = DurationDigest().update(values[:10000], durations[:10000])
+    b = DurationDigest().update(values[10000:], durations[10000:])
+    digest = a.merge(b)
+    assert len(digest.centroids()[0]) <= 100
+    assert np.isclose(digest.total_duration, durations.sum())
+    for q in [0.01, 0.5, 0.95, 0.99]:
+        # duration share of the values at or below the estimated quantile
+        rank = cumulative[np.searchsorted(values[order], digest.quantile(q)) - 1]
+        assert abs(rank - q) < 0.002
+    assert digest.quantile(0) == values.min()
+    assert digest.quantile(1) == values.max()
+    assert np.isnan(DurationDigest().quantile(0.5))
+
+
+def test_duration_digest_from_series():
+    index = pd.date_range("2021-01-01", periods=5, freq="h")
+    series = pd.Series([1.0, 3.0, 3.0, np.nan, 2.0], index=index)
+    digest = DurationDigest.from_series(series)
+    assert digest.total_duration == 3
+    curve = digest.duration_curve()
+    assert list(curve.index) == [0, 1, 2]
+    assert list(curve) == [3.0, 3.0, 1.0]
+
+
+def test_duration_digest_stream():
+    index = pd.date_range("2021-01-01", periods=6, freq="h")
+    a = pd.Series([1.0, 2.0, 2.0, 4.0, 0.0, 1.0], index=index)
+    b = pd.Series([5.0, 1.0, 1.0], index=index[::2])
+    chunks = [
+        (["a", "a", "a", "b", "b"], [*index[:3], index[0], index[2]]),
+        (["b", "a", "a", "a"], [index[4], *index[3:]]),
+    ]
+    values = {"a": a, "b": b}
+    stream = DurationDigestStream(["p"])
+    for keys, times in chunks:
+        chunk = np.array([[values[k][t]] for k, t in zip(keys, times)])
+        stream.update(keys, times, chunk)
+    digests = stream.finish(index[-1] + pd.Timedelta("2h"))["p"]
+
+    for key, series in values.items():
+        end = pd.Series([series.iloc[-1]], index=[index[-1] + pd.Timedelta("2h")])
+        expected = DurationDigest.from_series(pd.concat([series, end]))
+        assert digests[key].total_duration == expected.total_duration
+        assert np.allclose(
+            digests[key].quantile([0.1, 0.5, 0.9]), expected.quantile([0.1, 0.5, 0.9])
+        )
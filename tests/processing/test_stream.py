@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pypsdm.processing.dataframe import integrate_dfs
+from pypsdm.processing.series import join_series
+from pypsdm.processing.stream import EventAggregationStream
+
+
+def test_event_aggregation_stream():
+    rng = np.random.default_rng(1)
+    end = pd.Timestamp("2021-01-03")
+    times = pd.date_range("2021-01-01", periods=100, freq="15min")
+    series = {}
+    for key in "abcd":
+        index = pd.DatetimeIndex(np.sort(rng.choice(times, size=20, replace=False)))
+        series[key] = pd.Series(rng.normal(size=20), index=index, name=key)
+    events = pd.concat(
+        [s.rename("p").to_frame().assign(key=k) for k, s in series.items()]
+    ).sort_index(kind="stable")
+
+    stream = EventAggregationStream(["p"], groups={"a": 0, "b": 0, "c": 1})
+    for start in range(0, len(events), 7):
+        chunk = events.iloc[start : start + 7]
+        stream.update(chunk["key"].to_numpy(), chunk.index, chunk[["p"]].to_numpy())
+    stream.finish(end)
+
+    # the last state of each entity holds until the end
+    full = {
+        k: pd.concat([s, pd.Series([s.iloc[-1]], index=[end])])
+        for k, s in series.items()
+    }
+    total, positive, negative = integrate_dfs(
+        [s.to_frame("p") for s in full.values()], ["p"]
+    )
+    order = [stream.keys.index(key) for key in full]
+    assert np.allclose(stream.total[order], total)
+    assert np.allclose(stream.positive[order], positive)
+    assert np.allclose(stream.negative[order], negative)
+
+    expected = join_series(list(full.values())).fillna(0).sum(axis=1)
+    res = stream.sum()["p"]
+    assert res.index.equals(expected.index)
+    assert np.allclose(res, expected)
+    group_sums = stream.group_sums()
+    assert group_sums.keys() == {0, 1}
+    expected = join_series([full["a"], full["b"]]).fillna(0).sum(axis=1)
+    assert np.allclose(group_sums[0]["p"].reindex(expected.index), expected)
+
+    stream = EventAggregationStream(["p"])
+    stream.update(["a"], [times[1]], np.array([[1.0]]))
+    with pytest.raises(ValueError):
+        stream.update(["a"], [times[0]], np.array([[1.0]]))
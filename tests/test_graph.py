@@ -0,0 +1,92 @@
+from copy import deepcopy
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from pypsdm.graph import (
+    find_all_n_hop_closest_in_slack_direction,
+    find_branches,
+    find_n_hop_closest_candidates,
+    find_n_hop_closest_in_slack_direction,
+)
+from pypsdm.models.input.container.raw_grid import RawGridContainer
+
+
+@pytest.fixture(scope="module")
+def raw_grid(input_path_sb) -> RawGridContainer:
+    return RawGridContainer.from_csv(input_path_sb)
+
+
+def test_find_n_hop_closest_in_slack_direction(raw_grid: RawGridContainer):
+    rng = np.random.default_rng(1)
+    nodes = raw_grid.nodes.uuid.to_list()
+    candidates = set(rng.choice(nodes, size=len(nodes) // 3, replace=False))
+    slack_ds = raw_grid.find_slack_downstream()
+    G = raw_grid.build_networkx_graph()
+    for uuid in nodes:
+        if not nx.has_path(G, uuid, slack_ds):
+            continue
+        closest = find_n_hop_closest_in_slack_direction(uuid, 2, raw_grid, candidates)
+        path = nx.shortest_path(G, uuid, slack_ds)
+        expected = find_n_hop_closest_candidates(2, G, uuid, candidates)
+        assert set(closest) == {node for node in expected if node in path}
+        assert closest == [node for node in path if node in closest]
+
+
+def test_find_branches_deep_grid():
+    # deeper than the recursion limit
+    G = nx.path_graph(range(1, 5001))
+    nx.add_path(G, [0, 1])
+    nx.add_path(G, [0, -1, -2])
+    branches = find_branches(G, 0)
+    assert branches == [[0, *range(1, 5001)], [0, -1, -2]]
+
+
+def test_get_branches_multiple_slack_nodes(raw_grid: RawGridContainer):
+    branches = raw_grid.get_branches()
+    slack_ds = raw_grid.find_slack_downstream()
+    assert branches == find_branches(raw_grid.build_networkx_graph(), slack_ds)
+    assert sum(len(branch) - 1 for branch in branches) == len(raw_grid.nodes) - 2
+
+    G = raw_grid.build_networkx_graph()
+    leaf = next(node for node in branches[0] if G.degree(node) == 1)
+    raw_grid = deepcopy(raw_grid)
+    raw_grid.nodes.data.loc[leaf, "slack"] = True
+    branches = raw_grid.get_branches()
+    # the additional slack node is reached from the first one and forms a branch
+    # of its own
+    assert branches[-1] == [leaf]
+    assert {branch[0] for branch in branches[:-1]} == {slack_ds}
+    nodes = [node for branch in branches for node in branch[1:]]
+    assert len(nodes) == len(set(nodes))
+    # all nodes but the high voltage slack node and the starts of the branches
+    assert len(nodes) == len(raw_grid.nodes) - 3
+
+
+def test_find_all_n_hop_closest_in_slack_direction(
+    raw_grid: RawGridContainer, input_path_sg
+):
+    rng = np.random.default_rng(1)
+    nodes = raw_grid.nodes.uuid.to_list()
+    candidates = set(rng.choice(nodes, size=len(nodes) // 3, replace=False))
+    closest = find_all_n_hop_closest_in_slack_direction(2, raw_grid, candidates)
+    for uuid in nodes:
+        if uuid not in closest:
+            with pytest.raises(ValueError):
+                find_n_hop_closest_in_slack_direction(uuid, 2, raw_grid, candidates)
+            continue
+        # hops are counted along the path, which may skip candidates in meshes
+        expected = find_n_hop_closest_in_slack_direction(uuid, 2, raw_grid, candidates)
+        assert closest[uuid][0] == uuid
+        assert closest[uuid] == [node for node in expected if node in closest[uuid]]
+
+    # radial grids yield the same candidates as the single node search
+    simple_grid = RawGridContainer.from_csv(input_path_sg)
+    for n in range(3):
+        closest = find_all_n_hop_closest_in_slack_direction(n, simple_grid)
+        for uuid in simple_grid.nodes.uuid:
+            if uuid in closest:
+                assert closest[uuid] == find_n_hop_closest_in_slack_direction(
+                    uuid, n, simple_grid
+                )